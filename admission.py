@@ -0,0 +1,193 @@
+import asyncio
+import itertools
+import math
+import os
+import time
+from discord.ext import commands
+from metrics import counter, gauge, histogram
+
+# Controle de admissão dos comandos de prefixo (ADA_ADMISSION=0 desativa).
+# Cada comando tem uma classe de custo; o custo sai de um balde de fichas do servidor
+# e de outro do usuário, que se recarregam com o tempo. Com todas as vagas de execução
+# ocupadas, os comandos esperam numa fila justa entre servidores.
+ADMISSION_ENABLED = os.getenv("ADA_ADMISSION", "1") != "0"
+ADMISSION_SLOTS = int(os.getenv("ADA_ADMISSION_SLOTS", "8"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADA_ADMISSION_QUEUE_SIZE", "200"))
+
+# Baldes de fichas: capacidade e fichas recuperadas por segundo.
+GUILD_BUCKET = (float(os.getenv("ADA_GUILD_TOKENS", "60")), float(os.getenv("ADA_GUILD_TOKENS_PER_SECOND", "1")))
+USER_BUCKET = (float(os.getenv("ADA_USER_TOKENS", "20")), float(os.getenv("ADA_USER_TOKENS_PER_SECOND", "0.2")))
+
+# Classe de custo: (fichas por execução, máximo de execuções simultâneas da classe).
+# Limitar as classes caras deixa sempre vagas livres para os comandos leves.
+COST_CLASSES = {
+    "light": (1, ADMISSION_SLOTS),
+    "medium": (3, max(1, ADMISSION_SLOTS // 2)),
+    "heavy": (10, max(1, ADMISSION_SLOTS // 4)),
+}
+COMMAND_COSTS = {
+    "gerar_relatorio": "heavy",
+    "exportar": "heavy",
+    "backup_servidor": "heavy",
+    "restaurar_backup": "heavy",
+    "snapshot": "heavy",
+    "list_tarefas": "medium",
+    "list_ponto": "medium",
+    "list_reuniao": "medium",
+    "quadro": "medium",
+    # Comandos de barra, cobrados por jobs.submit_job antes de entrar na fila de trabalhos.
+    "relatorio": "heavy",
+    "backup": "heavy",
+}
+
+ADMISSION_REJECTED = counter("ada_admission_rejected_total", "Comandos recusados pelo controle de admissão, por classe e motivo (guild, user, queue).")
+ADMISSION_WAIT = histogram("ada_admission_wait_seconds", "Tempo de espera dos comandos na fila de execução, por classe.")
+ADMISSION_QUEUE_DEPTH = gauge("ada_admission_queue_depth", "Comandos aguardando vaga de execução.")
+
+# Acima desse número de baldes, os que já estão cheios (equivalentes a um balde novo) são descartados.
+BUCKET_PRUNE_SIZE = 10000
+
+class AdmissionRejected(commands.CommandError):
+    pass
+
+class TokenBuckets:
+    """
+    Baldes de fichas por chave, recarregados continuamente até a capacidade.
+    """
+
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self._buckets = {}
+
+    def tokens(self, key, now):
+        tokens, updated_at = self._buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated_at) * self.rate)
+
+    def take(self, key, amount, now):
+        self._buckets[key] = (self.tokens(key, now) - amount, now)
+        if len(self._buckets) > BUCKET_PRUNE_SIZE:
+            self._buckets = {k: v for k, v in self._buckets.items() if self.tokens(k, now) < self.capacity}
+
+    def retry_after(self, key, amount, now):
+        """
+        Segundos até o balde ter as fichas pedidas (0 se já tem).
+        """
+        missing = amount - self.tokens(key, now)
+        return max(0.0, missing / self.rate) if self.rate > 0 else float("inf")
+
+class FairScheduler:
+    """
+    Fila justa ponderada (start-time fair queueing) para as vagas de execução.
+    Cada servidor é um fluxo: o pedido recebe a marca de início max(tempo virtual,
+    fim do pedido anterior do servidor) e termina em início + custo. A vaga livre vai
+    para o pedido com a menor marca entre as classes abaixo do seu limite, então um
+    servidor com muitos comandos caros acumula marcas altas e não atrasa os outros.
+    """
+
+    def __init__(self, slots=ADMISSION_SLOTS, queue_size=ADMISSION_QUEUE_SIZE):
+        self.slots = slots
+        self.queue_size = queue_size
+        self.running = 0
+        self.running_by_class = dict.fromkeys(COST_CLASSES, 0)
+        self.virtual_time = 0.0
+        self._finish = {}
+        self._waiting = []
+        self._sequence = itertools.count()
+
+    def depth(self):
+        return len(self._waiting)
+
+    async def acquire(self, guild_id, cost_class):
+        if len(self._waiting) >= self.queue_size:
+            raise AdmissionRejected("fila")
+        cost = COST_CLASSES[cost_class][0]
+        start = max(self.virtual_time, self._finish.get(guild_id, 0.0))
+        self._finish[guild_id] = start + cost
+        waiter = (start, next(self._sequence), cost_class, asyncio.get_running_loop().create_future())
+        self._waiting.append(waiter)
+        self._dispatch()
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiting))
+        try:
+            await waiter[3]
+        except asyncio.CancelledError:
+            if waiter in self._waiting:
+                self._waiting.remove(waiter)
+                ADMISSION_QUEUE_DEPTH.set(len(self._waiting))
+            elif not waiter[3].cancelled():
+                self.release(cost_class)
+            raise
+
+    def release(self, cost_class):
+        self.running -= 1
+        self.running_by_class[cost_class] -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self.running < self.slots:
+            eligible = [w for w in self._waiting if self.running_by_class[w[2]] < COST_CLASSES[w[2]][1]]
+            if not eligible:
+                break
+            waiter = min(eligible)
+            self._waiting.remove(waiter)
+            if waiter[3].cancelled():
+                continue
+            self.virtual_time = max(self.virtual_time, waiter[0])
+            self.running += 1
+            self.running_by_class[waiter[2]] += 1
+            waiter[3].set_result(None)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiting))
+        if len(self._finish) > BUCKET_PRUNE_SIZE:
+            self._finish = {k: v for k, v in self._finish.items() if v > self.virtual_time}
+
+class AdmissionControl:
+    """
+    Decide se um comando roda agora, espera na fila justa ou é recusado.
+    """
+
+    def __init__(self, enabled=ADMISSION_ENABLED):
+        self.enabled = enabled
+        self.guild_buckets = TokenBuckets(*GUILD_BUCKET)
+        self.user_buckets = TokenBuckets(*USER_BUCKET)
+        self.scheduler = FairScheduler()
+
+    async def admit(self, guild_id, user_id, command_name):
+        """
+        Cobra as fichas do comando e espera uma vaga de execução. Retorna a classe de
+        custo, a ser passada a release() ao final. Levanta AdmissionRejected com a
+        mensagem para o usuário se os baldes estiverem vazios ou a fila cheia.
+        """
+        if not self.enabled:
+            return None
+        cost_class = COMMAND_COSTS.get(command_name, "light")
+        cost = COST_CLASSES[cost_class][0]
+        now = time.monotonic()
+        guild_cost = min(cost, self.guild_buckets.capacity)
+        user_cost = min(cost, self.user_buckets.capacity)
+        user_key = (guild_id, user_id)
+
+        for reason, buckets, key, amount in (
+            ("guild", self.guild_buckets, guild_id, guild_cost),
+            ("user", self.user_buckets, user_key, user_cost),
+        ):
+            wait = buckets.retry_after(key, amount, now)
+            if wait > 0:
+                ADMISSION_REJECTED.inc(cost_class=cost_class, reason=reason)
+                who = "Este servidor está" if reason == "guild" else "Você está"
+                raise AdmissionRejected(f"{who} usando muitos comandos. Tente de novo em {math.ceil(wait)}s.")
+        self.guild_buckets.take(guild_id, guild_cost, now)
+        self.user_buckets.take(user_key, user_cost, now)
+
+        try:
+            await self.scheduler.acquire(guild_id, cost_class)
+        except AdmissionRejected:
+            ADMISSION_REJECTED.inc(cost_class=cost_class, reason="queue")
+            raise AdmissionRejected("O bot está sobrecarregado no momento. Tente de novo em alguns segundos.")
+        ADMISSION_WAIT.observe(time.monotonic() - now, cost_class=cost_class)
+        return cost_class
+
+    def release(self, cost_class):
+        if cost_class is not None:
+            self.scheduler.release(cost_class)
+
+admission = AdmissionControl()
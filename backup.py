@@ -0,0 +1,246 @@
+import argparse
+import asyncio
+import datetime
+import gzip
+import os
+import shutil
+import aiosqlite
+import database
+
+BACKUP_DIR = os.getenv("ADA_BACKUP_DIR", "backups")
+
+# A cópia online avança BACKUP_PAGES_PER_STEP páginas por passo e libera o banco
+# por BACKUP_STEP_SLEEP segundos entre os passos, para que as escritas dos comandos
+# continuem sendo atendidas durante o backup.
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.01
+
+# Quantos snapshots completos são mantidos; os mais antigos são apagados.
+BACKUP_KEEP = int(os.getenv("ADA_BACKUP_KEEP", "7"))
+
+async def backup_file(source_path, target_path):
+    """
+    Copia um arquivo SQLite em uso com a API de backup online, sem bloquear o event loop:
+    a cópia roda na thread do aiosqlite e grava primeiro em um arquivo temporário.
+    """
+    tmp_path = f"{target_path}.tmp"
+    async with aiosqlite.connect(source_path) as source, aiosqlite.connect(tmp_path) as target:
+        await source.backup(target, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP)
+    os.replace(tmp_path, target_path)
+
+def rotate_snapshots(keep=BACKUP_KEEP):
+    """
+    Apaga os snapshots mais antigos, mantendo apenas os `keep` mais recentes.
+    """
+    snapshots = sorted(
+        entry for entry in os.listdir(BACKUP_DIR)
+        if entry.startswith("snapshot_") and os.path.isdir(os.path.join(BACKUP_DIR, entry))
+    )
+    for entry in snapshots[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(BACKUP_DIR, entry))
+
+async def create_snapshot():
+    """
+    Gera um snapshot consistente de todos os arquivos de dados e de arquivo morto
+    em BACKUP_DIR/snapshot_AAAAMMDD_HHMMSS e aplica a rotação. Retorna a pasta criada.
+    """
+    if database.STORAGE_BACKEND == "postgres":
+        raise RuntimeError("Com o backend PostgreSQL, use pg_dump para os snapshots completos.")
+    snapshot_dir = os.path.join(BACKUP_DIR, f"snapshot_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    for path in database.all_db_paths():
+        for source_path in (path, database.archive_path(path)):
+            if os.path.exists(source_path):
+                await backup_file(source_path, os.path.join(snapshot_dir, os.path.basename(source_path)))
+            await asyncio.sleep(0)
+
+    rotate_snapshots()
+    return snapshot_dir
+
+def _gzip_file(source_path, target_path):
+    with open(source_path, 'rb') as source, gzip.open(target_path, 'wb') as target:
+        shutil.copyfileobj(source, target)
+
+def _gunzip_file(source_path, target_path):
+    with gzip.open(source_path, 'rb') as source, open(target_path, 'wb') as target:
+        shutil.copyfileobj(source, target)
+
+async def export_guild(guild_id):
+    """
+    Exporta todos os dados de um servidor, incluindo o arquivo morto, para um
+    SQLite compactado com gzip (backup_<guild_id>_<data>.db.gz). Retorna o caminho do arquivo.
+    """
+    guild_id = str(guild_id)
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    filename = os.path.join(BACKUP_DIR, f"backup_{guild_id}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.db.gz")
+    tmp_path = f"{filename}.tmp.db"
+
+    # Um erro no meio da exportação não deixa o SQLite temporário nem um .gz incompleto em BACKUP_DIR.
+    try:
+        if database.STORAGE_BACKEND == "postgres":
+            await _export_guild_pg(guild_id, tmp_path)
+        else:
+            async with database.connect_db(guild_id) as conn:
+                await conn.execute("ATTACH DATABASE ? AS export", (tmp_path,))
+                await conn.execute("ATTACH DATABASE ? AS archive", (database.archive_path(database.db_path(guild_id)),))
+                await conn.execute("BEGIN")
+                await conn.execute("CREATE TABLE export.export_info (guild_id TEXT, exported_at TEXT)")
+                await conn.execute(
+                    "INSERT INTO export.export_info VALUES (?, ?)",
+                    (guild_id, datetime.datetime.now(datetime.timezone.utc).isoformat())
+                )
+                for table, columns in database.GUILD_TABLES.items():
+                    await conn.execute(
+                        f"CREATE TABLE export.{table} AS SELECT {columns} FROM main.{table} WHERE guild_id = ?",
+                        (guild_id,)
+                    )
+                await conn.execute(
+                    "CREATE TABLE export.meeting_topics AS SELECT t.* FROM main.meeting_topics t "
+                    "JOIN main.meetings m ON m.id = t.meeting_id WHERE m.guild_id = ?",
+                    (guild_id,)
+                )
+                for table, columns in database.ARCHIVE_TABLES.items():
+                    await conn.execute(
+                        f"CREATE TABLE export.{table} AS SELECT {columns} FROM archive.{table} WHERE guild_id = ?",
+                        (guild_id,)
+                    )
+                await conn.commit()
+
+        await asyncio.to_thread(_gzip_file, tmp_path, filename)
+    except Exception:
+        if os.path.exists(filename):
+            os.remove(filename)
+        raise
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return filename
+
+async def restore_guild(guild_id, export_path):
+    """
+    Substitui os dados de um servidor pelos de um arquivo gerado por export_guild,
+    em uma única transação. Os IDs originais são mantidos; se algum já estiver em uso
+    por outro servidor, nada é alterado e sqlite3.IntegrityError é propagado.
+    Retorna o número de linhas restauradas.
+    """
+    guild_id = str(guild_id)
+    tmp_path = f"{export_path}.restore.db"
+    await asyncio.to_thread(_gunzip_file, export_path, tmp_path)
+
+    try:
+        if database.STORAGE_BACKEND == "postgres":
+            return await _restore_guild_pg(guild_id, tmp_path)
+        async with database.connect_db(guild_id) as conn:
+            await conn.execute("ATTACH DATABASE ? AS import", (tmp_path,))
+            await conn.execute("ATTACH DATABASE ? AS archive", (database.archive_path(database.db_path(guild_id)),))
+
+            cursor = await conn.execute("SELECT guild_id FROM import.export_info")
+            info = await cursor.fetchone()
+            if not info or info[0] != guild_id:
+                raise ValueError("O arquivo de backup pertence a outro servidor.")
+
+            # Exportações de versões anteriores podem não ter todas as tabelas atuais.
+            cursor = await conn.execute("SELECT name FROM import.sqlite_master WHERE type = 'table'")
+            import_tables = {name for (name,) in await cursor.fetchall()}
+
+            restored = 0
+            try:
+                await conn.execute("BEGIN")
+                await conn.execute(
+                    "DELETE FROM main.meeting_topics WHERE meeting_id IN (SELECT id FROM main.meetings WHERE guild_id = ?)",
+                    (guild_id,)
+                )
+                for table, columns in database.GUILD_TABLES.items():
+                    await conn.execute(f"DELETE FROM main.{table} WHERE guild_id = ?", (guild_id,))
+                    if table not in import_tables:
+                        continue
+                    cursor = await conn.execute(
+                        f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM import.{table} WHERE guild_id = ?",
+                        (guild_id,)
+                    )
+                    restored += cursor.rowcount
+                cursor = await conn.execute(
+                    f"INSERT INTO main.meeting_topics ({database.MEETING_TOPICS_COLUMNS}) "
+                    f"SELECT t.* FROM import.meeting_topics t JOIN import.meetings m ON m.id = t.meeting_id WHERE m.guild_id = ?",
+                    (guild_id,)
+                )
+                restored += cursor.rowcount
+                for table, columns in database.ARCHIVE_TABLES.items():
+                    await conn.execute(f"DELETE FROM archive.{table} WHERE guild_id = ?", (guild_id,))
+                    cursor = await conn.execute(
+                        f"INSERT INTO archive.{table} ({columns}) SELECT {columns} FROM import.{table} WHERE guild_id = ?",
+                        (guild_id,)
+                    )
+                    restored += cursor.rowcount
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+            return restored
+    finally:
+        database.invalidate_guild(guild_id)
+        os.remove(tmp_path)
+
+async def _export_guild_pg(guild_id, tmp_path):
+    """
+    Grava os dados do servidor lidos do PostgreSQL no mesmo formato SQLite de export_guild,
+    para que os backups possam ser restaurados em qualquer um dos backends.
+    """
+    import database_pg
+    tables = await database_pg.read_guild_tables(guild_id)
+    async with aiosqlite.connect(tmp_path) as conn:
+        await conn.execute("CREATE TABLE export_info (guild_id TEXT, exported_at TEXT)")
+        await conn.execute(
+            "INSERT INTO export_info VALUES (?, ?)",
+            (guild_id, datetime.datetime.now(datetime.timezone.utc).isoformat())
+        )
+        for table, (columns, rows) in tables.items():
+            await conn.execute(f"CREATE TABLE {table} ({columns})")
+            placeholders = ",".join("?" * len(columns.split(",")))
+            await conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+        await conn.commit()
+
+async def _restore_guild_pg(guild_id, import_path):
+    """
+    Lê uma exportação (de qualquer backend) e substitui os dados do servidor no PostgreSQL.
+    """
+    import database_pg
+    async with aiosqlite.connect(import_path) as conn:
+        cursor = await conn.execute("SELECT guild_id FROM export_info")
+        info = await cursor.fetchone()
+        if not info or info[0] != guild_id:
+            raise ValueError("O arquivo de backup pertence a outro servidor.")
+
+        cursor = await conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        import_tables = {name for (name,) in await cursor.fetchall()}
+        tables = {}
+        for table, columns in {**database.GUILD_TABLES, **database.ARCHIVE_TABLES}.items():
+            if table in import_tables:
+                cursor = await conn.execute(f"SELECT {columns} FROM {table} WHERE guild_id = ?", (guild_id,))
+                tables[table] = await cursor.fetchall()
+        cursor = await conn.execute(
+            f"SELECT {', '.join('t.' + column.strip() for column in database.MEETING_TOPICS_COLUMNS.split(','))} "
+            f"FROM meeting_topics t JOIN meetings m ON m.id = t.meeting_id WHERE m.guild_id = ?",
+            (guild_id,)
+        )
+        tables['meeting_topics'] = await cursor.fetchall()
+    return await database_pg.replace_guild_tables(guild_id, tables)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backup online do banco de dados do Ada Bot.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("snapshot", help="copia todos os arquivos de dados para BACKUP_DIR")
+    export_parser = subparsers.add_parser("export", help="exporta os dados de um servidor")
+    export_parser.add_argument("guild_id")
+    restore_parser = subparsers.add_parser("restore", help="restaura os dados de um servidor a partir de uma exportação")
+    restore_parser.add_argument("guild_id")
+    restore_parser.add_argument("file")
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        print(f"✅ Snapshot criado em {asyncio.run(create_snapshot())}")
+    elif args.command == "export":
+        print(f"✅ Dados exportados para {asyncio.run(export_guild(args.guild_id))}")
+    else:
+        print(f"✅ {asyncio.run(restore_guild(args.guild_id, args.file))} linha(s) restaurada(s).")
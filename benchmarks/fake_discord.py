@@ -0,0 +1,106 @@
+import asyncio
+from kanban import BoardUpdater
+
+class FakePermissions:
+    def __init__(self, send_messages=True):
+        self.send_messages = send_messages
+
+class FakeUser:
+    """
+    Usuário/membro com os atributos usados pelo bot (id, nomes, mention).
+    """
+
+    def __init__(self, user_id, display_name):
+        self.id = user_id
+        self.name = display_name
+        self.global_name = None
+        self.nick = None
+        self.display_name = display_name
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+
+class FakeRole:
+    def __init__(self, role_id, name):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+class FakeChannel:
+    """
+    Canal de texto que guarda as mensagens enviadas, com latência de envio configurável.
+    """
+
+    def __init__(self, channel_id, send_latency=0.0):
+        self.id = channel_id
+        self.send_latency = send_latency
+        self.sent = []
+
+    def permissions_for(self, member):
+        return FakePermissions()
+
+    async def send(self, content=None, **kwargs):
+        if self.send_latency:
+            await asyncio.sleep(self.send_latency)
+        self.sent.append((content, kwargs))
+
+class FakeGuild:
+    def __init__(self, guild_id, members, roles, send_latency=0.0):
+        self.id = guild_id
+        self.name = f"Servidor {guild_id}"
+        self.members = members
+        self.roles = roles
+        self.me = FakeUser(0, "Ada")
+        self.text_channels = [FakeChannel(guild_id, send_latency)]
+        self._members_by_id = {member.id: member for member in members}
+
+    def get_member(self, user_id):
+        return self._members_by_id.get(user_id)
+
+class FakeMessage:
+    def __init__(self, author, guild, attachments=()):
+        self.author = author
+        self.guild = guild
+        self.attachments = list(attachments)
+
+class FakeContext:
+    """
+    Substituto de commands.Context: ctx.send guarda o que seria enviado ao Discord.
+    """
+
+    def __init__(self, guild, author, send_latency=0.0):
+        self.guild = guild
+        self.author = author
+        self.message = FakeMessage(author, guild)
+        self.send_latency = send_latency
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        if self.send_latency:
+            await asyncio.sleep(self.send_latency)
+        self.sent.append((content, kwargs))
+
+class FakeBot:
+    """
+    Substituto do commands.Bot com guilds, board_updater, get_guild, get_partial_messageable e fetch_user,
+    este com latência configurável para simular a chamada REST.
+    """
+
+    def __init__(self, guilds, fetch_latency=0.0):
+        self.guilds = guilds
+        self.user = FakeUser(0, "Ada")
+        self.fetch_latency = fetch_latency
+        self.fetch_calls = 0
+        self._users = {member.id: member for guild in guilds for member in guild.members}
+        self.board_updater = BoardUpdater(self)
+
+    def get_guild(self, guild_id):
+        return next((guild for guild in self.guilds if guild.id == guild_id), None)
+
+    def get_partial_messageable(self, channel_id):
+        return next(channel for guild in self.guilds for channel in guild.text_channels if channel.id == channel_id)
+
+    async def fetch_user(self, user_id):
+        self.fetch_calls += 1
+        if self.fetch_latency:
+            await asyncio.sleep(self.fetch_latency)
+        return self._users.get(user_id) or FakeUser(user_id, f"Usuário {user_id}")
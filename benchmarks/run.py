@@ -0,0 +1,208 @@
+"""
+Benchmarks reprodutíveis do Ada Bot.
+
+Gera um ada.db sintético na escala escolhida, substitui o Discord pelos fakes de
+benchmarks.fake_discord e mede a varredura de lembretes, cada tipo de relatório PDF,
+os comandos de listagem e os caminhos de escrita. Com uma linha de base salva,
+sai com código 1 se algum cenário ficar mais lento que a tolerância.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.run --scale small
+    python -m benchmarks.run --scale small --save-baseline
+    python -m benchmarks.run --scale large --repeat 3 --fetch-latency 0.05
+    ADA_DATABASE_URL=postgresql://localhost/ada python -m benchmarks.run --backend postgres
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from benchmarks import synthetic
+from benchmarks.fake_discord import FakeBot, FakeContext, FakeGuild, FakeRole, FakeUser
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# Um cenário é considerado regressão quando a mediana passa da linha de base vezes este fator.
+REGRESSION_TOLERANCE = 1.25
+
+# Operações por repetição nos cenários de escrita.
+WRITE_OPS = 50
+
+def build_fake_guilds(guilds, members, send_latency=0.0):
+    """
+    Cria os servidores falsos com os mesmos IDs e nomes usados pelo gerador sintético.
+    """
+    fake_guilds = []
+    for guild_index in range(guilds):
+        guild_members = [
+            FakeUser(synthetic.member_id_for(guild_index, member_index), synthetic.member_name_for(guild_index, member_index))
+            for member_index in range(members)
+        ]
+        roles = [FakeRole(guild_index * 10 + role_index, synthetic.role_name_for(guild_index, role_index)) for role_index in range(3)]
+        fake_guilds.append(FakeGuild(synthetic.guild_id_for(guild_index), guild_members, roles, send_latency))
+    return fake_guilds
+
+def check_no_errors(ctx):
+    """
+    Os comandos capturam as próprias exceções e respondem com "❌"; num benchmark isso é falha.
+    """
+    for content, _ in ctx.sent:
+        if content and content.startswith("❌"):
+            raise RuntimeError(content)
+
+def build_scenarios(bot, database, guild, author):
+    """
+    Retorna (nome, função assíncrona, altera_dados) para cada cenário medido.
+    Os cogs são instanciados direto sobre o FakeBot, sem passar pelo carregamento de extensões.
+    """
+    from cogs.lembretes import Reminders
+    from cogs.ponto import Clockpoint
+    from cogs.relatorios import generate_pdf_report
+    from cogs.reunioes import Meetings
+    from cogs.tarefas import Tasks
+
+    guild_id = str(guild.id)
+    reminders, clockpoint, meetings, tasks = Reminders(bot), Clockpoint(bot), Meetings(bot), Tasks(bot)
+
+    async def sweep():
+        await reminders.sweep_reminders()
+
+    def report(report_type):
+        async def scenario():
+            os.remove(await generate_pdf_report(bot, guild_id, report_type))
+        return scenario
+
+    def listing(cog, command):
+        async def scenario():
+            ctx = FakeContext(guild, author)
+            await command.callback(cog, ctx)
+            check_no_errors(ctx)
+        return scenario
+
+    async def write_tasks():
+        for i in range(WRITE_OPS):
+            await database.add_task(guild_id, f"Bench {i}", author.display_name, "3600", "2026-01-01T00:00:00-03:00", "2026-02-01T00:00:00-03:00")
+        for task in (await database.get_tasks_filtered(guild_id, author.display_name))[:WRITE_OPS]:
+            await database.update_task_status(guild_id, task.id, author.display_name, "Em Andamento")
+
+    async def write_clockpoint():
+        ctx = FakeContext(guild, author)
+        for _ in range(WRITE_OPS):
+            await clockpoint.check_in.callback(clockpoint, ctx)
+            await clockpoint.check_out.callback(clockpoint, ctx)
+        check_no_errors(ctx)
+
+    async def write_meeting():
+        ctx = FakeContext(guild, author)
+        await meetings.check_in_reuniao.callback(meetings, ctx, *guild.members[1:4])
+        for i in range(WRITE_OPS):
+            await meetings.add_topico.callback(meetings, ctx, topics=f"Tópico {i}")
+        await meetings.check_out_reuniao.callback(meetings, ctx)
+        check_no_errors(ctx)
+
+    return [
+        ("check_reminders", sweep, True),
+        ("relatorio_tarefas", report("tarefas"), False),
+        ("relatorio_ponto", report("ponto"), False),
+        ("relatorio_reunioes", report("reunioes"), False),
+        ("relatorio_todos", report("todos"), False),
+        ("list_tarefas", listing(tasks, tasks.list_tarefas), False),
+        ("list_ponto", listing(clockpoint, clockpoint.list_ponto), False),
+        ("list_reuniao", listing(meetings, meetings.list_reuniao), False),
+        ("escrita_tarefas", write_tasks, True),
+        ("escrita_ponto", write_clockpoint, True),
+        ("escrita_reuniao", write_meeting, True),
+    ]
+
+async def run(scale, repeat, fetch_latency, send_latency, only):
+    params = synthetic.SCALES[scale]
+    workdir = tempfile.mkdtemp(prefix="ada-bench-")
+    os.chdir(workdir)
+
+    import database
+
+    print(f"Gerando dados sintéticos ({scale}: {params}, {database.STORAGE_BACKEND}) em {workdir}...")
+    started = time.perf_counter()
+    await synthetic.populate(database, **params)
+    await synthetic.save_template(database)
+    print(f"Dados gerados em {time.perf_counter() - started:.1f}s")
+
+    guilds = build_fake_guilds(params['guilds'], params['members'], send_latency)
+    bot = FakeBot(guilds, fetch_latency)
+
+    results = {}
+    for name, scenario, mutates in build_scenarios(bot, database, guilds[0], guilds[0].members[0]):
+        if only and name not in only:
+            continue
+        timings = []
+        for _ in range(repeat):
+            if mutates:
+                await synthetic.restore_template(database)
+            start = time.perf_counter()
+            await scenario()
+            timings.append(time.perf_counter() - start)
+        results[name] = {"median": statistics.median(timings), "max": max(timings)}
+        print(f"{name:<22} mediana {results[name]['median'] * 1000:>10.1f}ms   máx {results[name]['max'] * 1000:>10.1f}ms")
+
+    await synthetic.drop_backend(database)
+    shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def compare(scale, results):
+    """
+    Compara as medianas com a linha de base salva. Retorna a lista de regressões.
+    """
+    if not os.path.exists(BASELINES_PATH):
+        print("Nenhuma linha de base salva; use --save-baseline para criar.")
+        return []
+    with open(BASELINES_PATH, encoding="utf-8") as f:
+        baseline = json.load(f).get(scale, {})
+
+    regressions = []
+    for name, result in results.items():
+        if name in baseline and result["median"] > baseline[name] * REGRESSION_TOLERANCE:
+            regressions.append(f"{name}: {result['median'] * 1000:.1f}ms (linha de base {baseline[name] * 1000:.1f}ms)")
+    return regressions
+
+def save_baseline(scale, results):
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH, encoding="utf-8") as f:
+            baselines = json.load(f)
+    baselines.setdefault(scale, {}).update({name: result["median"] for name, result in results.items()})
+    with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Linha de base salva em {BASELINES_PATH}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do Ada Bot com dados sintéticos.")
+    parser.add_argument("--scale", choices=sorted(synthetic.SCALES), default="small")
+    parser.add_argument("--backend", choices=synthetic.BACKENDS, default="sqlite", help="backend de armazenamento medido")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fetch-latency", type=float, default=0.0, help="latência simulada de fetch_user, em segundos")
+    parser.add_argument("--send-latency", type=float, default=0.0, help="latência simulada de envio de mensagens, em segundos")
+    parser.add_argument("--only", nargs="*", help="executa apenas os cenários indicados")
+    parser.add_argument("--save-baseline", action="store_true", help="salva os resultados como linha de base")
+    args = parser.parse_args()
+
+    synthetic.use_backend(args.backend)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    results = asyncio.run(run(args.scale, args.repeat, args.fetch_latency, args.send_latency, args.only))
+
+    if args.save_baseline:
+        save_baseline(args.scale, results)
+        return
+
+    regressions = compare(args.scale, results)
+    if regressions:
+        print("❌ Regressões encontradas:\n" + "\n".join(regressions))
+        sys.exit(1)
+    print("✅ Nenhuma regressão.")
+
+if __name__ == "__main__":
+    main()
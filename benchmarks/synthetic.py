@@ -0,0 +1,202 @@
+import datetime
+import os
+import random
+import shutil
+import sqlite3
+import pytz
+
+BR_TZ = pytz.timezone("America/Sao_Paulo")
+
+# Escalas pré-definidas: servidores, membros por servidor, tarefas, pontos e reuniões (totais).
+SCALES = {
+    'small': dict(guilds=10, members=20, tasks=1_000, clockpoints=5_000, meetings=500),
+    'medium': dict(guilds=500, members=50, tasks=50_000, clockpoints=250_000, meetings=20_000),
+    'large': dict(guilds=10_000, members=50, tasks=1_000_000, clockpoints=5_000_000, meetings=200_000),
+}
+
+STATUSES = ["A Fazer", "Em Andamento", "Concluída"]
+CHUNK_SIZE = 50_000
+
+def guild_id_for(index):
+    return 100_000_000_000_000_000 + index
+
+def member_id_for(guild_index, member_index):
+    return 200_000_000_000_000_000 + guild_index * 1_000 + member_index
+
+def member_name_for(guild_index, member_index):
+    return f"membro_{guild_index}_{member_index}"
+
+def role_name_for(guild_index, role_index):
+    return f"cargo_{guild_index}_{role_index}"
+
+def _chunks(rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def synthetic_rows(guilds, members, tasks, clockpoints, meetings, seed=42, now=None):
+    """
+    Retorna os geradores (tarefas, pontos, reuniões) das linhas sintéticas reprodutíveis,
+    a serem consumidos nessa ordem. Os nomes dos responsáveis seguem
+    member_name_for/role_name_for para casar com os fakes.
+    """
+    rng = random.Random(seed)
+    now = now or BR_TZ.localize(datetime.datetime(2026, 1, 15, 12, 0))
+
+    def random_time(days_back):
+        return now - datetime.timedelta(seconds=rng.randrange(days_back * 86400))
+
+    def task_rows():
+        for _ in range(tasks):
+            guild_index = rng.randrange(guilds)
+            if rng.random() < 0.7:
+                assigned_to = member_name_for(guild_index, rng.randrange(members))
+            else:
+                assigned_to = f"@{role_name_for(guild_index, rng.randrange(3))}"
+            start = random_time(30)
+            due = start + datetime.timedelta(days=rng.randrange(1, 60))
+            yield (
+                str(guild_id_for(guild_index)), f"Tarefa {rng.randrange(1_000_000)}", assigned_to,
+                str(rng.choice([3600, 86400, 7 * 86400])), start.isoformat(), due.isoformat(), rng.choice(STATUSES)
+            )
+
+    def clockpoint_rows():
+        for _ in range(clockpoints):
+            guild_index = rng.randrange(guilds)
+            check_in = random_time(365)
+            check_out = check_in + datetime.timedelta(minutes=rng.randrange(30, 600))
+            yield (
+                str(guild_id_for(guild_index)), str(member_id_for(guild_index, rng.randrange(members))),
+                check_in.isoformat(), check_out.isoformat() if rng.random() > 0.01 else None
+            )
+
+    def meeting_rows():
+        for _ in range(meetings):
+            guild_index = rng.randrange(guilds)
+            participants = {member_id_for(guild_index, rng.randrange(members)) for _ in range(rng.randrange(1, 6))}
+            check_in = random_time(365)
+            check_out = check_in + datetime.timedelta(minutes=rng.randrange(15, 180))
+            yield (
+                str(guild_id_for(guild_index)), ",".join(str(p) for p in participants), "",
+                check_in.isoformat(), check_out.isoformat()
+            )
+
+    return task_rows(), clockpoint_rows(), meeting_rows()
+
+def generate(path, guilds, members, tasks, clockpoints, meetings, seed=42, now=None):
+    """
+    Preenche um ada.db (com o esquema já criado) com dados sintéticos reprodutíveis.
+    """
+    task_rows, clockpoint_rows, meeting_rows = synthetic_rows(guilds, members, tasks, clockpoints, meetings, seed, now)
+    with sqlite3.connect(path) as conn:
+        for chunk in _chunks(task_rows):
+            conn.executemany(
+                "INSERT INTO tasks (guild_id, title, assigned_to, reminder_interval, start_date, due_date, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                chunk
+            )
+        for chunk in _chunks(clockpoint_rows):
+            conn.executemany("INSERT INTO clockpoint (guild_id, user_id, check_in, check_out) VALUES (?, ?, ?, ?)", chunk)
+        for chunk in _chunks(meeting_rows):
+            conn.executemany(
+                "INSERT INTO meetings (guild_id, participants, topics, check_in_time, check_out_time) VALUES (?, ?, ?, ?, ?)",
+                chunk
+            )
+        conn.execute(
+            "INSERT INTO meeting_topics (meeting_id, author_id, created_at, text) "
+            "SELECT id, substr(participants, 1, instr(participants || ',', ',') - 1), check_in_time, 'Tópico ' || id FROM meetings"
+        )
+        conn.commit()
+
+async def generate_pg(conn, guilds, members, tasks, clockpoints, meetings, seed=42, now=None):
+    """
+    Mesmos dados de generate, carregados no PostgreSQL com COPY (conn é uma conexão asyncpg).
+    """
+    task_rows, clockpoint_rows, meeting_rows = synthetic_rows(guilds, members, tasks, clockpoints, meetings, seed, now)
+    for table, columns, rows in (
+        ('tasks', ('guild_id', 'title', 'assigned_to', 'reminder_interval', 'start_date', 'due_date', 'status'), task_rows),
+        ('clockpoint', ('guild_id', 'user_id', 'check_in', 'check_out'), clockpoint_rows),
+        ('meetings', ('guild_id', 'participants', 'topics', 'check_in_time', 'check_out_time'), meeting_rows),
+    ):
+        for chunk in _chunks(rows):
+            await conn.copy_records_to_table(table, columns=columns, records=chunk)
+    await conn.execute(
+        "INSERT INTO meeting_topics (meeting_id, author_id, created_at, text) "
+        "SELECT id, split_part(participants, ',', 1), check_in_time, 'Tópico ' || id FROM meetings"
+    )
+    await conn.execute("ANALYZE")
+
+# Backends de armazenamento: o PostgreSQL usa um esquema só desta execução, apagado ao final.
+BACKENDS = ("sqlite", "postgres")
+# Tabelas copiadas para o modelo restaurado antes de cada cenário que altera dados.
+PG_TABLES = (
+    'tasks', 'clockpoint', 'meetings', 'meeting_topics', 'retention_policies', 'kanban_boards',
+    'scheduler_leases', 'reminder_directory', 'reminder_outbox', 'clockpoint_archive', 'meetings_archive',
+)
+
+def use_backend(backend):
+    """
+    Configura o backend pelas variáveis de ambiente; chamar antes de importar database.
+    O PostgreSQL usa o servidor de ADA_DATABASE_URL.
+    """
+    os.environ["ADA_STORAGE_BACKEND"] = backend
+    if backend == "postgres":
+        os.environ["ADA_PG_SCHEMA"] = f"ada_bench_{os.getpid()}"
+
+async def populate(database, **params):
+    """
+    Cria o esquema e preenche o banco do backend configurado com os dados sintéticos.
+    """
+    await database.init_db()
+    if database.STORAGE_BACKEND == "postgres":
+        import database_pg
+        async with database_pg.connect_db() as conn:
+            await generate_pg(conn, **params)
+    else:
+        generate(database.DB_PATH, **params)
+
+async def save_template(database):
+    """
+    Guarda o estado atual do banco para restore_template.
+    """
+    if database.STORAGE_BACKEND == "postgres":
+        import database_pg
+        async with database_pg.connect_db() as conn:
+            for table in PG_TABLES:
+                await conn.execute(f"CREATE TABLE template_{table} AS SELECT * FROM {table}")
+    else:
+        shutil.copyfile(database.DB_PATH, "template.db")
+
+async def restore_template(database):
+    """
+    Volta o banco ao estado guardado por save_template e limpa o cache de consultas.
+    """
+    if database.STORAGE_BACKEND == "postgres":
+        import database_pg
+        async with database_pg.connect_db() as conn:
+            async with conn.transaction():
+                await conn.execute(f"TRUNCATE {', '.join(PG_TABLES)}")
+                for table in PG_TABLES:
+                    await conn.execute(f"INSERT INTO {table} SELECT * FROM template_{table}")
+                    if table not in ('retention_policies', 'kanban_boards', 'scheduler_leases', 'reminder_directory'):
+                        await conn.execute(
+                            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), GREATEST((SELECT MAX(id) FROM {table}), 1))"
+                        )
+    else:
+        shutil.copyfile("template.db", database.DB_PATH)
+    database.query_cache.clear()
+
+async def drop_backend(database):
+    """
+    Apaga o esquema da execução e fecha o pool de conexões (só no PostgreSQL).
+    """
+    if database.STORAGE_BACKEND != "postgres":
+        return
+    import database_pg
+    async with database_pg.connect_db() as conn:
+        await conn.execute(f'DROP SCHEMA IF EXISTS "{database_pg.PG_SCHEMA}" CASCADE')
+    await database_pg.close_pool()
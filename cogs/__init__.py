@@ -0,0 +1,88 @@
+import asyncio
+import datetime
+import functools
+import discord
+from discord.ext import commands
+
+# Extensões do bot (comandos, relatórios e agendador), carregadas no setup_hook.
+# Cada uma pode ser recarregada no lugar com >recarregar (ou SIGHUP), sem reconectar ao gateway.
+# O estado que precisa sobreviver ao reload (caches, pools, filas, índices de membros) fica
+# nos módulos de fora deste pacote, que não são recarregados; as tarefas periódicas dos cogs
+# passam o seu estado para a nova versão por HANDOVER.
+EXTENSIONS = (
+    "cogs.admin",
+    "cogs.tarefas",
+    "cogs.ponto",
+    "cogs.reunioes",
+    "cogs.relatorios",
+    "cogs.dados",
+    "cogs.lembretes",
+)
+
+# Estado deixado por um cog descarregado para a próxima versão dele, pelo nome do cog.
+HANDOVER = {}
+
+def protected_iteration(func):
+    """
+    Roda cada iteração de uma tarefa periódica numa tarefa à parte, que o cancelamento
+    feito ao descarregar o cog não interrompe. Usar abaixo de @tasks.loop.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        task = asyncio.create_task(func(self, *args, **kwargs), name=func.__name__)
+        self._iterations.add(task)
+        task.add_done_callback(self._iterations.discard)
+        await asyncio.shield(task)
+    return wrapper
+
+class ReloadableCog(commands.Cog):
+    """
+    Cog com tarefas periódicas que sobrevivem a um reload_extension: a iteração em andamento
+    termina normalmente, e a nova versão do cog espera por ela e mantém o horário marcado
+    para a próxima execução, em vez de rodar de novo logo ao carregar.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._iterations = set()
+        self._inherited = set()
+        self._resume_at = {}
+
+    def loops(self):
+        """
+        Tarefas periódicas (tasks.loop) que este cog mantém rodando.
+        """
+        return ()
+
+    async def cog_load(self):
+        state = HANDOVER.pop(self.qualified_name, {})
+        self._inherited = {task for task in state.get("iterations", ()) if not task.done()}
+        self._resume_at = state.get("resume_at", {})
+        for loop in self.loops():
+            loop.start()
+
+    async def cog_unload(self):
+        resume_at = {}
+        for loop in self.loops():
+            name = loop.coro.__name__
+            if loop.is_running() and (loop.next_iteration or name in self._resume_at):
+                resume_at[name] = loop.next_iteration or self._resume_at[name]
+            loop.cancel()
+        HANDOVER[self.qualified_name] = {
+            "iterations": {task for task in self._iterations | self._inherited if not task.done()},
+            "resume_at": resume_at,
+        }
+
+    async def resume(self, loop, delay=0):
+        """
+        Para o before_loop: espera o bot ficar pronto, a iteração herdada da versão anterior
+        do cog terminar e o horário que ela marcou para a próxima execução. Sem versão
+        anterior, a primeira execução acontece delay segundos depois.
+        """
+        await self.bot.wait_until_ready()
+        if self._inherited:
+            await asyncio.wait(self._inherited)
+        name = loop.coro.__name__
+        if name not in self._resume_at:
+            self._resume_at[name] = discord.utils.utcnow() + datetime.timedelta(seconds=delay)
+        await discord.utils.sleep_until(self._resume_at[name])
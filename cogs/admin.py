@@ -0,0 +1,143 @@
+import discord
+from discord.ext import commands
+from database import QUERY_CACHE_REQUESTS, query_cache
+from metrics import COMMAND_LATENCY, DB_LATENCY, REPORT_PHASE_LATENCY, REMINDER_SWEEP_LATENCY
+from reminders import REMINDER_MODE
+from admission import ADMISSION_WAIT
+from profiler import PROFILE_MAX_RUNS, PROFILE_MODES, SWEEP_TARGET, profiler
+from loop_watchdog import LOOP_LAG, LOOP_STALLS
+
+COMMAND_ORDER = [
+    'ajuda',
+    'add_tarefa',
+    'list_tarefas',
+    'update_status',
+    'quadro',
+    'delete_tarefa',
+    'check_in',
+    'check_out',
+    'list_ponto',
+    'editar_ponto',
+    'delete_ponto',
+    'check_in_reuniao',
+    'add_topico',
+    'check_out_reuniao',
+    'list_reuniao',
+    'delete_reuniao',
+    'gerar_relatorio',
+    'exportar',
+    'retencao',
+    'backup_servidor',
+    'restaurar_backup',
+    'jobs',
+    'perfil',
+]
+
+class Admin(commands.Cog):
+    """
+    Ajuda, métricas e ferramentas do dono e dos administradores.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(help="Mostra esta mensagem de ajuda com todos os comandos disponíveis.")
+    async def ajuda(self, ctx):
+        """
+        Mostra esta mensagem de ajuda com todos os comandos disponíveis.
+        A ordem de exibição é definida na lista COMMAND_ORDER.
+        """
+        embed = discord.Embed(
+            title="🤖 Comandos do Bot de Gerenciamento",
+            description="Aqui estão todos os comandos que você pode usar:",
+            color=discord.Color.green()
+        )
+
+        for command_name in COMMAND_ORDER:
+            command = self.bot.get_command(command_name)
+            if command and not command.hidden:
+                embed.add_field(
+                    name=f"`>{command.name}`",
+                    value=f"{command.help}",
+                    inline=False
+                )
+
+        await ctx.send(embed=embed)
+
+    @commands.command(hidden=True)
+    @commands.is_owner()
+    async def stats(self, ctx):
+        """
+        Mostra as latências registradas (p50/p99 e contagem) dos comandos, das funções
+        do banco, das fases do relatório, da varredura de lembretes e da espera na fila de comandos.
+        Apenas o dono do bot pode usar.
+        A exposição completa no formato do Prometheus fica em /metrics.
+        """
+        embed = discord.Embed(title="📈 Latências", color=discord.Color.purple())
+        for metric, title in (
+            (COMMAND_LATENCY, "Comandos"),
+            (DB_LATENCY, "Banco de dados"),
+            (REPORT_PHASE_LATENCY, "Relatório PDF"),
+            (REMINDER_SWEEP_LATENCY, "Lembretes"),
+            (ADMISSION_WAIT, "Fila de comandos"),
+        ):
+            lines = []
+            for key, (_, _, count) in sorted(metric.series.items(), key=lambda item: -item[1][2])[:10]:
+                labels = dict(key)
+                p50 = metric.quantile(0.5, **labels)
+                p99 = metric.quantile(0.99, **labels)
+                name = " ".join(str(value) for value in labels.values()) or "total"
+                lines.append(f"`{name}`: p50 {p50 * 1000:.0f}ms · p99 {p99 * 1000:.0f}ms · {count}x")
+            embed.add_field(name=title, value="\n".join(lines) or "Sem dados", inline=False)
+        lag = LOOP_LAG.series.get((), 0.0)
+        stalls = sum(LOOP_STALLS.series.values())
+        embed.add_field(name="Event loop", value=f"Atraso atual: {lag * 1000:.0f}ms · bloqueios: {stalls}", inline=False)
+        hits = sum(value for key, value in QUERY_CACHE_REQUESTS.series.items() if dict(key).get("result") == "hit")
+        misses = sum(value for key, value in QUERY_CACHE_REQUESTS.series.items() if dict(key).get("result") == "miss")
+        cache_status = (
+            f"{hits} acertos · {misses} falhas · {len(query_cache.entries)} consultas ({query_cache.rows}/{query_cache.max_rows} linhas)"
+            if query_cache.enabled else "Desativado"
+        )
+        embed.add_field(name="Cache de consultas", value=cache_status, inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.command(help="Administrador captura um perfil de desempenho das próximas execuções de um comando (ou da próxima varredura de lembretes) neste servidor. Ex: >perfil list_ponto 5 ou >perfil check_reminders 1 pstats")
+    @commands.has_permissions(administrator=True)
+    async def perfil(self, ctx, alvo: str, execucoes: int = 1, modo: str = "amostras"):
+        """
+        Arma a captura das próximas execuções do comando neste servidor. O resultado chega neste canal:
+        pilhas colapsadas (.folded, para flamegraph.pl ou speedscope) no modo "amostras",
+        ou um arquivo do cProfile (.pstats) no modo "pstats".
+        Exemplo de uso: >perfil list_ponto 5 / >perfil check_reminders 1 pstats
+        """
+        alvo = alvo.lstrip(">").lower()
+        modo = modo.lower()
+        if alvo == SWEEP_TARGET:
+            if REMINDER_MODE == "worker":
+                await ctx.send("❌ A varredura de lembretes roda no worker separado, não neste processo.")
+                return
+        elif self.bot.get_command(alvo) is None:
+            await ctx.send(f"❌ Comando '{alvo}' não encontrado. Use o nome de um comando ou `{SWEEP_TARGET}`.")
+            return
+        if modo not in PROFILE_MODES:
+            await ctx.send(f"❌ Modo inválido. Use: {', '.join(PROFILE_MODES)}")
+            return
+        if not 1 <= execucoes <= PROFILE_MAX_RUNS:
+            await ctx.send(f"❌ O número de execuções deve ficar entre 1 e {PROFILE_MAX_RUNS}.")
+            return
+
+        alvo = self.bot.get_command(alvo).qualified_name if alvo != SWEEP_TARGET else alvo
+        profiler.arm(str(ctx.guild.id), alvo, execucoes, modo, ctx.channel.id)
+        await ctx.send(f"🔬 Perfil armado: as próximas {execucoes} execução(ões) de `{alvo}` neste servidor serão capturadas (modo {modo}).")
+
+    @commands.command(hidden=True)
+    @commands.is_owner()
+    async def sincronizar(self, ctx):
+        """
+        Registra no Discord os comandos de barra. Apenas o dono do bot pode usar.
+        """
+        synced = await self.bot.tree.sync()
+        await ctx.send(f"✅ {len(synced)} comando(s) de barra sincronizado(s).")
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
@@ -0,0 +1,180 @@
+import datetime
+import os
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+from database import (
+    BR_TZ, STORAGE_BACKEND, archive_clockpoint_batch, archive_meetings_batch, compact_db, get_retention_policies,
+    get_retention_policy, set_retention_policy
+)
+from backup import create_snapshot, export_guild, restore_guild
+from jobs import remove_file, send_file_followup, submit_job
+from loop_watchdog import activity
+from cogs import ReloadableCog, protected_iteration
+
+# Horários (em Brasília) em que o arquivamento de registros antigos pode rodar,
+# e quantos lotes no máximo são movidos por tabela e servidor a cada execução.
+ARCHIVE_OFF_PEAK_HOURS = range(2, 6)
+ARCHIVE_MAX_BATCHES = 10
+
+# Intervalo entre snapshots automáticos do banco (0 desativa).
+BACKUP_INTERVAL_HOURS = int(os.getenv("ADA_BACKUP_INTERVAL_HOURS", "24"))
+
+class Storage(ReloadableCog):
+    """
+    Retenção, arquivamento, backups e snapshots dos dados.
+    """
+
+    def loops(self):
+        # Com PostgreSQL os snapshots completos ficam com o pg_dump do próprio banco.
+        if BACKUP_INTERVAL_HOURS > 0 and STORAGE_BACKEND == "sqlite":
+            return (self.archive_old_records, self.scheduled_snapshot)
+        return (self.archive_old_records,)
+
+    @commands.command(help="Administrador define por quantos meses pontos e reuniões finalizados ficam no banco principal antes de irem para o arquivo. Ex: >retencao 6 ou >retencao 0 para desativar")
+    @commands.has_permissions(administrator=True)
+    async def retencao(self, ctx, meses: int = None):
+        """
+        Mostra ou define a política de retenção do servidor. Apenas para administradores.
+        Exemplo de uso: >retencao 12
+        """
+        try:
+            guild_id = str(ctx.guild.id)
+            if meses is None:
+                current = await get_retention_policy(guild_id)
+                if current:
+                    await ctx.send(f"🗄️ Pontos e reuniões finalizados há mais de **{current}** meses são movidos para o arquivo.")
+                else:
+                    await ctx.send("🗄️ Nenhuma política de retenção definida. Todos os registros ficam no banco principal.")
+                return
+
+            if meses < 0:
+                await ctx.send("❌ O número de meses não pode ser negativo.")
+                return
+
+            await set_retention_policy(guild_id, meses or None)
+            if meses:
+                await ctx.send(f"✅ Pontos e reuniões finalizados há mais de **{meses}** meses serão movidos para o arquivo fora do horário de pico.")
+            else:
+                await ctx.send("✅ Política de retenção desativada.")
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao definir a política de retenção: {e}")
+
+    @commands.command(help="Administrador exporta todos os dados do servidor para um arquivo de backup. Ex: >backup_servidor")
+    @commands.has_permissions(administrator=True)
+    async def backup_servidor(self, ctx):
+        """
+        Exporta tarefas, pontos, reuniões e o arquivo morto do servidor para um arquivo compactado.
+        Exemplo de uso: >backup_servidor
+        """
+        try:
+            await ctx.send("💾 Gerando backup do servidor...")
+            filename = await export_guild(str(ctx.guild.id))
+            with open(filename, 'rb') as f:
+                await ctx.send(file=discord.File(f, os.path.basename(filename)))
+            os.remove(filename)
+            await ctx.send("✅ Backup gerado com sucesso! Guarde o arquivo para usar com `>restaurar_backup`.")
+        except Exception as e:
+            await ctx.send(f"❌ Erro ao gerar o backup: {e}")
+
+    @commands.command(help="Administrador substitui os dados do servidor pelos de um backup anexado à mensagem. Ex: >restaurar_backup (com o arquivo .db.gz anexado)")
+    @commands.has_permissions(administrator=True)
+    async def restaurar_backup(self, ctx):
+        """
+        Restaura os dados do servidor a partir do arquivo gerado por >backup_servidor.
+        Exemplo de uso: >restaurar_backup com o arquivo anexado
+        """
+        if not ctx.message.attachments or not ctx.message.attachments[0].filename.endswith(".db.gz"):
+            await ctx.send("❌ Anexe o arquivo `.db.gz` gerado por `>backup_servidor`.")
+            return
+
+        guild_id = str(ctx.guild.id)
+        filename = f"restaurar_{guild_id}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.db.gz"
+        try:
+            await ctx.message.attachments[0].save(filename)
+            restored = await restore_guild(guild_id, filename)
+            self.bot.board_updater.schedule(guild_id)
+            await ctx.send(f"✅ Backup restaurado com sucesso: **{restored}** registro(s).")
+        except Exception as e:
+            await ctx.send(f"❌ Erro ao restaurar o backup: {e}")
+        finally:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    @commands.command(hidden=True)
+    @commands.is_owner()
+    async def snapshot(self, ctx):
+        """
+        Gera um snapshot de todos os arquivos de dados. Apenas o dono do bot pode usar.
+        """
+        try:
+            snapshot_dir = await create_snapshot()
+            await ctx.send(f"✅ Snapshot criado em `{snapshot_dir}`.")
+        except Exception as e:
+            await ctx.send(f"❌ Erro ao criar o snapshot: {e}")
+
+    @app_commands.command(name="backup", description="Exporta todos os dados do servidor para um arquivo de backup.")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def backup_slash(self, interaction: discord.Interaction):
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        guild_id = str(interaction.guild_id)
+
+        async def run(job):
+            job.progress = "exportando"
+            return await export_guild(guild_id)
+
+        await submit_job(interaction, (guild_id, "backup"), "Backup do servidor", run, send_file_followup, remove_file)
+
+    @tasks.loop(hours=max(BACKUP_INTERVAL_HOURS, 1))
+    @protected_iteration
+    async def scheduled_snapshot(self):
+        """
+        Gera snapshots periódicos do banco com a API de backup online e aplica a rotação.
+        A primeira execução acontece um intervalo depois de o bot iniciar.
+        """
+        try:
+            with activity("scheduled_snapshot"):
+                print(f"Snapshot criado em {await create_snapshot()}")
+        except Exception as e:
+            print(f"❌ Erro ao criar o snapshot: {e}")
+
+    @scheduled_snapshot.before_loop
+    async def before_scheduled_snapshot(self):
+        await self.resume(self.scheduled_snapshot, delay=BACKUP_INTERVAL_HOURS * 60 * 60)
+
+    @tasks.loop(minutes=10)
+    @protected_iteration
+    async def archive_old_records(self):
+        """
+        Move, em lotes pequenos e apenas fora do horário de pico, os pontos e reuniões
+        finalizados mais antigos que a política de retenção de cada servidor, e depois
+        compacta o banco principal dos servidores que tiveram registros movidos.
+        """
+        now = datetime.datetime.now(BR_TZ)
+        if now.hour not in ARCHIVE_OFF_PEAK_HOURS:
+            return
+
+        try:
+            with activity("archive_old_records"):
+                for guild_id, months in await get_retention_policies():
+                    cutoff = (now - datetime.timedelta(days=30 * months)).isoformat()
+                    moved = 0
+                    for archive_batch in (archive_clockpoint_batch, archive_meetings_batch):
+                        for _ in range(ARCHIVE_MAX_BATCHES):
+                            count = await archive_batch(guild_id, cutoff)
+                            moved += count
+                            if not count:
+                                break
+                    if moved:
+                        await compact_db(guild_id)
+        except Exception as e:
+            print(f"❌ Erro ao arquivar registros antigos: {e}")
+
+    @archive_old_records.before_loop
+    async def before_archive_old_records(self):
+        await self.resume(self.archive_old_records)
+
+async def setup(bot):
+    await bot.add_cog(Storage(bot))
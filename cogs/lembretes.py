@@ -0,0 +1,104 @@
+import datetime
+from discord.ext import tasks
+from database import BR_TZ, acquire_lease, get_active_assignees, publish_reminder_directory
+from metrics import REMINDER_SWEEP_LATENCY, timer
+from reminders import (
+    LEASE_TTL, REMINDER_MODE, SCHEDULER_ID, SWEEP_INTERVAL,
+    deliver_outbox, lease_name, outbox_nonce, run_sweep, reminder_channel, resolve_destiny
+)
+from profiler import SWEEP_TARGET, profiler, send_profile
+from loop_watchdog import activity
+from cogs import ReloadableCog, protected_iteration
+
+class Reminders(ReloadableCog):
+    """
+    Agendador dos lembretes: a varredura periódica ou, no modo "worker", a publicação
+    do diretório de destinos para reminder_worker.py.
+    """
+
+    def loops(self):
+        if REMINDER_MODE == "worker":
+            return (self.publish_reminder_targets,)
+        return (self.check_reminders,)
+
+    @tasks.loop(seconds=SWEEP_INTERVAL)
+    @protected_iteration
+    async def check_reminders(self):
+        # Cada shard do gateway é varrido separadamente, com seu próprio líder,
+        # para que vários processos possam dividir os shards entre si.
+        guilds_by_shard = {}
+        for guild in self.bot.guilds:
+            guilds_by_shard.setdefault(guild.shard_id, []).append(guild)
+
+        for shard_id, shard_guilds in sorted(guilds_by_shard.items()):
+            name = lease_name(shard_id if self.bot.shard_count else None)
+            if not await acquire_lease(name, SCHEDULER_ID, LEASE_TTL):
+                continue
+            print(f"Verificando lembretes ({name})...")
+            with activity(f"check_reminders {name}"), timer(REMINDER_SWEEP_LATENCY, shard=str(shard_id)):
+                # Servidores com perfil armado são varridos à parte, dentro da captura.
+                profiled = profiler.armed_guilds(SWEEP_TARGET) if profiler.armed else ()
+                for guild in shard_guilds:
+                    if str(guild.id) in profiled:
+                        capture = profiler.start(str(guild.id), SWEEP_TARGET)
+                        await self.sweep_reminders([guild])
+                        await send_profile(self.bot, profiler.stop(capture))
+                await self.sweep_reminders([guild for guild in shard_guilds if str(guild.id) not in profiled])
+
+    @check_reminders.before_loop
+    async def before_check_reminders(self):
+        await self.resume(self.check_reminders)
+
+    async def sweep_reminders(self, guilds=None):
+        now = datetime.datetime.now(BR_TZ)
+
+        try:
+            guilds = {str(guild.id): guild for guild in (self.bot.guilds if guilds is None else guilds)}
+
+            async def address(guild_id, task):
+                guild = guilds[guild_id]
+                destiny = await resolve_destiny(guild, task.assigned_to)
+                if not destiny:
+                    return None
+                target_channel = reminder_channel(guild)
+                return (target_channel.id if target_channel else None, destiny.mention)
+
+            async def send(entry):
+                await self.bot.get_partial_messageable(int(entry.channel_id)).send(entry.content, nonce=outbox_nonce(entry))
+
+            await run_sweep(guilds, address, now, on_escalate=self.bot.board_updater.schedule)
+            # Também entrega o que ficou na caixa de saída de varreduras anteriores (falhas ou queda do processo).
+            await deliver_outbox(guilds, send)
+
+        except Exception as e:
+            print(f"❌ Erro na tarefa de lembretes: {e}")
+
+    @tasks.loop(minutes=2)
+    @protected_iteration
+    async def publish_reminder_targets(self):
+        """
+        No modo "worker", publica no banco o canal de lembretes e a menção de cada responsável
+        com tarefa em andamento, para que reminder_worker.py envie os lembretes só pela API REST.
+        """
+        try:
+            guilds = {str(guild.id): guild for guild in self.bot.guilds}
+            assignees = await get_active_assignees(guilds)
+            entries = []
+            for guild_id, guild in guilds.items():
+                channel = reminder_channel(guild)
+                mentions = {}
+                for assigned_to in assignees.get(guild_id, ()):
+                    destiny = await resolve_destiny(guild, assigned_to)
+                    if destiny:
+                        mentions[assigned_to] = destiny.mention
+                entries.append((guild_id, channel.id if channel else None, mentions))
+            await publish_reminder_directory(entries)
+        except Exception as e:
+            print(f"❌ Erro ao publicar o diretório de lembretes: {e}")
+
+    @publish_reminder_targets.before_loop
+    async def before_publish_reminder_targets(self):
+        await self.resume(self.publish_reminder_targets)
+
+async def setup(bot):
+    await bot.add_cog(Reminders(bot))
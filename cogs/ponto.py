@@ -0,0 +1,175 @@
+import datetime
+import discord
+from discord.ext import commands
+from database import (
+    BR_TZ, add_check_in, add_check_out, delete_clockpoint_by_id, get_clockpoint_entries,
+    get_clockpoint_entries_by_user, get_clockpoint_entry_by_id, is_user_checked_in,
+    update_check_in_time, update_check_out_time
+)
+from member_cache import member_names
+from member_index import IndexedMember
+
+class Clockpoint(commands.Cog):
+    """
+    Comandos do relógio de ponto.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(help="Começa a contagem do relógio de ponto. Ex: >check_in")
+    async def check_in(self, ctx):
+        """
+        Comando para registrar o início do expediente.
+        Exemplo de uso: >check_in
+        """
+        guild_id = str(ctx.guild.id)
+        user_id = str(ctx.author.id)
+        now = datetime.datetime.now(BR_TZ)
+
+        if await is_user_checked_in(guild_id, user_id):
+            await ctx.send("⏰ Você já está com um check-in ativo.")
+            return
+
+        try:
+            await add_check_in(guild_id, user_id, now.isoformat())
+            await ctx.send(f"✅ **Check-in** registrado com sucesso em: **{now.strftime('%H:%M:%S')}**.")
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao registrar the check-in: {e}")
+
+    @commands.command(help="Para a contagem do relógio de ponto. Ex: >check_out")
+    async def check_out(self, ctx):
+        """
+        Comando para registrar o fim do expediente.
+        Exemplo de uso: >check_out
+        """
+        guild_id = str(ctx.guild.id)
+        user_id = str(ctx.author.id)
+        now = datetime.datetime.now(BR_TZ)
+
+        if not await is_user_checked_in(guild_id, user_id):
+            await ctx.send("❌ Você não tem um check-in ativo para registrar o check-out.")
+            return
+
+        try:
+            await add_check_out(guild_id, user_id, now.isoformat())
+            await ctx.send(f"✅ **Check-out** registrado com sucesso em: **{now.strftime('%H:%M:%S')}**.")
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao registrar o check-out: {e}")
+
+    @commands.command(help="Lista todos os pontos ou por usuário. Ex: >list_ponto ou >list_ponto @usuario")
+    async def list_ponto(self, ctx, member: IndexedMember = None):
+        """
+        Comando para listar os registros de ponto.
+        Exemplo de uso:
+        - >list_ponto
+        - >list_ponto @usuario
+        """
+        try:
+            guild_id = str(ctx.guild.id)
+            entries = []
+            if member:
+                entries = await get_clockpoint_entries_by_user(guild_id, str(member.id))
+                title = f"Registros de Ponto para {member.display_name}"
+            else:
+                entries = await get_clockpoint_entries(guild_id)
+                title = "Todos os Registros de Ponto"
+
+            if not entries:
+                await ctx.send(f"Não há registros de ponto para exibir.")
+                return
+
+            embed = discord.Embed(
+                title=title,
+                color=discord.Color.gold()
+            )
+
+            names = await member_names(self.bot, ctx.guild, [entry.user_id for entry in entries])
+            for entry in entries:
+                user_name = names.get(int(entry.user_id)) or "Usuário Desconhecido"
+
+                check_in_dt = entry.check_in
+                check_out_dt = entry.check_out
+                duration_str = "Em andamento"
+
+                if check_out_dt:
+                    duration = check_out_dt - check_in_dt
+                    hours, remainder = divmod(duration.total_seconds(), 3600)
+                    minutes, _ = divmod(remainder, 60)
+                    duration_str = f"{int(hours)}h {int(minutes)}m"
+
+                embed.add_field(
+                    name=f"👤 {user_name} (ID do Ponto: {entry.id})",
+                    value=f"**Entrada:** {check_in_dt.strftime('%d/%m/%Y %H:%M')}\n**Saída:** {check_out_dt.strftime('%d/%m/%Y %H:%M') if check_out_dt else 'N/A'}\n**Duração:** {duration_str}",
+                    inline=False
+                )
+
+            await ctx.send(embed=embed)
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao listar os registros: {e}")
+
+    @commands.command(help="Edita o check in ou check out pelo id. Ex: >editar_ponto check_in id data e horario ou >editar_ponto checkout id data e horario")
+    async def editar_ponto(self, ctx, entry_id: int, tipo_registro: str, *, novo_horario: str):
+        """
+        Permite que o usuário edite o seu próprio registro de ponto.
+        Exemplo de uso: >editar_ponto 1 check_in 20/09/2025 09:00
+        """
+        try:
+            guild_id = str(ctx.guild.id)
+            entry = await get_clockpoint_entry_by_id(guild_id, entry_id)
+
+            if not entry:
+                await ctx.send(f"❌ Registro de ponto com ID **{entry_id}** não encontrado.")
+                return
+
+            if str(entry.user_id) != str(ctx.author.id):
+                await ctx.send("❌ Você só pode editar os seus próprios registros de ponto.")
+                return
+
+            try:
+                new_dt = BR_TZ.localize(datetime.datetime.strptime(novo_horario, "%d/%m/%Y %H:%M"))
+                new_dt_iso = new_dt.isoformat()
+            except ValueError:
+                await ctx.send("❌ Formato de data e hora inválido. Use `DD/MM/AAAA HH:MM`.")
+                return
+
+            old_check_in_dt = entry.check_in
+            old_check_out_dt = entry.check_out
+
+            tipo_registro = tipo_registro.lower()
+            if tipo_registro == "check_in":
+                if old_check_out_dt and new_dt > old_check_out_dt:
+                    await ctx.send("❌ O novo horário de check-in não pode ser depois do check-out existente.")
+                    return
+                await update_check_in_time(guild_id, entry_id, new_dt_iso)
+                await ctx.send(f"✅ O check-in do registro **{entry_id}** foi atualizado para **{new_dt.strftime('%d/%m/%Y %H:%M')}**.")
+            elif tipo_registro == "check_out":
+                if new_dt < old_check_in_dt:
+                    await ctx.send("❌ O novo horário de check-out não pode ser antes do check-in existente.")
+                    return
+                await update_check_out_time(guild_id, entry_id, new_dt_iso)
+                await ctx.send(f"✅ O check-out do registro **{entry_id}** foi atualizado para **{new_dt.strftime('%d/%m/%Y %H:%M')}**.")
+            else:
+                await ctx.send("❌ Tipo de registro inválido. Use 'check_in' ou 'check_out'.")
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao editar o registro de ponto: {e}")
+
+    @commands.has_permissions(administrator=True)
+    @commands.command(help="Administrador do servidor deleta o ponto por id. Ex: >delete_ponto 15.")
+    async def delete_ponto(self, ctx, point_id: int):
+        """
+        Deleta um registro de ponto pelo seu ID. Apenas administradores podem usar.
+        Exemplo de uso: >delete_ponto 15
+        """
+        try:
+            guild_id = str(ctx.guild.id)
+            rows_deleted = await delete_clockpoint_by_id(guild_id, point_id)
+            if rows_deleted > 0:
+                await ctx.send(f"✅ Registro de ponto com ID **{point_id}** deletado com sucesso.")
+            else:
+                await ctx.send(f"⚠️ Nenhum registro de ponto encontrado com o ID **{point_id}**.")
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao deletar o registro: {e}")
+
+async def setup(bot):
+    await bot.add_cog(Clockpoint(bot))
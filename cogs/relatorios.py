@@ -0,0 +1,389 @@
+import asyncio
+import datetime
+import importlib
+import os
+import re
+import sys
+import discord
+from discord import app_commands
+from discord.ext import commands
+from database import (
+    get_all_meetings, get_clockpoint_entries, get_clockpoint_entries_between, get_meetings_between, get_tasks
+)
+from export import EXPORT_FORMATS, export_table, parse_period
+from metrics import REPORT_PHASE_LATENCY, PhaseTimer
+from jobs import job_queue, remove_file, send_file_followup, submit_job
+from member_cache import member_names
+from member_index import MEMBER, resolve
+
+# O ReportLab só é importado na primeira geração de PDF, ou em segundo plano
+# REPORT_WARMUP_DELAY segundos depois que o bot fica pronto.
+REPORTLAB_MODULES = (
+    "reportlab.lib.colors",
+    "reportlab.lib.pagesizes",
+    "reportlab.lib.styles",
+    "reportlab.lib.units",
+    "reportlab.platypus",
+)
+REPORT_WARMUP_DELAY = 30
+
+async def generate_pdf_report(bot, guild_id, report_type="todos", since=None, until=None, phases=None):
+    """
+    Gera um relatório PDF com os dados do servidor
+    report_type: "tarefas", "ponto", "reunioes", ou "todos"
+    since/until: período opcional (datetime); quando informado, pontos e reuniões
+    do período são buscados também no arquivo.
+    phases: PhaseTimer que acumula o tempo das fases query, resolve e render;
+    se omitido, as fases são registradas ao final da geração.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+    own_phases = phases is None
+    if own_phases:
+        phases = PhaseTimer(REPORT_PHASE_LATENCY, report=report_type)
+
+    filename = f"relatorio_{guild_id}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    doc = SimpleDocTemplate(filename, pagesize=A4)
+    elements = []
+    
+    # Estilos
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=30,
+        alignment=1
+    )
+    
+    title_text = f"Relatório #{guild_id} de Entrada - {datetime.datetime.now().strftime('%d/%m/%Y %H:%M')}"
+    elements.append(Paragraph(title_text, title_style))
+    if since and until:
+        period_text = f"Período: {since.strftime('%d/%m/%Y')} a {(until - datetime.timedelta(days=1)).strftime('%d/%m/%Y')}"
+        elements.append(Paragraph(period_text, styles['Normal']))
+    elements.append(Spacer(1, 20))
+    
+    # Seção de Tarefas
+    if report_type in ["tarefas", "todos"]:
+        # Agora usando a função de banco de dados
+        with phases.phase("query"):
+            tasks = await get_tasks(guild_id)
+        if tasks:
+            elements.append(Paragraph("TAREFAS", styles['Heading2']))
+            elements.append(Spacer(1, 10))
+            
+            task_data = [["ID", "Título", "Responsável", "Vencimento", "Status"]]
+            for task in tasks:
+                due_date_formatted = task.due_date.strftime('%d/%m/%Y %H:%M')
+                task_data.append([str(task.id), task.title, task.assigned_to, due_date_formatted, task.status])
+            
+            task_table = Table(task_data, colWidths=[0.5*inch, 2*inch, 1.5*inch, 1.2*inch, 1*inch])
+            task_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            elements.append(task_table)
+            elements.append(Spacer(1, 20))
+        else:
+            elements.append(Paragraph("Nenhuma tarefa encontrada.", styles['Normal']))
+            elements.append(Spacer(1, 10))
+    
+    # Seção de Registros de Ponto
+    if report_type in ["ponto", "todos"]:
+        # Agora usando a função de banco de dados
+        with phases.phase("query"):
+            if since and until:
+                entries = await get_clockpoint_entries_between(guild_id, since.isoformat(), until.isoformat())
+            else:
+                entries = await get_clockpoint_entries(guild_id)
+        if entries:
+            elements.append(Paragraph("REGISTROS DE PONTO", styles['Heading2']))
+            elements.append(Spacer(1, 10))
+            
+            with phases.phase("resolve"):
+                names = await member_names(bot, bot.get_guild(int(guild_id)), [entry.user_id for entry in entries])
+
+            ponto_data = [["ID", "Usuário", "Entrada", "Saída", "Duração"]]
+            for entry in entries:
+                user_name = names.get(int(entry.user_id)) or f"ID: {entry.user_id}"
+                
+                check_in_formatted = entry.check_in.strftime('%d/%m/%Y %H:%M')
+                
+                if entry.check_out:
+                    check_out_formatted = entry.check_out.strftime('%d/%m/%Y %H:%M')
+                    duration = entry.check_out - entry.check_in
+                    hours, remainder = divmod(duration.total_seconds(), 3600)
+                    minutes, _ = divmod(remainder, 60)
+                    duration_str = f"{int(hours)}h {int(minutes)}m"
+                else:
+                    check_out_formatted = "Em andamento"
+                    duration_str = "Em andamento"
+                
+                ponto_data.append([str(entry.id), user_name, check_in_formatted, check_out_formatted, duration_str])
+            
+            ponto_table = Table(ponto_data, colWidths=[0.5*inch, 1.5*inch, 1.5*inch, 1.5*inch, 1*inch])
+            ponto_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            elements.append(ponto_table)
+            elements.append(Spacer(1, 20))
+        else:
+            elements.append(Paragraph("Nenhum registro de ponto encontrado.", styles['Normal']))
+            elements.append(Spacer(1, 10))
+    
+    # Seção de Reuniões
+    if report_type in ["reunioes", "todos"]:
+        # Agora usando a função de banco de dados
+        with phases.phase("query"):
+            if since and until:
+                meetings = await get_meetings_between(guild_id, since.isoformat(), until.isoformat())
+            else:
+                meetings = await get_all_meetings(guild_id)
+        if meetings:
+            elements.append(Paragraph("REUNIÕES", styles['Heading2']))
+            elements.append(Spacer(1, 10))
+            
+            with phases.phase("resolve"):
+                names = await member_names(
+                    bot, bot.get_guild(int(guild_id)),
+                    [user_id for meeting in meetings for user_id in meeting.participants if user_id.isdigit()]
+                )
+
+            meeting_data = [["ID", "Início", "Duração", "Participantes", "Tópicos"]]
+            for meeting in meetings:
+                check_in_formatted = meeting.check_in_time.strftime('%d/%m/%Y %H:%M')
+                
+                if meeting.check_out_time:
+                    duration = meeting.check_out_time - meeting.check_in_time
+                    hours, remainder = divmod(duration.total_seconds(), 3600)
+                    minutes, seconds = divmod(remainder, 60)
+                    duration_str = f"{int(hours)}h {int(minutes)}m"
+                else:
+                    duration_str = "Em andamento"
+                
+                participants_display = [
+                    (names.get(int(user_id)) if user_id.isdigit() else None) or f"ID: {user_id}"
+                    for user_id in meeting.participants
+                ]
+                
+                # Junta os nomes dos participantes em uma única string
+                participants_names_str = ", ".join(participants_display)
+                
+                topics_display = meeting.topics[:50] + "..." if len(meeting.topics) > 50 else meeting.topics
+                
+                meeting_data.append([str(meeting.id), check_in_formatted, duration_str, participants_names_str, topics_display])
+            
+            meeting_table = Table(meeting_data, colWidths=[0.5*inch, 1.2*inch, 1*inch, 1.2*inch, 2*inch])
+            meeting_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            elements.append(meeting_table)
+        else:
+            elements.append(Paragraph("Nenhuma reunião encontrada.", styles['Normal']))
+    
+    with phases.phase("render"):
+        doc.build(elements)
+    if own_phases:
+        phases.observe()
+    return filename
+
+
+class Reports(commands.Cog):
+    """
+    Relatórios em PDF, exportação de dados e a fila de trabalhos dos comandos de barra.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.warm_up = None
+
+    async def cog_load(self):
+        if not all(module in sys.modules for module in REPORTLAB_MODULES):
+            self.warm_up = asyncio.create_task(self.warm_up_reports(), name="warm_up_reports")
+
+    async def cog_unload(self):
+        if self.warm_up:
+            self.warm_up.cancel()
+
+    async def warm_up_reports(self):
+        """
+        Importa o ReportLab numa thread, depois que o bot já está atendendo,
+        para que o primeiro relatório não pague o custo do import.
+        """
+        await self.bot.wait_until_ready()
+        await asyncio.sleep(REPORT_WARMUP_DELAY)
+        for module in REPORTLAB_MODULES:
+            await asyncio.to_thread(importlib.import_module, module)
+
+    @commands.command(help="Gera um relatório em PDF com tarefas, pontos e reuniões, opcionalmente em um período. Ex: >gerar_relatorio ou >gerar_relatorio tarefas ou >gerar_relatorio ponto 01/01/2025 31/03/2025")
+    async def gerar_relatorio(self, ctx, report_type: str = "todos", data_inicio: str = None, data_fim: str = None):
+        """
+        Gera um relatório PDF com os dados do servidor
+        Opções: tarefas, ponto, reunioes, todos
+        Com data de início e fim (DD/MM/AAAA), pontos e reuniões do período são
+        buscados também no arquivo de registros antigos.
+        """
+        valid_types = ["tarefas", "ponto", "reunioes", "todos"]
+
+        if report_type.lower() not in valid_types:
+            await ctx.send("❌ Tipo de relatório inválido. Use: `tarefas`, `ponto`, `reunioes` ou `todos`")
+            return
+
+        try:
+            since, until = parse_period(data_inicio, data_fim)
+        except ValueError as e:
+            await ctx.send(f"❌ {e}")
+            return
+
+        try:
+            guild_id = str(ctx.guild.id)
+            await ctx.send("📊 Gerando relatório PDF...")
+
+            # Gerar o PDF
+            phases = PhaseTimer(REPORT_PHASE_LATENCY, report=report_type.lower())
+            filename = await generate_pdf_report(self.bot, guild_id, report_type.lower(), since, until, phases)
+
+            # Enviar o arquivo
+            with phases.phase("upload"), open(filename, 'rb') as f:
+                await ctx.send(file=discord.File(f, filename))
+            phases.observe()
+
+            # Limpar o arquivo temporário
+            os.remove(filename)
+            await ctx.send("✅ Relatório gerado com sucesso!")
+
+        except Exception as e:
+            await ctx.send(f"❌ Erro ao gerar relatório: {e}")
+            print(f"Erro ao gerar PDF: {e}")
+
+    @commands.command(help="Administrador exporta os dados brutos em CSV ou JSONL compactado, com filtros opcionais de período e usuário. Ex: >exportar ponto csv ou >exportar reunioes jsonl 01/01/2025 31/01/2025 @usuario")
+    @commands.has_permissions(administrator=True)
+    async def exportar(self, ctx, tabela: str, formato: str = "csv", *filtros: str):
+        """
+        Exporta tarefas, ponto ou reuniões do servidor para .csv.gz ou .jsonl.gz.
+        Filtros: até duas datas DD/MM/AAAA (início e fim) e um usuário.
+        Exemplo de uso: >exportar ponto csv 01/03/2025 31/03/2025 @usuario
+        """
+        tabela = tabela.lower()
+        formato = formato.lower()
+        if tabela not in ("tarefas", "ponto", "reunioes"):
+            await ctx.send("❌ Tabela inválida. Use: `tarefas`, `ponto` ou `reunioes`")
+            return
+        if formato not in EXPORT_FORMATS:
+            await ctx.send("❌ Formato inválido. Use: `csv` ou `jsonl`")
+            return
+
+        dates = [f for f in filtros if re.fullmatch(r"\d{2}/\d{2}/\d{4}", f)]
+        others = [f for f in filtros if f not in dates]
+        user = None
+        if others:
+            member = await resolve(ctx.guild, " ".join(others), kinds=(MEMBER,))
+            if member is None:
+                await ctx.send(f"❌ Usuário '{' '.join(others)}' não encontrado no servidor.")
+                return
+            user = member.display_name if tabela == "tarefas" else member.id
+
+        try:
+            since, until = parse_period(*dates[:2])
+        except ValueError as e:
+            await ctx.send(f"❌ {e}")
+            return
+
+        try:
+            await ctx.send("📤 Exportando dados...")
+            filename, count = await export_table(str(ctx.guild.id), tabela, formato, since, until, user)
+            try:
+                if os.path.getsize(filename) > ctx.guild.filesize_limit:
+                    await ctx.send("❌ O arquivo ficou maior que o limite de envio do servidor. Use um período menor ou a exportação por linha de comando (`python export.py`).")
+                    return
+                with open(filename, 'rb') as f:
+                    await ctx.send(f"✅ {count} linha(s) exportada(s).", file=discord.File(f, os.path.basename(filename)))
+            finally:
+                os.remove(filename)
+        except Exception as e:
+            await ctx.send(f"❌ Erro ao exportar os dados: {e}")
+
+    @commands.command(help="Mostra a fila de trabalhos demorados (relatórios e backups pedidos por comandos de barra) e o andamento dos deste servidor. Ex: >jobs")
+    async def jobs(self, ctx):
+        """
+        Mostra quantos trabalhos aguardam na fila e o estado dos trabalhos do servidor.
+        Exemplo de uso: >jobs
+        """
+        embed = discord.Embed(title="⏳ Trabalhos em segundo plano", color=discord.Color.blue())
+        embed.add_field(
+            name="Fila",
+            value=f"{job_queue.depth()} aguardando · {len(job_queue.in_flight)} em aberto · limite {job_queue.max_size}",
+            inline=False
+        )
+        guild_jobs = job_queue.jobs(str(ctx.guild.id))
+        for job in guild_jobs[:20]:
+            progress = f" · {job.progress}" if job.progress else ""
+            embed.add_field(
+                name=job.description,
+                value=f"{job.status}{progress} · {job.elapsed():.0f}s · {len(job.listeners)} pedido(s)",
+                inline=False
+            )
+        if not guild_jobs:
+            embed.add_field(name="Este servidor", value="Nenhum trabalho em andamento.", inline=False)
+        await ctx.send(embed=embed)
+
+    @app_commands.command(name="relatorio", description="Gera um relatório em PDF com tarefas, pontos e reuniões, opcionalmente em um período.")
+    @app_commands.describe(
+        tipo="tarefas, ponto, reunioes ou todos",
+        data_inicio="início do período (DD/MM/AAAA)",
+        data_fim="fim do período (DD/MM/AAAA)"
+    )
+    @app_commands.choices(tipo=[app_commands.Choice(name=name, value=name) for name in ("todos", "tarefas", "ponto", "reunioes")])
+    @app_commands.guild_only()
+    async def relatorio_slash(self, interaction: discord.Interaction, tipo: str = "todos", data_inicio: str = None, data_fim: str = None):
+        await interaction.response.defer(thinking=True)
+        try:
+            since, until = parse_period(data_inicio, data_fim)
+        except ValueError as e:
+            await interaction.followup.send(f"❌ {e}")
+            return
+
+        guild_id = str(interaction.guild_id)
+
+        async def run(job):
+            phases = PhaseTimer(REPORT_PHASE_LATENCY, report=tipo)
+            job.progress = "gerando PDF"
+            filename = await generate_pdf_report(self.bot, guild_id, tipo, since, until, phases)
+            phases.observe()
+            job.progress = "enviando"
+            return filename
+
+        await submit_job(
+            interaction, (guild_id, "relatorio", tipo, data_inicio, data_fim), f"Relatório {tipo}",
+            run, send_file_followup, remove_file
+        )
+
+async def setup(bot):
+    await bot.add_cog(Reports(bot))
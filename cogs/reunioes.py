@@ -0,0 +1,174 @@
+import datetime
+import discord
+from discord.ext import commands
+from database import (
+    BR_TZ, add_meeting_check_in, add_meeting_topic, delete_meeting_by_id, get_active_meeting_by_user,
+    get_all_meetings, get_meetings_by_user, update_meeting_check_out
+)
+from member_cache import get_members
+from member_index import IndexedMember
+
+class Meetings(commands.Cog):
+    """
+    Comandos de reuniões.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(help="Começa a contagem do tempo de reunião. Ex: >check_in_reuniao @Fulano @Ciclano @Beltrano")
+    async def check_in_reuniao(self, ctx, *members: IndexedMember):
+        """
+        Comando para iniciar uma reunião com outros membros.
+        Exemplo de uso: >check_in_reuniao @utilizador1 @utilizador2
+        """
+        guild_id = str(ctx.guild.id)
+        participants_list = list(members) + [ctx.author]
+        participants_list = list(set(participants_list))
+
+        participants_ids = ",".join([str(m.id) for m in participants_list])
+
+        active_meeting = await get_active_meeting_by_user(guild_id, str(ctx.author.id))
+
+        if active_meeting:
+            await ctx.send("❌ Você já está em uma reunião. Use `>check_out` para finalizar.")
+            return
+
+        try:
+            await add_meeting_check_in(guild_id, participants_ids)
+            participants_names = [m.display_name for m in participants_list]
+            await ctx.send(f"✅ Reunião iniciada com os participantes: **{', '.join(participants_names)}**. Use `>add_topico` para adicionar tópicos.")
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao iniciar a reunião: {e}")
+
+    @commands.command(help="Quem está na reunião pode adicionar tópicos que foram mencionados. Ex: >add_topico Planejamento")
+    async def add_topico(self, ctx, *, topics: str):
+        """
+        Adiciona tópicos à sua reunião ativa. Qualquer participante pode usar.
+        Exemplo de uso: >add_topico tópico 1, tópico 2, tópico 3
+        """
+        guild_id = str(ctx.guild.id)
+        user_id = str(ctx.author.id)
+        active_meeting = await get_active_meeting_by_user(guild_id, user_id)
+
+        if not active_meeting:
+            await ctx.send("❌ Você não está em uma reunião ativa. Use `>check_in_meet` para iniciar uma.")
+            return
+
+        meeting_id = active_meeting.id
+
+        try:
+            await add_meeting_topic(guild_id, meeting_id, topics, user_id)
+            await ctx.send(f"✅ Tópicos **`{topics}`** adicionados à reunião.")
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao adicionar os tópicos: {e}")
+
+    @commands.command(help="Comando para finalizar a reunião. Qualquer participante pode usar. Ex: >check_out_reuniao")
+    async def check_out_reuniao(self, ctx):
+        """
+        Comando para finalizar a reunião atual. Qualquer participante pode usar.
+        """
+        guild_id = str(ctx.guild.id)
+        user_id = str(ctx.author.id)
+        active_meeting_data = await get_active_meeting_by_user(guild_id, user_id)
+
+        if not active_meeting_data:
+            await ctx.send("❌ Você não está em uma reunião ativa. Use `>check_in` para iniciar uma.")
+            return
+
+        meeting_id = active_meeting_data.id
+        topics = active_meeting_data.topics
+        check_in_time = active_meeting_data.check_in_time
+        now = datetime.datetime.now(BR_TZ)
+        duration = now - check_in_time
+        hours, remainder = divmod(duration.total_seconds(), 3600)
+        minutes, seconds = divmod(remainder, 60)
+        duration_str = f"{int(hours)}h {int(minutes)}m {int(seconds)}s"
+
+        participants_mentions = [f"<@{uid}>" for uid in active_meeting_data.participants]
+
+        try:
+            await update_meeting_check_out(guild_id, meeting_id)
+
+            await ctx.send(
+                f"✅ **{ctx.author.display_name}** finalizou a reunião.\n"
+                f"**Início:** {check_in_time.strftime('%H:%M:%S')}\n"
+                f"**Duração:** {duration_str}\n"
+                f"**Participantes:** {', '.join(participants_mentions)}\n"
+                f"**Tópicos:** `{topics}`"
+            )
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao finalizar a reunião: {e}")
+
+    @commands.command(help="Comando para listar todas as reuniões ou por usuário. Ex: >list_reuniao ou >list_reuniao @usuario")
+    async def list_reuniao(self, ctx, member: IndexedMember = None):
+        """
+        Lista todas as reuniões ou as reuniões de um utilizador específico.
+        Exemplos de uso:
+        >list_reuniao        (lista todas as reuniões)
+        >list_reuniao @usuario  (lista as reuniões de um utilizador específico)
+        """
+        try:
+            guild_id = str(ctx.guild.id)
+            if member:
+                meetings = await get_meetings_by_user(guild_id, str(member.id))
+                if not meetings:
+                    await ctx.send(f"⚠️ Nenhuma reunião encontrada para o utilizador **{member.display_name}**.")
+                    return
+                title_text = f"Histórico de Reuniões de {member.display_name}"
+            else:
+                meetings = await get_all_meetings(guild_id)
+                if not meetings:
+                    await ctx.send("⚠️ Nenhuma reunião encontrada no histórico.")
+                    return
+                title_text = "Histórico de Reuniões"
+
+            embed = discord.Embed(title=title_text, color=discord.Color.blue())
+            members = await get_members(ctx.guild, [uid for meeting in meetings for uid in meeting.participants])
+            for meeting in meetings:
+                participants_names = []
+                for uid in meeting.participants:
+                    m = members.get(int(uid))
+                    participants_names.append(m.display_name if m else f"ID: {uid}")
+
+                check_in_time = meeting.check_in_time
+                duration_str = "Em andamento"
+                if meeting.check_out_time:
+                    duration = meeting.check_out_time - check_in_time
+                    hours, remainder = divmod(duration.total_seconds(), 3600)
+                    minutes, seconds = divmod(remainder, 60)
+                    duration_str = f"{int(hours)}h {int(minutes)}m {int(seconds)}s"
+
+                embed.add_field(
+                    name=f"Reunião #{meeting.id}",
+                    value=(
+                        f"**Início:** {check_in_time.strftime('%d/%m/%Y %H:%M:%S')}\n"
+                        f"**Duração:** {duration_str}\n"
+                        f"**Participantes:** {', '.join(participants_names)}\n"
+                        f"**Tópicos:** {meeting.topics or 'Nenhum'}"
+                    ),
+                    inline=False
+                )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao listar as reuniões: {e}")
+
+    @commands.has_permissions(administrator=True)
+    @commands.command(help="Administradores do servidor podem deletar uma reunião por id. Ex: >delete_reunião 15")
+    async def delete_reuniao(self, ctx, meeting_id: int):
+        """
+        Deleta uma reunião pelo seu ID. Apenas administradores podem usar.
+        Exemplo de uso: >delete_meeting 15
+        """
+        try:
+            guild_id = str(ctx.guild.id)
+            rows_deleted = await delete_meeting_by_id(guild_id, meeting_id)
+            if rows_deleted > 0:
+                await ctx.send(f"✅ Reunião com ID **{meeting_id}** deletada com sucesso.")
+            else:
+                await ctx.send(f"⚠️ Nenhuma reunião encontrada com o ID **{meeting_id}**.")
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao deletar a reunião: {e}")
+
+async def setup(bot):
+    await bot.add_cog(Meetings(bot))
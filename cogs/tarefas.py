@@ -0,0 +1,227 @@
+import datetime
+import re
+import discord
+from discord.ext import commands
+from database import (
+    BR_TZ, add_task, delete_task, get_tasks, get_tasks_filtered, set_board_message, update_task_status
+)
+from kanban import build_board
+from member_index import MEMBER, ROLE, assignee_name, resolve
+
+TIME_UNITS = {
+    'semana': 7 * 24 * 60 * 60,
+    'semanas': 7 * 24 * 60 * 60,
+    'mes': 30 * 24 * 60 * 60,
+    'meses': 30 * 24 * 60 * 60,
+    'dia': 24 * 60 * 60,
+    'dias': 24 * 60 * 60,
+    'hora': 60 * 60,
+    'horas': 60 * 60,
+    'minuto': 60,
+    'minutos': 60,
+}
+
+class Tasks(commands.Cog):
+    """
+    Comandos de tarefas e do quadro Kanban.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(help="Adiciona uma nova tarefa por cargo ou por usuário, define a data de término e o tempo de intervalo entre lembretes. Ex: >add_tarefa 'Exemplo' | usuario | @usuario | 15/10/2025 23:59 | 1 dia ou >add_tarefa 'Exemplo' | cargo | @cargo | 15/10/2025 23:59 | 1 dia") 
+    async def add_tarefa(self, ctx, *, args):
+        """
+        Adiciona uma nova tarefa.
+        TÍTULO | TIPO | @ | DATA DE TÉRMINO | INTERVALO DE LEMBRETES
+        """
+        try:
+            guild_id = str(ctx.guild.id)
+            things = [p.strip() for p in args.split("|")]
+
+            if len(things) < 5:
+                await ctx.send("⚠️ Formato inválido. Use:\n`>add_tarefa título | tipo | responsável | data fim | intervalo do lembrete`")
+                return
+
+            title, tp, destiny, due_date, reminder_interval = things
+
+            # Data de início é sempre o momento atual
+            start_dt = datetime.datetime.now(BR_TZ)
+            start_dt_str = start_dt.isoformat()
+
+            try:
+                due_dt = BR_TZ.localize(datetime.datetime.strptime(due_date, "%d/%m/%Y %H:%M"))
+                if due_dt <= start_dt:
+                    await ctx.send("❌ Data de término deve ser depois da data atual.")
+                    return
+            except ValueError:
+                await ctx.send("❌ Data de término inválida. Use DD/MM/AAAA HH:MM.")
+                return
+
+            frequency_in_seconds = None
+
+            match = re.search(r'(\d+)\s*(semanas?|meses?|dias?|horas?|minutos?)', reminder_interval, re.IGNORECASE)
+
+            if match:
+                number = int(match.group(1))
+                text_unit = match.group(2).lower()
+
+                if text_unit in TIME_UNITS:
+                    frequency_in_seconds = number * TIME_UNITS[text_unit]
+                else:
+                    await ctx.send("❌ Unidade de tempo inválida. Use 'semana(s)', 'mes(es)', 'dia(s)', 'hora(s) ou minuto(s)'.")
+                    return
+            else:
+                await ctx.send("❌ Formato de intervalo inválido. Use, por exemplo: `2 semanas`, `3 dias`, `1 mes`, `12 horas` ou `3 minutos`.")
+                return
+
+            if tp.lower() == "usuario":
+                destiny_member = await resolve(ctx.guild, destiny, kinds=(MEMBER,))
+                if destiny_member is None:
+                    await ctx.send(f"❌ Usuário '{destiny}' não encontrado no servidor.")
+                    return
+                name_destiny = assignee_name(destiny_member)
+            elif tp.lower() == "cargo":
+                destiny_role = await resolve(ctx.guild, destiny, kinds=(ROLE,))
+                if destiny_role is None:
+                    await ctx.send(f"❌ Cargo '{destiny}' não encontrado no servidor.")
+                    return
+                name_destiny = assignee_name(destiny_role)
+            else:
+                await ctx.send("❌ Você precisa colocar o tipo da atribuição. Use 'usuario' ou 'cargo'.")
+                return
+
+            due_dt_str = due_dt.isoformat()
+
+            await add_task(guild_id, title, name_destiny, str(frequency_in_seconds), start_dt_str, due_dt_str, "A Fazer")
+            self.bot.board_updater.schedule(guild_id)
+
+            await ctx.send(f"✅ Tarefa **'{title}'** criada com sucesso e atribuída a {name_destiny}.\n⏰ **Data de início:** {start_dt.strftime('%d/%m/%Y %H:%M')}\n⏰ **Data de término:** {due_dt.strftime('%d/%m/%Y %H:%M')}")
+
+        except Exception as e:
+            await ctx.send(f"❌ Erro ao criar a tarefa: {e}")
+
+    @commands.command(help="Listar todas as tarefas, ou por cargo, ou por usuário. Ex: >list_tarefas ou >list_tarefas @usuario ou >list_tarefas @cargo ")
+    async def list_tarefas(self, ctx: commands.Context, *, args=None):
+        """
+        Comando para listar todas as tarefas ou filtrar por usuário/cargo.
+        Exemplo de uso:
+        - >list_tarefas (Lista todas as tarefas)
+        - >list_tarefas @nome_do_cargo (Lista tarefas de um cargo)
+        - >list_tarefas nome_do_usuario (Lista tarefas de um usuário)
+        """
+        try:
+            guild_id = str(ctx.guild.id)
+            tasks_list = []
+            filter_name = None
+
+            if args:
+                # Tenta um cargo e, se não houver, um membro
+                destiny = await resolve(ctx.guild, args)
+                if destiny is None:
+                    await ctx.send(f"❌ Não foi possível encontrar um usuário ou cargo com o nome '{args}'.")
+                    return
+                filter_name = assignee_name(destiny)
+
+            if filter_name:
+                tasks_list = await get_tasks_filtered(guild_id, filter_name)
+                title = f"Tarefas para {filter_name}"
+            else:
+                tasks_list = await get_tasks(guild_id)
+                title = "Todas as Tarefas"
+
+            if not tasks_list:
+                await ctx.send(f"Não há tarefas para exibir.")
+                return
+
+            embed = discord.Embed(
+                title=title,
+                color=discord.Color.blue()
+            )
+
+            for task in tasks_list:
+                due_date_formatted = task.due_date.strftime('%d/%m/%Y %H:%M')
+
+                embed.add_field(
+                    name=f"📝 {task.title} (ID: {task.id})",
+                    value=f"**Responsável:** {task.assigned_to}\n**Vencimento:** {due_date_formatted}\n**Status:** {task.status}",
+                    inline=False
+                )
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            print(f"❌ Ocorreu um erro ao listar as tarefas: {e}")
+            await ctx.send(f"❌ Ocorreu um erro ao listar as tarefas: {e}")
+
+
+    @commands.command(help="Administrador cria (ou move para este canal) o quadro Kanban fixado, que se atualiza sozinho quando as tarefas mudam. Ex: >quadro")
+    @commands.has_permissions(administrator=True)
+    async def quadro(self, ctx):
+        """
+        Publica o quadro Kanban do servidor no canal atual e tenta fixá-lo.
+        As próximas alterações em tarefas editam essa mensagem, em vez de criar outra.
+        Exemplo de uso: >quadro
+        """
+        try:
+            guild_id = str(ctx.guild.id)
+            message = await ctx.send(embed=await build_board(guild_id))
+            await set_board_message(guild_id, ctx.channel.id, message.id)
+            try:
+                await message.pin()
+            except discord.HTTPException:
+                await ctx.send("⚠️ Não consegui fixar o quadro; fixe a mensagem manualmente ou dê ao bot a permissão de gerenciar mensagens.")
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao criar o quadro: {e}")
+
+    @commands.command(help="Atualiza o status da tarefa pelo id e pela atribuição. Ex: >update_status id @ A Fazer ou >update_status id @ Em Andamento ou >update_status id @ Conluída")
+    async def update_status(self, ctx, task_id: int, destiny: str, *, status: str):
+        """
+        Comando para atualizar o status de uma tarefa com base no ID e no responsável.
+        Status válidos: "A Fazer", "Em Andamento", "Concluída".
+        Exemplo de uso: >update_status 1 @Cargo Concluída
+        """
+        valid_statuses = ["A Fazer", "Em Andamento", "Concluída"]
+        guild_id = str(ctx.guild.id)
+
+        if status not in valid_statuses:
+            await ctx.send(f"❌ Status inválido. Use um dos seguintes: {', '.join(valid_statuses)}")
+            return
+
+        resolved = await resolve(ctx.guild, destiny)
+        if resolved is None:
+            await ctx.send(f"❌ Não foi possível encontrar um usuário ou cargo com o nome '{destiny}'.")
+            return
+        name_destiny = assignee_name(resolved)
+
+        if name_destiny:
+            try:
+                success = await update_task_status(guild_id, task_id, name_destiny, status)
+                if success:
+                    self.bot.board_updater.schedule(guild_id)
+                    await ctx.send(f"✅ O status da tarefa com ID **{task_id}** (atribuída a {name_destiny}) foi atualizado para **{status}**.")
+                else:
+                    await ctx.send(f"❌ Não foi possível encontrar a tarefa com ID **{task_id}** atribuída a {name_destiny}.")
+            except Exception as e:
+                await ctx.send(f"❌ Ocorreu um erro ao atualizar o status da tarefa: {e}")
+
+    @commands.command(help="Administrador do servidor deleta tarefa por id. Ex: >deleta_tarefa id")
+    @commands.has_permissions(administrator=True)
+    async def delete_tarefa(self, ctx, task_id: int):
+        """
+        Comando para excluir uma tarefa pelo ID. Apenas para administradores.
+        Exemplo de uso: >delete_tarefa 1
+        """
+        try:
+            guild_id = str(ctx.guild.id)
+            success = await delete_task(guild_id, task_id)
+            if success:
+                self.bot.board_updater.schedule(guild_id)
+                await ctx.send(f"✅ Tarefa com ID **{task_id}** excluída com sucesso.")
+            else:
+                await ctx.send(f"❌ Não foi possível encontrar a tarefa com ID **{task_id}**.")
+        except Exception as e:
+            await ctx.send(f"❌ Ocorreu um erro ao excluir a tarefa: {e}")
+
+async def setup(bot):
+    await bot.add_cog(Tasks(bot))
@@ -1,19 +1,314 @@
 import aiosqlite
+import collections
+import contextlib
 import datetime
+import functools
+import glob
+import json
+import os
+import time
+import zlib
 import pytz
+from metrics import DB_LATENCY, counter, instrument
 
-async def connect_db():
+QUERY_CACHE_REQUESTS = counter("ada_query_cache_total", "Leituras do banco atendidas pelo cache (hit) ou pelo banco (miss).")
+
+# Subconsulta que junta os tópicos de uma reunião (alias "m") na ordem em que foram adicionados.
+MEETING_TOPICS_SQL = (
+    "COALESCE((SELECT GROUP_CONCAT(text, ', ') FROM "
+    "(SELECT text FROM meeting_topics WHERE meeting_id = m.id ORDER BY id)), '')"
+)
+
+BR_TZ = pytz.timezone("America/Sao_Paulo")
+
+DB_PATH = 'ada.db'
+
+# Modo de armazenamento:
+# - "single": todos os servidores em DB_PATH
+# - "guild": um arquivo por servidor em SHARD_DIR
+# - "hash": SHARD_COUNT arquivos em SHARD_DIR, escolhidos pelo hash do guild_id
+STORAGE_MODE = os.getenv("ADA_STORAGE_MODE", "single")
+# Backend de armazenamento: "sqlite" (este módulo) ou "postgres" (database_pg, com ADA_DATABASE_URL).
+STORAGE_BACKEND = os.getenv("ADA_STORAGE_BACKEND", "sqlite")
+SHARD_DIR = os.getenv("ADA_SHARD_DIR", "shards")
+SHARD_COUNT = int(os.getenv("ADA_SHARD_COUNT", "8"))
+
+ARCHIVE_BATCH_SIZE = 500
+
+# Cache das leituras (ADA_QUERY_CACHE=0 desativa). O limite é o total de linhas guardadas.
+QUERY_CACHE_ENABLED = os.getenv("ADA_QUERY_CACHE", "1") != "0"
+QUERY_CACHE_MAX_ROWS = int(os.getenv("ADA_QUERY_CACHE_MAX_ROWS", "200000"))
+QUERY_CACHE_TTL = int(os.getenv("ADA_QUERY_CACHE_TTL", "300"))
+# Tabelas que outro processo também altera e que, por isso, não passam pelo cache:
+# no modo "worker" o reminder_worker.py escala tarefas e avança o start_date delas.
+UNCACHED_TABLES = ('tasks',) if os.getenv("ADA_REMINDER_MODE", "inline") == "worker" else ()
+
+# Colunas das tabelas que têm guild_id, na ordem do esquema criado por init_db_file.
+# Usadas para copiar os dados de um servidor entre arquivos (divisão, exportação e restauração).
+GUILD_TABLES = {
+    'tasks': "id, guild_id, title, assigned_to, reminder_interval, start_date, due_date, status",
+    'clockpoint': "id, guild_id, user_id, check_in, check_out",
+    'meetings': "id, guild_id, participants, topics, check_in_time, check_out_time",
+    'retention_policies': "guild_id, months",
+    'kanban_boards': "guild_id, channel_id, message_id",
+}
+MEETING_TOPICS_COLUMNS = "id, meeting_id, author_id, created_at, text"
+ARCHIVE_TABLES = {
+    'clockpoint_archive': "guild_id, month, row_count, payload",
+    'meetings_archive': "guild_id, month, row_count, payload",
+}
+
+def _decode_datetime(value):
+    """
+    Converte uma data ISO 8601 do banco para datetime no fuso de Brasília.
+    """
+    return datetime.datetime.fromisoformat(value).astimezone(BR_TZ) if value else None
+
+class Record:
+    """
+    Base dos registros retornados pelas consultas. Só as colunas selecionadas são
+    carregadas; acessar uma coluna que a consulta não trouxe levanta AttributeError.
+    As colunas em `decoders` são convertidas uma única vez, na leitura.
+    """
+    __slots__ = ()
+    decoders = {}
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            self._set(name, value)
+
+    def _set(self, name, value):
+        decoder = self.decoders.get(name)
+        setattr(self, name, decoder(value) if decoder and value is not None else value)
+
+    @classmethod
+    def from_row(cls, columns, row):
+        record = cls.__new__(cls)
+        for name, value in zip(columns, row):
+            record._set(name, value)
+        return record
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__ if hasattr(self, name))
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name, None) == getattr(other, name, None) for name in self.__slots__
+        )
+
+class Task(Record):
+    __slots__ = ('id', 'guild_id', 'title', 'assigned_to', 'reminder_interval', 'start_date', 'due_date', 'status')
+    decoders = {
+        'reminder_interval': int,
+        'start_date': _decode_datetime,
+        'due_date': _decode_datetime,
+    }
+
+class ClockEntry(Record):
+    __slots__ = ('id', 'guild_id', 'user_id', 'check_in', 'check_out')
+    decoders = {
+        'check_in': _decode_datetime,
+        'check_out': _decode_datetime,
+    }
+
+class Meeting(Record):
+    __slots__ = ('id', 'guild_id', 'participants', 'topics', 'check_in_time', 'check_out_time')
+    decoders = {
+        'participants': lambda value: value.split(',') if value else [],
+        'check_in_time': _decode_datetime,
+        'check_out_time': _decode_datetime,
+    }
+
+class OutboxEntry(Record):
+    __slots__ = ('id', 'guild_id', 'idempotency_key', 'channel_id', 'content', 'attempts')
+
+async def _fetchall_as(cursor, record_class):
+    """
+    Lê todas as linhas do cursor como registros do tipo informado.
+    """
+    columns = [column[0] for column in cursor.description]
+    return [record_class.from_row(columns, row) for row in await cursor.fetchall()]
+
+async def _fetchone_as(cursor, record_class):
+    """
+    Lê a próxima linha do cursor como registro do tipo informado, ou None.
+    """
+    row = await cursor.fetchone()
+    if row is None:
+        return None
+    return record_class.from_row([column[0] for column in cursor.description], row)
+
+# Arquivos cujo esquema já foi criado/atualizado neste processo.
+_initialized_paths = set()
+
+class QueryCache:
+    """
+    Cache em memória dos resultados das leituras, por (função, argumentos).
+    Cada resultado guarda a versão das tabelas do servidor lidas pela função;
+    as funções de escrita incrementam a versão, o que invalida as leituras antigas.
+    O tamanho é limitado pelo total de linhas guardadas, com descarte LRU.
+    As versões são deste processo: tabelas escritas também por outro processo ficam
+    em UNCACHED_TABLES e são sempre lidas do banco.
+    """
+
+    def __init__(self, max_rows=QUERY_CACHE_MAX_ROWS, ttl=QUERY_CACHE_TTL, enabled=QUERY_CACHE_ENABLED):
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.enabled = enabled
+        self.versions = {}
+        self.entries = collections.OrderedDict()
+        self.rows = 0
+
+    def version(self, guild_id, tables):
+        return tuple(self.versions.get((guild_id, table), 0) for table in tables)
+
+    def bump(self, guild_id, tables):
+        for table in tables:
+            key = (guild_id, table)
+            self.versions[key] = self.versions.get(key, 0) + 1
+
+    def get(self, key, version):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        entry_version, stored_at, size, result = entry
+        if entry_version != version or time.monotonic() - stored_at > self.ttl:
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, version, result):
+        if key in self.entries:
+            self._remove(key)
+        size = len(result) if isinstance(result, (list, tuple)) else 1
+        self.entries[key] = (version, time.monotonic(), size, result)
+        self.rows += size
+        while self.rows > self.max_rows and self.entries:
+            self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        self.rows -= self.entries.pop(key)[2]
+
+    def clear(self):
+        self.entries.clear()
+        self.rows = 0
+
+query_cache = QueryCache()
+
+def cached(*tables):
+    """
+    Decorador de leitura: devolve o resultado guardado enquanto nenhuma das tabelas
+    do servidor (primeiro argumento) tiver sido alterada por este processo.
+    Listas são devolvidas como cópias, para que quem chama possa alterá-las.
+    """
+    def decorator(func):
+        bypass = any(table in UNCACHED_TABLES for table in tables)
+
+        @functools.wraps(func)
+        async def wrapper(guild_id, *args, **kwargs):
+            if bypass or not query_cache.enabled:
+                return await func(guild_id, *args, **kwargs)
+            key = (func.__name__, str(guild_id), args, tuple(sorted(kwargs.items())))
+            # A versão é lida antes da consulta: uma escrita que termine durante a
+            # leitura deixa o resultado guardado já desatualizado, e não o contrário.
+            version = query_cache.version(str(guild_id), tables)
+            entry = query_cache.get(key, version)
+            if entry is not None:
+                QUERY_CACHE_REQUESTS.inc(function=func.__name__, result="hit")
+                result = entry[3]
+            else:
+                QUERY_CACHE_REQUESTS.inc(function=func.__name__, result="miss")
+                result = await func(guild_id, *args, **kwargs)
+                query_cache.put(key, version, result)
+            return list(result) if isinstance(result, list) else result
+        return wrapper
+    return decorator
+
+def invalidates(*tables):
+    """
+    Decorador de escrita: incrementa a versão das tabelas do servidor depois da escrita.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(guild_id, *args, **kwargs):
+            try:
+                return await func(guild_id, *args, **kwargs)
+            finally:
+                query_cache.bump(str(guild_id), tables)
+        return wrapper
+    return decorator
+
+def invalidate_guild(guild_id):
+    """
+    Invalida todas as leituras guardadas de um servidor, para escritas feitas fora
+    das funções deste módulo (como a restauração de backup).
+    """
+    query_cache.bump(str(guild_id), tuple(GUILD_TABLES) + ('meeting_topics',))
+
+def db_path(guild_id=None):
+    """
+    Retorna o arquivo SQLite onde ficam os dados do servidor, conforme o STORAGE_MODE.
+    """
+    if STORAGE_MODE == "guild" and guild_id is not None:
+        return os.path.join(SHARD_DIR, f"guild_{guild_id}.db")
+    if STORAGE_MODE == "hash" and guild_id is not None:
+        shard = zlib.crc32(str(guild_id).encode('utf-8')) % SHARD_COUNT
+        return os.path.join(SHARD_DIR, f"shard_{shard}.db")
+    return DB_PATH
+
+def archive_path(path):
+    """
+    Retorna o banco de arquivo associado a um arquivo de dados (ada.db -> ada_archive.db).
     """
-    Função assíncrona para conectar ao banco de dados.
+    return f"{os.path.splitext(path)[0]}_archive.db"
+
+def all_db_paths():
+    """
+    Retorna todos os arquivos de dados existentes no modo de armazenamento atual.
+    """
+    if STORAGE_MODE == "guild":
+        return sorted(
+            path for path in glob.glob(os.path.join(SHARD_DIR, "guild_*.db"))
+            if not path.endswith("_archive.db")
+        )
+    if STORAGE_MODE == "hash":
+        return [os.path.join(SHARD_DIR, f"shard_{shard}.db") for shard in range(SHARD_COUNT)]
+    return [DB_PATH]
+
+@contextlib.asynccontextmanager
+async def connect_db(guild_id=None):
     """
-    return await aiosqlite.connect('ada.db')
+    Abre uma conexão com o arquivo de dados do servidor, criando o esquema
+    na primeira vez que o arquivo é usado neste processo.
+    Uso: async with connect_db(guild_id) as conn: ...
+    """
+    path = db_path(guild_id)
+    if path not in _initialized_paths:
+        await init_db_file(path)
+    async with aiosqlite.connect(path) as conn:
+        yield conn
 
+@instrument(DB_LATENCY)
 async def init_db():
     """
     Função assíncrona para inicializar o banco de dados, criar as tabelas
-    e garantir que a estrutura esteja atualizada.
+    e garantir que a estrutura esteja atualizada em todos os arquivos de dados.
+    """
+    for path in all_db_paths():
+        await init_db_file(path)
+
+@instrument(DB_LATENCY)
+async def init_db_file(path):
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    Cria as tabelas e aplica as migrações em um arquivo de dados e no seu arquivo morto.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    async with aiosqlite.connect(path) as conn:
         cursor = await conn.cursor()
         
         await cursor.execute('''
@@ -49,14 +344,131 @@ async def init_db():
                 check_out_time TEXT
             )
         ''')
+
+        await cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meeting_topics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                meeting_id INTEGER NOT NULL,
+                author_id TEXT,
+                created_at TEXT,
+                text TEXT
+            )
+        ''')
+
+        await cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_meeting_topics_meeting_id ON meeting_topics (meeting_id)"
+        )
+
+        # Usado pela varredura de lembretes para achar tarefas que venceram ou que
+        # precisam de lembrete sem percorrer a tabela inteira.
+        await cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_status_due_date ON tasks (status, due_date)"
+        )
+
+        # Migra os tópicos antigos, guardados como texto concatenado em meetings.topics,
+        # para linhas de meeting_topics. Após a migração a coluna fica vazia.
+        await cursor.execute('''
+            INSERT INTO meeting_topics (meeting_id, author_id, created_at, text)
+            SELECT id, NULL, check_in_time, topics FROM meetings
+            WHERE topics IS NOT NULL AND topics != ''
+        ''')
+        await cursor.execute("UPDATE meetings SET topics = '' WHERE topics IS NOT NULL AND topics != ''")
+
+        await cursor.execute('''
+            CREATE TABLE IF NOT EXISTS retention_policies (
+                guild_id TEXT PRIMARY KEY,
+                months INTEGER NOT NULL
+            )
+        ''')
+
+        await cursor.execute('''
+            CREATE TABLE IF NOT EXISTS kanban_boards (
+                guild_id TEXT PRIMARY KEY,
+                channel_id TEXT NOT NULL,
+                message_id TEXT NOT NULL
+            )
+        ''')
+        await cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_guild_status_due_date ON tasks (guild_id, status, due_date)"
+        )
+
+        # Coordenação entre o processo do gateway e o processo de lembretes (usadas só em DB_PATH).
+        await cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scheduler_leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        await cursor.execute('''
+            CREATE TABLE IF NOT EXISTS reminder_directory (
+                guild_id TEXT PRIMARY KEY,
+                channel_id TEXT,
+                mentions TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        ''')
+
+        # Lembretes a enviar, gravados na mesma transação que avança a agenda das tarefas.
+        await cursor.execute('''
+            CREATE TABLE IF NOT EXISTS reminder_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id TEXT NOT NULL,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                channel_id TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                last_error TEXT
+            )
+        ''')
+        await cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reminder_outbox_status_next_attempt ON reminder_outbox (status, next_attempt_at)"
+        )
         
         await conn.commit()
 
+    await init_archive_db(archive_path(path))
+    _initialized_paths.add(path)
+
+@instrument(DB_LATENCY)
+async def init_archive_db(path):
+    """
+    Cria as tabelas do banco de arquivo. Cada linha guarda um lote de registros
+    de um mês, compactado com zlib, para manter o arquivo pequeno.
+    """
+    async with aiosqlite.connect(path) as conn:
+        await conn.execute('''
+            CREATE TABLE IF NOT EXISTS clockpoint_archive (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id TEXT NOT NULL,
+                month TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+        ''')
+        await conn.execute('''
+            CREATE TABLE IF NOT EXISTS meetings_archive (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id TEXT NOT NULL,
+                month TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+        ''')
+        await conn.execute("CREATE INDEX IF NOT EXISTS idx_clockpoint_archive_guild_month ON clockpoint_archive (guild_id, month)")
+        await conn.execute("CREATE INDEX IF NOT EXISTS idx_meetings_archive_guild_month ON meetings_archive (guild_id, month)")
+        await conn.commit()
+
+@invalidates('tasks')
+@instrument(DB_LATENCY)
 async def add_task(guild_id, title, assigned_to, reminder_interval, start_date, due_date, status="A Fazer"):
     """
     Adiciona uma nova tarefa ao banco de dados.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         await conn.execute(
             '''
             INSERT INTO tasks(
@@ -68,47 +480,41 @@ async def add_task(guild_id, title, assigned_to, reminder_interval, start_date,
         )
         await conn.commit()
 
+@cached('tasks')
+@instrument(DB_LATENCY)
 async def get_tasks_filtered(guild_id, assigned_to):
     """
     Busca tarefas filtrando pelo usuário ou cargo.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.execute(
             "SELECT id, guild_id, title, assigned_to, reminder_interval, start_date, due_date, status FROM tasks WHERE guild_id = ? AND assigned_to = ?",
             (guild_id, assigned_to)
         )
-        tasks = await cursor.fetchall()
-        return tasks
+        return await _fetchall_as(cursor, Task)
 
+@cached('tasks')
+@instrument(DB_LATENCY)
 async def get_tasks(guild_id):
     """
     Busca todas as tarefas do servidor específico.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.cursor()
         await cursor.execute(
             "SELECT id, guild_id, title, assigned_to, reminder_interval, start_date, due_date, status FROM tasks WHERE guild_id = ?",
             (guild_id,)
         )
-        return await cursor.fetchall()
-
-async def update_task_start_date(guild_id, task_id, new_start_date):
-    """
-    Atualiza a data de início de uma tarefa.
-    """
-    async with aiosqlite.connect('ada.db') as conn:
-        await conn.execute(
-            "UPDATE tasks SET start_date = ? WHERE id = ? AND guild_id = ?", 
-            (new_start_date, task_id, guild_id)
-        )
-        await conn.commit()
+        return await _fetchall_as(cursor, Task)
 
+@invalidates('tasks')
+@instrument(DB_LATENCY)
 async def update_task_status(guild_id, task_id, assigned_to, new_status):
     """
     Atualiza o status de uma tarefa com base no ID e no responsável.
     Retorna True se a atualização foi bem-sucedida, False caso contrário.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.execute(
             "UPDATE tasks SET status = ? WHERE id = ? AND assigned_to = ? AND guild_id = ?", 
             (new_status, task_id, assigned_to, guild_id)
@@ -116,23 +522,14 @@ async def update_task_status(guild_id, task_id, assigned_to, new_status):
         await conn.commit()
         return cursor.rowcount > 0
 
-async def update_task_overdue(guild_id, task_id, new_status, new_start_date):
-    """
-    Atualiza o status e a data de início de uma tarefa para gerenciar lembretes de atraso.
-    """
-    async with aiosqlite.connect('ada.db') as conn:
-        await conn.execute(
-            "UPDATE tasks SET status = ?, start_date = ? WHERE id = ? AND guild_id = ?",
-            (new_status, new_start_date, task_id, guild_id)
-        )
-        await conn.commit()
-
+@invalidates('tasks')
+@instrument(DB_LATENCY)
 async def delete_task(guild_id, task_id):
     """
     Exclui uma tarefa do banco de dados pelo ID.
     Retorna True se a exclusão foi bem-sucedida, False caso contrário.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.execute(
             "DELETE FROM tasks WHERE id = ? AND guild_id = ?", 
             (task_id, guild_id)
@@ -140,103 +537,118 @@ async def delete_task(guild_id, task_id):
         await conn.commit()
         return cursor.rowcount > 0
     
+@cached('clockpoint')
+@instrument(DB_LATENCY)
 async def is_user_checked_in(guild_id, user_id):
     """
     Verifica se o usuário tem um check-in ativo (sem check-out).
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.execute(
             "SELECT 1 FROM clockpoint WHERE guild_id = ? AND user_id = ? AND check_out IS NULL", 
             (guild_id, user_id)
         )
         return await cursor.fetchone() is not None
 
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
 async def add_check_in(guild_id, user_id, check_in_time):
     """
     Adiciona um novo registro de check-in.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         await conn.execute(
             "INSERT INTO clockpoint (guild_id, user_id, check_in) VALUES (?, ?, ?)", 
             (guild_id, user_id, check_in_time)
         )
         await conn.commit()
 
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
 async def add_check_out(guild_id, user_id, check_out_time):
     """
     Atualiza o último registro de check-in do usuário com o horário de check-out.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         await conn.execute(
             "UPDATE clockpoint SET check_out = ? WHERE guild_id = ? AND user_id = ? AND check_out IS NULL", 
             (check_out_time, guild_id, user_id)
         )
         await conn.commit()
 
+@cached('clockpoint')
+@instrument(DB_LATENCY)
 async def get_clockpoint_entries(guild_id):
     """
     Retorna todos os registros de ponto do servidor específico.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.cursor()
         await cursor.execute(
             "SELECT id, user_id, check_in, check_out FROM clockpoint WHERE guild_id = ?",
             (guild_id,)
         )
-        entries = await cursor.fetchall()
-        return entries
+        return await _fetchall_as(cursor, ClockEntry)
 
+@cached('clockpoint')
+@instrument(DB_LATENCY)
 async def get_clockpoint_entries_by_user(guild_id, user_id):
     """
     Retorna os registros de ponto de um usuário específico no servidor.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.execute(
             "SELECT id, user_id, check_in, check_out FROM clockpoint WHERE guild_id = ? AND user_id = ?", 
             (guild_id, user_id)
         )
-        entries = await cursor.fetchall()
-        return entries
+        return await _fetchall_as(cursor, ClockEntry)
     
+@cached('clockpoint')
+@instrument(DB_LATENCY)
 async def get_clockpoint_entry_by_id(guild_id, entry_id):
     """
     Retorna um registro de ponto específico pelo seu ID.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.execute(
             "SELECT id, user_id, check_in, check_out FROM clockpoint WHERE id = ? AND guild_id = ?", 
             (entry_id, guild_id)
         )
-        entry = await cursor.fetchone()
-        return entry
+        return await _fetchone_as(cursor, ClockEntry)
 
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
 async def update_check_in_time(guild_id, entry_id, new_check_in_time):
     """
     Atualiza o horário de check-in de um registro de ponto.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         await conn.execute(
             "UPDATE clockpoint SET check_in = ? WHERE id = ? AND guild_id = ?", 
             (new_check_in_time, entry_id, guild_id)
         )
         await conn.commit()
         
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
 async def update_check_out_time(guild_id, entry_id, new_check_out_time):
     """
     Atualiza o horário de check-out de um registro de ponto.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         await conn.execute(
             "UPDATE clockpoint SET check_out = ? WHERE id = ? AND guild_id = ?", 
             (new_check_out_time, entry_id, guild_id)
         )
         await conn.commit()
 
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
 async def delete_clockpoint_by_id(guild_id, point_id):
     """
     Deleta um ponto de relógio pelo seu ID.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.cursor()
         await cursor.execute(
             "DELETE FROM clockpoint WHERE id = ? AND guild_id = ?", 
@@ -245,11 +657,13 @@ async def delete_clockpoint_by_id(guild_id, point_id):
         await conn.commit()
         return cursor.rowcount
 
+@invalidates('meetings')
+@instrument(DB_LATENCY)
 async def add_meeting_check_in(guild_id, participants):
     """
     Registra o início de uma reunião para múltiplos participantes.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         check_in_time = datetime.datetime.now(pytz.timezone("America/Sao_Paulo")).isoformat()
         await conn.execute(
             "INSERT INTO meetings (guild_id, participants, topics, check_in_time) VALUES (?, ?, ?, ?)",
@@ -257,45 +671,42 @@ async def add_meeting_check_in(guild_id, participants):
         )
         await conn.commit()
         
-async def add_meeting_topic(guild_id, meeting_id, new_topics):
+@invalidates('meetings')
+@instrument(DB_LATENCY)
+async def add_meeting_topic(guild_id, meeting_id, new_topics, author_id=None):
     """
-    Adiciona novos tópicos à reunião existente.
+    Adiciona um novo tópico à reunião existente, registrando o autor e o horário.
+    Retorna True se a reunião existe no servidor e o tópico foi adicionado.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
+        created_at = datetime.datetime.now(pytz.timezone("America/Sao_Paulo")).isoformat()
         cursor = await conn.execute(
-            "SELECT topics FROM meetings WHERE id = ? AND guild_id = ?", 
-            (meeting_id, guild_id)
-        )
-        existing_topics_tuple = await cursor.fetchone()
-        existing_topics = existing_topics_tuple[0] if existing_topics_tuple else ""
-
-        if existing_topics:
-            updated_topics = f"{existing_topics}, {new_topics}"
-        else:
-            updated_topics = new_topics
-        
-        await conn.execute(
-            "UPDATE meetings SET topics = ? WHERE id = ? AND guild_id = ?",
-            (updated_topics, meeting_id, guild_id)
+            "INSERT INTO meeting_topics (meeting_id, author_id, created_at, text) SELECT id, ?, ?, ? FROM meetings WHERE id = ? AND guild_id = ?",
+            (author_id, created_at, new_topics, meeting_id, guild_id)
         )
         await conn.commit()
+        return cursor.rowcount > 0
 
+@cached('meetings')
+@instrument(DB_LATENCY)
 async def get_active_meeting_by_user(guild_id, user_id):
     """
     Busca a reunião ativa (sem check_out_time) em que um utilizador é participante.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.execute(
-            "SELECT id, participants, topics, check_in_time FROM meetings WHERE guild_id = ? AND participants LIKE ? AND check_out_time IS NULL",
+            f"SELECT m.id, m.participants, {MEETING_TOPICS_SQL} AS topics, m.check_in_time FROM meetings m WHERE m.guild_id = ? AND m.participants LIKE ? AND m.check_out_time IS NULL",
             (guild_id, f"%{user_id}%")
         )
-        return await cursor.fetchone()
+        return await _fetchone_as(cursor, Meeting)
 
+@invalidates('meetings')
+@instrument(DB_LATENCY)
 async def update_meeting_check_out(guild_id, meeting_id):
     """
     Registra o fim de uma reunião.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         check_out_time = datetime.datetime.now(pytz.timezone("America/Sao_Paulo")).isoformat()
         await conn.execute(
             "UPDATE meetings SET check_out_time = ? WHERE id = ? AND guild_id = ?",
@@ -303,40 +714,685 @@ async def update_meeting_check_out(guild_id, meeting_id):
         )
         await conn.commit()
 
+@cached('meetings')
+@instrument(DB_LATENCY)
 async def get_all_meetings(guild_id):
     """
     Busca todas as reuniões do servidor específico.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.cursor()
         await cursor.execute(
-            "SELECT id, participants, topics, check_in_time, check_out_time FROM meetings WHERE guild_id = ? ORDER BY check_in_time DESC",
+            f"SELECT m.id, m.participants, {MEETING_TOPICS_SQL} AS topics, m.check_in_time, m.check_out_time FROM meetings m WHERE m.guild_id = ? ORDER BY m.check_in_time DESC",
             (guild_id,)
         )
-        return await cursor.fetchall()
+        return await _fetchall_as(cursor, Meeting)
 
+@cached('meetings')
+@instrument(DB_LATENCY)
 async def get_meetings_by_user(guild_id, user_id):
     """
     Busca todas as reuniões em que um utilizador específico participou no servidor.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.cursor()
         await cursor.execute(
-            "SELECT id, participants, topics, check_in_time, check_out_time FROM meetings WHERE guild_id = ? AND participants LIKE ? ORDER BY check_in_time DESC",
+            f"SELECT m.id, m.participants, {MEETING_TOPICS_SQL} AS topics, m.check_in_time, m.check_out_time FROM meetings m WHERE m.guild_id = ? AND m.participants LIKE ? ORDER BY m.check_in_time DESC",
             (guild_id, f"%{user_id}%")
         )
-        return await cursor.fetchall()
+        return await _fetchall_as(cursor, Meeting)
     
+@invalidates('meetings')
+@instrument(DB_LATENCY)
 async def delete_meeting_by_id(guild_id, meeting_id):
     """
     Deleta uma reunião pelo ID.
     """
-    async with aiosqlite.connect('ada.db') as conn:
+    async with connect_db(guild_id) as conn:
         cursor = await conn.cursor()
         await cursor.execute(
             "DELETE FROM meetings WHERE id = ? AND guild_id = ?", 
             (meeting_id, guild_id)
         )
+        if cursor.rowcount > 0:
+            await conn.execute("DELETE FROM meeting_topics WHERE meeting_id = ?", (meeting_id,))
         await conn.commit()
         return cursor.rowcount
     
+
+def _pack_rows(rows):
+    """
+    Compacta uma lista de registros para guardar no arquivo.
+    """
+    return zlib.compress(json.dumps(rows, separators=(',', ':')).encode('utf-8'))
+
+def _unpack_rows(payload):
+    """
+    Descompacta um lote de registros do arquivo.
+    """
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+def _group_by_month(rows, date_index):
+    """
+    Agrupa registros pelo mês (AAAA-MM) da data na posição indicada.
+    """
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(row[date_index][:7], []).append(row)
+    return by_month
+
+@invalidates('retention_policies')
+@instrument(DB_LATENCY)
+async def set_retention_policy(guild_id, months):
+    """
+    Define por quantos meses os registros fechados ficam no banco principal.
+    Com months = None a política do servidor é removida.
+    """
+    async with connect_db(guild_id) as conn:
+        if months is None:
+            await conn.execute("DELETE FROM retention_policies WHERE guild_id = ?", (guild_id,))
+        else:
+            await conn.execute(
+                "INSERT OR REPLACE INTO retention_policies (guild_id, months) VALUES (?, ?)",
+                (guild_id, months)
+            )
+        await conn.commit()
+
+@cached('retention_policies')
+@instrument(DB_LATENCY)
+async def get_retention_policy(guild_id):
+    """
+    Retorna o número de meses de retenção do servidor, ou None se não houver política.
+    """
+    async with connect_db(guild_id) as conn:
+        cursor = await conn.execute(
+            "SELECT months FROM retention_policies WHERE guild_id = ?",
+            (guild_id,)
+        )
+        row = await cursor.fetchone()
+        return row[0] if row else None
+
+@instrument(DB_LATENCY)
+async def get_retention_policies():
+    """
+    Retorna todas as políticas de retenção como (guild_id, months), de todos os arquivos de dados.
+    """
+    policies = []
+    for path in all_db_paths():
+        async with aiosqlite.connect(path) as conn:
+            cursor = await conn.execute("SELECT guild_id, months FROM retention_policies")
+            policies.extend(await cursor.fetchall())
+    return policies
+
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
+async def archive_clockpoint_batch(guild_id, cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move até batch_size registros de ponto fechados, com check-out anterior a cutoff,
+    para o banco de arquivo. Retorna quantos registros foram movidos.
+    """
+    async with connect_db(guild_id) as conn:
+        await conn.execute("ATTACH DATABASE ? AS archive", (archive_path(db_path(guild_id)),))
+        cursor = await conn.execute(
+            "SELECT id, user_id, check_in, check_out FROM clockpoint WHERE guild_id = ? AND check_out IS NOT NULL AND check_out < ? ORDER BY id LIMIT ?",
+            (guild_id, cutoff, batch_size)
+        )
+        rows = await cursor.fetchall()
+        if not rows:
+            return 0
+
+        await conn.executemany(
+            "INSERT INTO archive.clockpoint_archive (guild_id, month, row_count, payload) VALUES (?, ?, ?, ?)",
+            [(guild_id, month, len(month_rows), _pack_rows(month_rows)) for month, month_rows in _group_by_month(rows, 2).items()]
+        )
+        await conn.executemany("DELETE FROM clockpoint WHERE id = ?", [(row[0],) for row in rows])
+        await conn.commit()
+        return len(rows)
+
+@invalidates('meetings')
+@instrument(DB_LATENCY)
+async def archive_meetings_batch(guild_id, cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move até batch_size reuniões finalizadas antes de cutoff, junto com seus tópicos,
+    para o banco de arquivo. Retorna quantas reuniões foram movidas.
+    """
+    async with connect_db(guild_id) as conn:
+        await conn.execute("ATTACH DATABASE ? AS archive", (archive_path(db_path(guild_id)),))
+        cursor = await conn.execute(
+            "SELECT id, participants, check_in_time, check_out_time FROM meetings WHERE guild_id = ? AND check_out_time IS NOT NULL AND check_out_time < ? ORDER BY id LIMIT ?",
+            (guild_id, cutoff, batch_size)
+        )
+        meetings = await cursor.fetchall()
+        if not meetings:
+            return 0
+
+        meeting_ids = [meeting[0] for meeting in meetings]
+        placeholders = ",".join("?" * len(meeting_ids))
+        cursor = await conn.execute(
+            f"SELECT meeting_id, author_id, created_at, text FROM meeting_topics WHERE meeting_id IN ({placeholders}) ORDER BY id",
+            meeting_ids
+        )
+        topics_by_meeting = {}
+        for meeting_id, author_id, created_at, text in await cursor.fetchall():
+            topics_by_meeting.setdefault(meeting_id, []).append([author_id, created_at, text])
+
+        rows = [list(meeting) + [topics_by_meeting.get(meeting[0], [])] for meeting in meetings]
+        await conn.executemany(
+            "INSERT INTO archive.meetings_archive (guild_id, month, row_count, payload) VALUES (?, ?, ?, ?)",
+            [(guild_id, month, len(month_rows), _pack_rows(month_rows)) for month, month_rows in _group_by_month(rows, 2).items()]
+        )
+        await conn.execute(f"DELETE FROM meeting_topics WHERE meeting_id IN ({placeholders})", meeting_ids)
+        await conn.execute(f"DELETE FROM meetings WHERE id IN ({placeholders})", meeting_ids)
+        await conn.commit()
+        return len(meetings)
+
+@instrument(DB_LATENCY)
+async def compact_db(guild_id):
+    """
+    Devolve ao sistema de arquivos as páginas liberadas pelo arquivamento no banco principal
+    do servidor. Na primeira vez o arquivo passa para auto_vacuum incremental (com um VACUUM
+    completo); depois, só as páginas livres são removidas com incremental_vacuum.
+    """
+    async with connect_db(guild_id) as conn:
+        cursor = await conn.execute("PRAGMA freelist_count")
+        (free_pages,) = await cursor.fetchone()
+        if not free_pages:
+            return
+        cursor = await conn.execute("PRAGMA auto_vacuum")
+        (auto_vacuum,) = await cursor.fetchone()
+        if auto_vacuum != 2:
+            await conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            await conn.execute("VACUUM")
+        else:
+            # O pragma libera uma página por passo; executescript roda a instrução até o fim.
+            await conn.executescript("PRAGMA incremental_vacuum;")
+
+async def _get_archived_rows(table, guild_id, since, until):
+    """
+    Descompacta os lotes arquivados do servidor cujo mês está no período [since, until).
+    """
+    path = archive_path(db_path(guild_id))
+    if not os.path.exists(path):
+        return []
+    async with aiosqlite.connect(path) as conn:
+        cursor = await conn.execute(
+            f"SELECT payload FROM {table} WHERE guild_id = ? AND month >= ? AND month <= ?",
+            (guild_id, since[:7], until[:7])
+        )
+        rows = []
+        for (payload,) in await cursor.fetchall():
+            rows.extend(row for row in _unpack_rows(payload) if since <= row[2] < until)
+        return rows
+
+@cached('clockpoint')
+@instrument(DB_LATENCY)
+async def get_clockpoint_entries_between(guild_id, since, until):
+    """
+    Retorna os registros de ponto com check-in no período [since, until), em ISO 8601.
+    Registros já arquivados no período são incluídos de forma transparente.
+    """
+    async with connect_db(guild_id) as conn:
+        cursor = await conn.execute(
+            "SELECT id, user_id, check_in, check_out FROM clockpoint WHERE guild_id = ? AND check_in >= ? AND check_in < ?",
+            (guild_id, since, until)
+        )
+        entries = await _fetchall_as(cursor, ClockEntry)
+
+    for entry_id, user_id, check_in, check_out in await _get_archived_rows('clockpoint_archive', guild_id, since, until):
+        entries.append(ClockEntry(id=entry_id, user_id=user_id, check_in=check_in, check_out=check_out))
+    entries.sort(key=lambda entry: entry.check_in)
+    return entries
+
+@cached('meetings')
+@instrument(DB_LATENCY)
+async def get_meetings_between(guild_id, since, until):
+    """
+    Busca as reuniões iniciadas no período [since, until), em ISO 8601, incluindo as arquivadas.
+    Retorna registros Meeting, como get_all_meetings.
+    """
+    async with connect_db(guild_id) as conn:
+        cursor = await conn.execute(
+            f"SELECT m.id, m.participants, {MEETING_TOPICS_SQL} AS topics, m.check_in_time, m.check_out_time FROM meetings m WHERE m.guild_id = ? AND m.check_in_time >= ? AND m.check_in_time < ?",
+            (guild_id, since, until)
+        )
+        meetings = await _fetchall_as(cursor, Meeting)
+
+    for meeting_id, participants, check_in_time, check_out_time, topics in await _get_archived_rows('meetings_archive', guild_id, since, until):
+        meetings.append(Meeting(
+            id=meeting_id, participants=participants, topics=", ".join(topic[2] for topic in topics),
+            check_in_time=check_in_time, check_out_time=check_out_time
+        ))
+    meetings.sort(key=lambda meeting: meeting.check_in_time, reverse=True)
+    return meetings
+
+# Estados da tarefa na varredura de lembretes: "A Fazer" e "Em Andamento" passam a
+# "Atrasada" quando vencem; "Em Andamento" é lembrada a cada reminder_interval e
+# "Atrasada" a cada overdue_interval. As datas são gravadas em ISO 8601 no fuso de
+# Brasília, então comparar o texto de due_date com o de `now` usa o índice.
+OPEN_STATUSES = ("A Fazer", "Em Andamento")
+OVERDUE_STATUS = "Atrasada"
+
+def _guilds_by_existing_path(guild_ids):
+    """
+    Agrupa os servidores por arquivo de dados, para as leituras em lote da varredura.
+    Arquivos que ainda não existem ficam de fora em vez de serem criados: no modo "guild",
+    um servidor que nunca gravou nada não tem o que varrer.
+    """
+    guilds_by_path = {}
+    for guild_id in guild_ids:
+        path = db_path(guild_id)
+        if path in _initialized_paths or os.path.exists(path):
+            guilds_by_path.setdefault(path, []).append(str(guild_id))
+    return guilds_by_path
+
+async def _iter_tasks_where(guild_ids, where, params, chunk_size=500):
+    """
+    Gera (guild_id, tarefas) das tarefas que satisfazem `where`, com uma consulta
+    por lote de servidores em cada arquivo de dados.
+    """
+    guilds_by_path = _guilds_by_existing_path(guild_ids)
+
+    for path, path_guild_ids in guilds_by_path.items():
+        async with connect_db(path_guild_ids[0]) as conn:
+            for start in range(0, len(path_guild_ids), chunk_size):
+                chunk = path_guild_ids[start:start + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = await conn.execute(
+                    f"SELECT id, guild_id, title, assigned_to, reminder_interval, start_date, due_date, status FROM tasks WHERE ({where}) AND guild_id IN ({placeholders}) ORDER BY guild_id",
+                    (*params, *chunk)
+                )
+                tasks_by_guild = {}
+                for task in await _fetchall_as(cursor, Task):
+                    tasks_by_guild.setdefault(task.guild_id, []).append(task)
+                for guild_id, tasks in tasks_by_guild.items():
+                    yield guild_id, tasks
+
+def iter_tasks_to_escalate(guild_ids, now):
+    """
+    Gera (guild_id, tarefas) das tarefas abertas cujo vencimento já passou (now em ISO 8601).
+    """
+    placeholders = ",".join("?" * len(OPEN_STATUSES))
+    return _iter_tasks_where(guild_ids, f"status IN ({placeholders}) AND due_date < ?", (*OPEN_STATUSES, now))
+
+def iter_tasks_due_for_reminder(guild_ids, now, overdue_interval):
+    """
+    Gera (guild_id, tarefas) das tarefas "Em Andamento" cujo intervalo de lembrete já passou
+    e das "Atrasada" sem lembrete há overdue_interval segundos.
+    """
+    return _iter_tasks_where(
+        guild_ids,
+        "(status = 'Em Andamento' AND julianday(start_date) + CAST(reminder_interval AS REAL) / 86400 <= julianday(?))"
+        " OR (status = ? AND julianday(start_date) + ? / 86400.0 <= julianday(?))",
+        (now, OVERDUE_STATUS, overdue_interval, now)
+    )
+
+@instrument(DB_LATENCY)
+async def get_active_assignees(guild_ids):
+    """
+    Retorna {guild_id: {responsáveis}} das tarefas não concluídas dos servidores informados,
+    ou seja, os nomes que podem receber lembretes.
+    """
+    guilds_by_path = _guilds_by_existing_path(guild_ids)
+    statuses = (*OPEN_STATUSES, OVERDUE_STATUS)
+
+    assignees = {}
+    for path, path_guild_ids in guilds_by_path.items():
+        async with connect_db(path_guild_ids[0]) as conn:
+            for start in range(0, len(path_guild_ids), 500):
+                chunk = path_guild_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = await conn.execute(
+                    f"SELECT DISTINCT guild_id, assigned_to FROM tasks WHERE status IN ({','.join('?' * len(statuses))}) AND guild_id IN ({placeholders})",
+                    (*statuses, *chunk)
+                )
+                for guild_id, assigned_to in await cursor.fetchall():
+                    assignees.setdefault(guild_id, set()).add(assigned_to)
+    return assignees
+
+@instrument(DB_LATENCY)
+async def acquire_lease(name, holder, ttl):
+    """
+    Tenta obter (ou renovar) a liderança `name` por `ttl` segundos.
+    Só um processo detém a liderança por vez; ela passa para outro quando expira
+    sem ser renovada. Retorna True se `holder` é o líder.
+    """
+    now = time.time()
+    async with connect_db() as conn:
+        await conn.execute(
+            '''
+            INSERT INTO scheduler_leases (name, holder, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+            WHERE scheduler_leases.holder = excluded.holder OR scheduler_leases.expires_at < ?
+            ''',
+            (name, holder, now + ttl, now)
+        )
+        await conn.commit()
+        cursor = await conn.execute("SELECT holder FROM scheduler_leases WHERE name = ?", (name,))
+        row = await cursor.fetchone()
+        return row is not None and row[0] == holder
+
+@instrument(DB_LATENCY)
+async def release_lease(name, holder):
+    """
+    Libera a liderança, se `holder` for o líder atual, para que outro processo assuma sem esperar expirar.
+    """
+    async with connect_db() as conn:
+        await conn.execute("DELETE FROM scheduler_leases WHERE name = ? AND holder = ?", (name, holder))
+        await conn.commit()
+
+@instrument(DB_LATENCY)
+async def publish_reminder_directory(entries):
+    """
+    Publica, para o processo de lembretes, o canal e as menções de cada servidor.
+    `entries` é uma lista de (guild_id, channel_id, {responsável: menção}).
+    """
+    now = datetime.datetime.now(BR_TZ).isoformat()
+    async with connect_db() as conn:
+        await conn.executemany(
+            "INSERT OR REPLACE INTO reminder_directory (guild_id, channel_id, mentions, updated_at) VALUES (?, ?, ?, ?)",
+            [
+                (str(guild_id), str(channel_id) if channel_id else None, json.dumps(mentions, ensure_ascii=False), now)
+                for guild_id, channel_id, mentions in entries
+            ]
+        )
+        await conn.commit()
+
+@instrument(DB_LATENCY)
+async def get_reminder_directory():
+    """
+    Retorna {guild_id: (channel_id, {responsável: menção})} publicado pelo processo do gateway.
+    """
+    async with connect_db() as conn:
+        cursor = await conn.execute("SELECT guild_id, channel_id, mentions FROM reminder_directory")
+        return {
+            guild_id: (channel_id, json.loads(mentions))
+            for guild_id, channel_id, mentions in await cursor.fetchall()
+        }
+
+# Estados de um lembrete na caixa de saída: "pending" aguarda envio (ou nova tentativa);
+# "failed" esgotou as tentativas e fica guardado para inspeção.
+OUTBOX_PENDING = "pending"
+OUTBOX_FAILED = "failed"
+
+@invalidates('tasks')
+@instrument(DB_LATENCY)
+async def enqueue_reminders(guild_id, reminders, task_ids, now_iso, new_status=None):
+    """
+    Numa única transação, grava os lembretes na caixa de saída e avança a agenda das
+    tarefas: start_date = now_iso e, com new_status, o novo status. `reminders` é uma lista
+    de (chave de idempotência, channel_id, conteúdo); uma chave já gravada é ignorada,
+    então repetir a varredura do mesmo intervalo não duplica o lembrete.
+    """
+    async with connect_db(guild_id) as conn:
+        await conn.executemany(
+            "INSERT OR IGNORE INTO reminder_outbox (guild_id, idempotency_key, channel_id, content, created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [(guild_id, key, str(channel_id), content, now_iso, 0) for key, channel_id, content in reminders]
+        )
+        if task_ids:
+            placeholders = ",".join("?" * len(task_ids))
+            if new_status is None:
+                await conn.execute(
+                    f"UPDATE tasks SET start_date = ? WHERE guild_id = ? AND id IN ({placeholders})",
+                    (now_iso, guild_id, *task_ids)
+                )
+            else:
+                await conn.execute(
+                    f"UPDATE tasks SET status = ?, start_date = ? WHERE guild_id = ? AND id IN ({placeholders})",
+                    (new_status, now_iso, guild_id, *task_ids)
+                )
+        await conn.commit()
+
+@instrument(DB_LATENCY)
+async def claim_reminders(guild_ids, limit, claim_timeout):
+    """
+    Reserva até `limit` lembretes pendentes dos servidores informados, adiando a próxima
+    tentativa por claim_timeout segundos: se o processo cair antes de confirmar o envio,
+    eles voltam a ficar disponíveis depois desse prazo. Retorna registros OutboxEntry.
+    """
+    guilds_by_path = _guilds_by_existing_path(guild_ids)
+
+    now = time.time()
+    entries = []
+    for path, path_guild_ids in guilds_by_path.items():
+        async with connect_db(path_guild_ids[0]) as conn:
+            for start in range(0, len(path_guild_ids), 500):
+                if len(entries) >= limit:
+                    break
+                chunk = path_guild_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                # Seleção e reserva num único UPDATE: dois processos varrendo o mesmo arquivo
+                # não conseguem reservar as mesmas linhas entre um SELECT e o UPDATE seguinte.
+                cursor = await conn.execute(
+                    f'''
+                    UPDATE reminder_outbox SET next_attempt_at = ? WHERE id IN (
+                        SELECT id FROM reminder_outbox WHERE status = ? AND next_attempt_at <= ? AND guild_id IN ({placeholders}) ORDER BY id LIMIT ?
+                    )
+                    RETURNING id, guild_id, idempotency_key, channel_id, content, attempts
+                    ''',
+                    (now + claim_timeout, OUTBOX_PENDING, now, *chunk, limit - len(entries))
+                )
+                claimed = await _fetchall_as(cursor, OutboxEntry)
+                entries.extend(sorted(claimed, key=lambda entry: entry.id))
+            await conn.commit()
+        if len(entries) >= limit:
+            break
+    return entries
+
+@instrument(DB_LATENCY)
+async def ack_reminders(entries):
+    """
+    Confirma o envio de lembretes reservados por claim_reminders, removendo-os da caixa de saída
+    com um commit por arquivo de dados.
+    """
+    entries_by_path = {}
+    for entry in entries:
+        entries_by_path.setdefault(db_path(entry.guild_id), []).append(entry)
+    for path_entries in entries_by_path.values():
+        async with connect_db(path_entries[0].guild_id) as conn:
+            await conn.execute(
+                f"DELETE FROM reminder_outbox WHERE id IN ({','.join('?' * len(path_entries))})",
+                [entry.id for entry in path_entries]
+            )
+            await conn.commit()
+
+@instrument(DB_LATENCY)
+async def retry_reminders(failures, max_attempts, backoff):
+    """
+    Registra envios que falharam: `failures` é uma lista de (OutboxEntry, erro). A próxima
+    tentativa espera backoff * 2^tentativas segundos; ao chegar a max_attempts o lembrete
+    passa a "failed" e não é mais tentado.
+    """
+    now = time.time()
+    rows_by_path = {}
+    for entry, error in failures:
+        attempts = entry.attempts + 1
+        guild_id, rows = rows_by_path.setdefault(db_path(entry.guild_id), (entry.guild_id, []))
+        rows.append((
+            attempts, now + backoff * 2 ** entry.attempts,
+            OUTBOX_FAILED if attempts >= max_attempts else OUTBOX_PENDING, str(error)[:500], entry.id
+        ))
+    for guild_id, rows in rows_by_path.values():
+        async with connect_db(guild_id) as conn:
+            await conn.executemany(
+                "UPDATE reminder_outbox SET attempts = ?, next_attempt_at = ?, status = ?, last_error = ? WHERE id = ?",
+                rows
+            )
+            await conn.commit()
+
+# Consultas de exportação: colunas exportadas, SELECT, coluna de data do filtro de período
+# e filtro de usuário de cada tabela.
+EXPORT_TABLES = {
+    'tarefas': (
+        ("id", "title", "assigned_to", "reminder_interval", "start_date", "due_date", "status"),
+        "SELECT id, title, assigned_to, reminder_interval, start_date, due_date, status FROM tasks m WHERE guild_id = ?",
+        "start_date",
+        "assigned_to = ?",
+    ),
+    'ponto': (
+        ("id", "user_id", "check_in", "check_out"),
+        "SELECT id, user_id, check_in, check_out FROM clockpoint m WHERE guild_id = ?",
+        "check_in",
+        "user_id = ?",
+    ),
+    'reunioes': (
+        ("id", "participants", "topics", "check_in_time", "check_out_time"),
+        f"SELECT m.id, m.participants, {MEETING_TOPICS_SQL}, m.check_in_time, m.check_out_time FROM meetings m WHERE m.guild_id = ?",
+        "check_in_time",
+        "(',' || m.participants || ',') LIKE '%,' || ? || ',%'",
+    ),
+}
+
+def _archived_export_row(table, row):
+    """
+    Converte um registro arquivado para as colunas de EXPORT_TABLES.
+    """
+    if table == 'reunioes':
+        meeting_id, participants, check_in_time, check_out_time, topics = row
+        return (meeting_id, participants, ", ".join(topic[2] for topic in topics), check_in_time, check_out_time)
+    return tuple(row)
+
+async def iter_export_rows(guild_id, table, since=None, until=None, user=None, batch_size=1000):
+    """
+    Gera lotes de até batch_size linhas de uma tabela de EXPORT_TABLES, com os filtros
+    de período [since, until) (ISO 8601) e de usuário aplicados no SQL.
+    `user` é o ID do usuário (ponto e reuniões) ou o nome do responsável (tarefas).
+    Pontos e reuniões arquivados são incluídos no final, um lote arquivado por vez.
+    """
+    columns, query, date_column, user_filter = EXPORT_TABLES[table]
+    params = [guild_id]
+    if since:
+        query += f" AND m.{date_column} >= ?"
+        params.append(since)
+    if until:
+        query += f" AND m.{date_column} < ?"
+        params.append(until)
+    if user:
+        query += f" AND {user_filter}"
+        params.append(str(user))
+
+    async with connect_db(guild_id) as conn:
+        cursor = await conn.execute(query + " ORDER BY m.id", params)
+        while True:
+            rows = await cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+
+    archive_table = {'ponto': 'clockpoint_archive', 'reunioes': 'meetings_archive'}.get(table)
+    path = archive_path(db_path(guild_id))
+    if not archive_table or not os.path.exists(path):
+        return
+
+    user_index = columns.index('user_id') if table == 'ponto' else None
+    async with aiosqlite.connect(path) as conn:
+        cursor = await conn.execute(
+            f"SELECT payload FROM {archive_table} WHERE guild_id = ? AND month >= ? AND month <= ? ORDER BY month, id",
+            (guild_id, (since or "0000-00")[:7], (until or "9999-99")[:7])
+        )
+        while True:
+            batch = await cursor.fetchone()
+            if batch is None:
+                break
+            rows = []
+            for row in _unpack_rows(batch[0]):
+                if (since and row[2] < since) or (until and row[2] >= until):
+                    continue
+                if user and table == 'ponto' and str(row[user_index]) != str(user):
+                    continue
+                if user and table == 'reunioes' and str(user) not in row[1].split(','):
+                    continue
+                rows.append(_archived_export_row(table, row))
+            if rows:
+                yield rows
+
+@cached('tasks')
+@instrument(DB_LATENCY)
+async def get_task_board(guild_id, per_column):
+    """
+    Retorna ({status: quantidade}, {status: [tarefas]}) para o quadro Kanban:
+    a contagem de cada status e as per_column tarefas de vencimento mais próximo de cada um.
+    """
+    async with connect_db(guild_id) as conn:
+        cursor = await conn.execute(
+            "SELECT status, COUNT(*) FROM tasks WHERE guild_id = ? GROUP BY status",
+            (guild_id,)
+        )
+        counts = dict(await cursor.fetchall())
+        cursor = await conn.execute(
+            '''
+            SELECT id, title, assigned_to, due_date, status FROM (
+                SELECT id, title, assigned_to, due_date, status,
+                       ROW_NUMBER() OVER (PARTITION BY status ORDER BY due_date) AS position
+                FROM tasks WHERE guild_id = ?
+            ) WHERE position <= ? ORDER BY status, position
+            ''',
+            (guild_id, per_column)
+        )
+        columns = {}
+        for task in await _fetchall_as(cursor, Task):
+            columns.setdefault(task.status, []).append(task)
+        return counts, columns
+
+@invalidates('kanban_boards')
+@instrument(DB_LATENCY)
+async def set_board_message(guild_id, channel_id, message_id):
+    """
+    Guarda onde está a mensagem do quadro Kanban do servidor.
+    """
+    async with connect_db(guild_id) as conn:
+        await conn.execute(
+            "INSERT OR REPLACE INTO kanban_boards (guild_id, channel_id, message_id) VALUES (?, ?, ?)",
+            (guild_id, str(channel_id), str(message_id))
+        )
+        await conn.commit()
+
+@cached('kanban_boards')
+@instrument(DB_LATENCY)
+async def get_board_message(guild_id):
+    """
+    Retorna (channel_id, message_id) do quadro Kanban do servidor, ou None.
+    """
+    async with connect_db(guild_id) as conn:
+        cursor = await conn.execute(
+            "SELECT channel_id, message_id FROM kanban_boards WHERE guild_id = ?",
+            (guild_id,)
+        )
+        return await cursor.fetchone()
+
+@invalidates('kanban_boards')
+@instrument(DB_LATENCY)
+async def delete_board_message(guild_id):
+    """
+    Esquece a mensagem do quadro Kanban do servidor (por exemplo, se ela foi apagada).
+    """
+    async with connect_db(guild_id) as conn:
+        await conn.execute("DELETE FROM kanban_boards WHERE guild_id = ?", (guild_id,))
+        await conn.commit()
+
+# Interface de armazenamento: as funções que o bot, os lembretes e os backups importam deste
+# módulo. Um backend alternativo precisa implementar todas, com os mesmos argumentos e retornos.
+STORAGE_API = (
+    'init_db',
+    'add_task', 'get_tasks', 'get_tasks_filtered', 'update_task_status', 'delete_task',
+    'is_user_checked_in', 'add_check_in', 'add_check_out', 'get_clockpoint_entries',
+    'get_clockpoint_entries_by_user', 'get_clockpoint_entry_by_id', 'get_clockpoint_entries_between',
+    'update_check_in_time', 'update_check_out_time', 'delete_clockpoint_by_id',
+    'add_meeting_check_in', 'add_meeting_topic', 'get_active_meeting_by_user',
+    'update_meeting_check_out', 'get_all_meetings', 'get_meetings_by_user', 'delete_meeting_by_id',
+    'get_meetings_between',
+    'set_retention_policy', 'get_retention_policy', 'get_retention_policies',
+    'archive_clockpoint_batch', 'archive_meetings_batch', 'compact_db',
+    'iter_tasks_to_escalate', 'iter_tasks_due_for_reminder', 'get_active_assignees',
+    'acquire_lease', 'release_lease', 'publish_reminder_directory', 'get_reminder_directory',
+    'enqueue_reminders', 'claim_reminders', 'ack_reminders', 'retry_reminders',
+    'iter_export_rows', 'get_task_board', 'set_board_message', 'get_board_message', 'delete_board_message',
+)
+
+if STORAGE_BACKEND == "postgres":
+    import database_pg
+    missing = [name for name in STORAGE_API if not hasattr(database_pg, name)]
+    if missing:
+        raise ImportError(f"database_pg não implementa: {', '.join(missing)}")
+    globals().update({name: getattr(database_pg, name) for name in STORAGE_API})
+elif STORAGE_BACKEND != "sqlite":
+    raise ValueError(f"ADA_STORAGE_BACKEND inválido: {STORAGE_BACKEND!r} (use sqlite ou postgres)")
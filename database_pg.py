@@ -0,0 +1,800 @@
+"""
+Backend PostgreSQL (asyncpg) da interface de armazenamento definida em database.STORAGE_API.
+
+Não importe este módulo diretamente: com ADA_STORAGE_BACKEND=postgres, database.py o importa
+e substitui as suas funções pelas daqui, então o bot continua usando `from database import ...`.
+As tabelas e os formatos (datas em texto ISO 8601, registros Task/ClockEntry/Meeting) são os
+mesmos do SQLite; o arquivo morto fica em tabelas do mesmo banco.
+
+- Conexões: um pool (ADA_PG_POOL_MIN a ADA_PG_POOL_MAX) criado na primeira consulta.
+- Instruções preparadas: o asyncpg prepara e guarda em cache cada consulta por conexão; a
+  varredura de lembretes prepara a sua uma vez e a reaproveita para todos os lotes de servidores.
+- Caminhos em lote: o arquivamento, a restauração de backup e a carga de dados sintéticos usam COPY.
+
+As listagens ordenam por id, a ordem de inserção que o SQLite devolve implicitamente.
+"""
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import time
+import asyncpg
+from database import (
+    BR_TZ, DB_LATENCY, EXPORT_TABLES, GUILD_TABLES, MEETING_TOPICS_COLUMNS, MEETING_TOPICS_SQL,
+    OPEN_STATUSES, OUTBOX_FAILED, OUTBOX_PENDING, OVERDUE_STATUS, ARCHIVE_BATCH_SIZE, ARCHIVE_TABLES,
+    ClockEntry, Meeting, OutboxEntry, Task,
+    _archived_export_row, _group_by_month, _pack_rows, _unpack_rows, cached, instrument, invalidates
+)
+
+DATABASE_URL = os.getenv("ADA_DATABASE_URL", "postgresql://localhost/ada")
+PG_SCHEMA = os.getenv("ADA_PG_SCHEMA", "public")
+PG_POOL_MIN = int(os.getenv("ADA_PG_POOL_MIN", "1"))
+PG_POOL_MAX = int(os.getenv("ADA_PG_POOL_MAX", "10"))
+
+# Mesma subconsulta de database.MEETING_TOPICS_SQL, com a agregação do PostgreSQL.
+PG_MEETING_TOPICS_SQL = (
+    "COALESCE((SELECT string_agg(text, ', ' ORDER BY id) FROM meeting_topics WHERE meeting_id = m.id), '')"
+)
+
+# O pool e a trava pertencem ao event loop em que foram criados (ver get_pool).
+_pool = None
+_pool_loop = None
+_pool_lock = None
+
+def _sql(query):
+    """
+    Troca os marcadores "?" do SQLite pelos numerados ($1, $2, ...) do PostgreSQL.
+    """
+    parts = query.split("?")
+    return "".join(part + (f"${index}" if index < len(parts) else "") for index, part in enumerate(parts, start=1))
+
+def _rowcount(status):
+    """
+    Número de linhas afetadas a partir do status do comando ("UPDATE 3", "DELETE 0").
+    """
+    return int(status.rsplit(" ", 1)[-1])
+
+def _records_as(rows, record_class):
+    return [record_class.from_row(row.keys(), row.values()) for row in rows]
+
+async def get_pool():
+    """
+    Pool de conexões do event loop atual. As conexões do asyncpg ficam presas ao loop em que
+    foram abertas, e o bot.py cria o esquema num asyncio.run próprio antes do bot.run: um pool
+    vindo de outro loop (já fechado) é descartado e recriado neste.
+    """
+    global _pool, _pool_loop, _pool_lock
+    loop = asyncio.get_running_loop()
+    if _pool_loop is not loop:
+        _pool, _pool_loop, _pool_lock = None, loop, asyncio.Lock()
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(
+                    DATABASE_URL, min_size=PG_POOL_MIN, max_size=PG_POOL_MAX,
+                    server_settings={"search_path": PG_SCHEMA}
+                )
+    return _pool
+
+async def close_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+@contextlib.asynccontextmanager
+async def connect_db(guild_id=None):
+    """
+    Empresta uma conexão do pool. Uso: async with connect_db() as conn: ...
+    """
+    async with (await get_pool()).acquire() as conn:
+        yield conn
+
+@instrument(DB_LATENCY)
+async def init_db():
+    """
+    Cria o esquema, as tabelas e os índices, se ainda não existirem.
+    """
+    async with connect_db() as conn:
+        await conn.execute(f'CREATE SCHEMA IF NOT EXISTS "{PG_SCHEMA}"')
+        await conn.execute('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                guild_id TEXT NOT NULL,
+                title TEXT,
+                assigned_to TEXT,
+                reminder_interval TEXT,
+                start_date TEXT,
+                due_date TEXT,
+                status TEXT
+            );
+            CREATE TABLE IF NOT EXISTS clockpoint (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                guild_id TEXT NOT NULL,
+                user_id TEXT,
+                check_in TEXT,
+                check_out TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meetings (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                guild_id TEXT NOT NULL,
+                participants TEXT,
+                topics TEXT,
+                check_in_time TEXT,
+                check_out_time TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meeting_topics (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                meeting_id BIGINT NOT NULL,
+                author_id TEXT,
+                created_at TEXT,
+                text TEXT
+            );
+            CREATE TABLE IF NOT EXISTS retention_policies (
+                guild_id TEXT PRIMARY KEY,
+                months INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS kanban_boards (
+                guild_id TEXT PRIMARY KEY,
+                channel_id TEXT NOT NULL,
+                message_id TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS scheduler_leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires_at DOUBLE PRECISION NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS reminder_directory (
+                guild_id TEXT PRIMARY KEY,
+                channel_id TEXT,
+                mentions TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS reminder_outbox (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                guild_id TEXT NOT NULL,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                channel_id TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at DOUBLE PRECISION NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                last_error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS clockpoint_archive (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                guild_id TEXT NOT NULL,
+                month TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                payload BYTEA NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meetings_archive (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                guild_id TEXT NOT NULL,
+                month TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                payload BYTEA NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_meeting_topics_meeting_id ON meeting_topics (meeting_id);
+            CREATE INDEX IF NOT EXISTS idx_tasks_status_due_date ON tasks (status, due_date);
+            CREATE INDEX IF NOT EXISTS idx_tasks_guild_status_due_date ON tasks (guild_id, status, due_date);
+            CREATE INDEX IF NOT EXISTS idx_clockpoint_guild_user ON clockpoint (guild_id, user_id);
+            CREATE INDEX IF NOT EXISTS idx_meetings_guild_check_in ON meetings (guild_id, check_in_time);
+            CREATE INDEX IF NOT EXISTS idx_reminder_outbox_status_next_attempt ON reminder_outbox (status, next_attempt_at);
+            CREATE INDEX IF NOT EXISTS idx_clockpoint_archive_guild_month ON clockpoint_archive (guild_id, month);
+            CREATE INDEX IF NOT EXISTS idx_meetings_archive_guild_month ON meetings_archive (guild_id, month);
+        ''')
+
+@invalidates('tasks')
+@instrument(DB_LATENCY)
+async def add_task(guild_id, title, assigned_to, reminder_interval, start_date, due_date, status="A Fazer"):
+    async with connect_db(guild_id) as conn:
+        await conn.execute(
+            "INSERT INTO tasks (guild_id, title, assigned_to, reminder_interval, start_date, due_date, status) VALUES ($1, $2, $3, $4, $5, $6, $7)",
+            guild_id, title, assigned_to, reminder_interval, start_date, due_date, status
+        )
+
+@cached('tasks')
+@instrument(DB_LATENCY)
+async def get_tasks_filtered(guild_id, assigned_to):
+    async with connect_db(guild_id) as conn:
+        rows = await conn.fetch(
+            "SELECT id, guild_id, title, assigned_to, reminder_interval, start_date, due_date, status FROM tasks WHERE guild_id = $1 AND assigned_to = $2 ORDER BY id",
+            guild_id, assigned_to
+        )
+        return _records_as(rows, Task)
+
+@cached('tasks')
+@instrument(DB_LATENCY)
+async def get_tasks(guild_id):
+    async with connect_db(guild_id) as conn:
+        rows = await conn.fetch(
+            "SELECT id, guild_id, title, assigned_to, reminder_interval, start_date, due_date, status FROM tasks WHERE guild_id = $1 ORDER BY id",
+            guild_id
+        )
+        return _records_as(rows, Task)
+
+@invalidates('tasks')
+@instrument(DB_LATENCY)
+async def update_task_status(guild_id, task_id, assigned_to, new_status):
+    async with connect_db(guild_id) as conn:
+        status = await conn.execute(
+            "UPDATE tasks SET status = $1 WHERE id = $2 AND assigned_to = $3 AND guild_id = $4",
+            new_status, task_id, assigned_to, guild_id
+        )
+        return _rowcount(status) > 0
+
+@invalidates('tasks')
+@instrument(DB_LATENCY)
+async def delete_task(guild_id, task_id):
+    async with connect_db(guild_id) as conn:
+        status = await conn.execute("DELETE FROM tasks WHERE id = $1 AND guild_id = $2", task_id, guild_id)
+        return _rowcount(status) > 0
+
+@cached('clockpoint')
+@instrument(DB_LATENCY)
+async def is_user_checked_in(guild_id, user_id):
+    async with connect_db(guild_id) as conn:
+        return await conn.fetchval(
+            "SELECT 1 FROM clockpoint WHERE guild_id = $1 AND user_id = $2 AND check_out IS NULL LIMIT 1",
+            guild_id, user_id
+        ) is not None
+
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
+async def add_check_in(guild_id, user_id, check_in_time):
+    async with connect_db(guild_id) as conn:
+        await conn.execute(
+            "INSERT INTO clockpoint (guild_id, user_id, check_in) VALUES ($1, $2, $3)",
+            guild_id, user_id, check_in_time
+        )
+
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
+async def add_check_out(guild_id, user_id, check_out_time):
+    async with connect_db(guild_id) as conn:
+        await conn.execute(
+            "UPDATE clockpoint SET check_out = $1 WHERE guild_id = $2 AND user_id = $3 AND check_out IS NULL",
+            check_out_time, guild_id, user_id
+        )
+
+@cached('clockpoint')
+@instrument(DB_LATENCY)
+async def get_clockpoint_entries(guild_id):
+    async with connect_db(guild_id) as conn:
+        rows = await conn.fetch("SELECT id, user_id, check_in, check_out FROM clockpoint WHERE guild_id = $1 ORDER BY id", guild_id)
+        return _records_as(rows, ClockEntry)
+
+@cached('clockpoint')
+@instrument(DB_LATENCY)
+async def get_clockpoint_entries_by_user(guild_id, user_id):
+    async with connect_db(guild_id) as conn:
+        rows = await conn.fetch(
+            "SELECT id, user_id, check_in, check_out FROM clockpoint WHERE guild_id = $1 AND user_id = $2 ORDER BY id",
+            guild_id, user_id
+        )
+        return _records_as(rows, ClockEntry)
+
+@cached('clockpoint')
+@instrument(DB_LATENCY)
+async def get_clockpoint_entry_by_id(guild_id, entry_id):
+    async with connect_db(guild_id) as conn:
+        row = await conn.fetchrow(
+            "SELECT id, user_id, check_in, check_out FROM clockpoint WHERE id = $1 AND guild_id = $2",
+            entry_id, guild_id
+        )
+        return ClockEntry.from_row(row.keys(), row.values()) if row else None
+
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
+async def update_check_in_time(guild_id, entry_id, new_check_in_time):
+    async with connect_db(guild_id) as conn:
+        await conn.execute(
+            "UPDATE clockpoint SET check_in = $1 WHERE id = $2 AND guild_id = $3",
+            new_check_in_time, entry_id, guild_id
+        )
+
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
+async def update_check_out_time(guild_id, entry_id, new_check_out_time):
+    async with connect_db(guild_id) as conn:
+        await conn.execute(
+            "UPDATE clockpoint SET check_out = $1 WHERE id = $2 AND guild_id = $3",
+            new_check_out_time, entry_id, guild_id
+        )
+
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
+async def delete_clockpoint_by_id(guild_id, point_id):
+    async with connect_db(guild_id) as conn:
+        return _rowcount(await conn.execute("DELETE FROM clockpoint WHERE id = $1 AND guild_id = $2", point_id, guild_id))
+
+@invalidates('meetings')
+@instrument(DB_LATENCY)
+async def add_meeting_check_in(guild_id, participants):
+    check_in_time = datetime.datetime.now(BR_TZ).isoformat()
+    async with connect_db(guild_id) as conn:
+        await conn.execute(
+            "INSERT INTO meetings (guild_id, participants, topics, check_in_time) VALUES ($1, $2, '', $3)",
+            guild_id, participants, check_in_time
+        )
+
+@invalidates('meetings')
+@instrument(DB_LATENCY)
+async def add_meeting_topic(guild_id, meeting_id, new_topics, author_id=None):
+    created_at = datetime.datetime.now(BR_TZ).isoformat()
+    async with connect_db(guild_id) as conn:
+        status = await conn.execute(
+            "INSERT INTO meeting_topics (meeting_id, author_id, created_at, text) SELECT id, $1, $2, $3 FROM meetings WHERE id = $4 AND guild_id = $5",
+            author_id, created_at, new_topics, meeting_id, guild_id
+        )
+        return _rowcount(status) > 0
+
+@cached('meetings')
+@instrument(DB_LATENCY)
+async def get_active_meeting_by_user(guild_id, user_id):
+    async with connect_db(guild_id) as conn:
+        row = await conn.fetchrow(
+            f"SELECT m.id, m.participants, {PG_MEETING_TOPICS_SQL} AS topics, m.check_in_time FROM meetings m WHERE m.guild_id = $1 AND m.participants LIKE $2 AND m.check_out_time IS NULL LIMIT 1",
+            guild_id, f"%{user_id}%"
+        )
+        return Meeting.from_row(row.keys(), row.values()) if row else None
+
+@invalidates('meetings')
+@instrument(DB_LATENCY)
+async def update_meeting_check_out(guild_id, meeting_id):
+    check_out_time = datetime.datetime.now(BR_TZ).isoformat()
+    async with connect_db(guild_id) as conn:
+        await conn.execute(
+            "UPDATE meetings SET check_out_time = $1 WHERE id = $2 AND guild_id = $3",
+            check_out_time, meeting_id, guild_id
+        )
+
+@cached('meetings')
+@instrument(DB_LATENCY)
+async def get_all_meetings(guild_id):
+    async with connect_db(guild_id) as conn:
+        rows = await conn.fetch(
+            f"SELECT m.id, m.participants, {PG_MEETING_TOPICS_SQL} AS topics, m.check_in_time, m.check_out_time FROM meetings m WHERE m.guild_id = $1 ORDER BY m.check_in_time DESC",
+            guild_id
+        )
+        return _records_as(rows, Meeting)
+
+@cached('meetings')
+@instrument(DB_LATENCY)
+async def get_meetings_by_user(guild_id, user_id):
+    async with connect_db(guild_id) as conn:
+        rows = await conn.fetch(
+            f"SELECT m.id, m.participants, {PG_MEETING_TOPICS_SQL} AS topics, m.check_in_time, m.check_out_time FROM meetings m WHERE m.guild_id = $1 AND m.participants LIKE $2 ORDER BY m.check_in_time DESC",
+            guild_id, f"%{user_id}%"
+        )
+        return _records_as(rows, Meeting)
+
+@invalidates('meetings')
+@instrument(DB_LATENCY)
+async def delete_meeting_by_id(guild_id, meeting_id):
+    async with connect_db(guild_id) as conn:
+        async with conn.transaction():
+            deleted = _rowcount(await conn.execute("DELETE FROM meetings WHERE id = $1 AND guild_id = $2", meeting_id, guild_id))
+            if deleted:
+                await conn.execute("DELETE FROM meeting_topics WHERE meeting_id = $1", meeting_id)
+        return deleted
+
+@invalidates('retention_policies')
+@instrument(DB_LATENCY)
+async def set_retention_policy(guild_id, months):
+    async with connect_db(guild_id) as conn:
+        if months is None:
+            await conn.execute("DELETE FROM retention_policies WHERE guild_id = $1", guild_id)
+        else:
+            await conn.execute(
+                "INSERT INTO retention_policies (guild_id, months) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET months = excluded.months",
+                guild_id, months
+            )
+
+@cached('retention_policies')
+@instrument(DB_LATENCY)
+async def get_retention_policy(guild_id):
+    async with connect_db(guild_id) as conn:
+        return await conn.fetchval("SELECT months FROM retention_policies WHERE guild_id = $1", guild_id)
+
+@instrument(DB_LATENCY)
+async def get_retention_policies():
+    async with connect_db() as conn:
+        return [tuple(row) for row in await conn.fetch("SELECT guild_id, months FROM retention_policies")]
+
+async def _copy_archive(conn, table, guild_id, rows):
+    """
+    Grava os lotes mensais compactados no arquivo morto com COPY.
+    """
+    await conn.copy_records_to_table(
+        table, columns=[column.strip() for column in ARCHIVE_TABLES[table].split(",")],
+        records=[(guild_id, month, len(month_rows), _pack_rows(month_rows)) for month, month_rows in _group_by_month(rows, 2).items()]
+    )
+
+@invalidates('clockpoint')
+@instrument(DB_LATENCY)
+async def archive_clockpoint_batch(guild_id, cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move até batch_size pontos fechados antes de cutoff para o arquivo morto. As linhas
+    escolhidas ficam travadas (SKIP LOCKED), então vários processos podem arquivar juntos.
+    """
+    async with connect_db(guild_id) as conn:
+        async with conn.transaction():
+            rows = await conn.fetch(
+                "SELECT id, user_id, check_in, check_out FROM clockpoint WHERE guild_id = $1 AND check_out IS NOT NULL AND check_out < $2 ORDER BY id LIMIT $3 FOR UPDATE SKIP LOCKED",
+                guild_id, cutoff, batch_size
+            )
+            if not rows:
+                return 0
+            rows = [list(row) for row in rows]
+            await _copy_archive(conn, 'clockpoint_archive', guild_id, rows)
+            await conn.execute("DELETE FROM clockpoint WHERE id = ANY($1::bigint[])", [row[0] for row in rows])
+            return len(rows)
+
+@invalidates('meetings')
+@instrument(DB_LATENCY)
+async def archive_meetings_batch(guild_id, cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move até batch_size reuniões finalizadas antes de cutoff, com seus tópicos, para o arquivo morto.
+    """
+    async with connect_db(guild_id) as conn:
+        async with conn.transaction():
+            meetings = await conn.fetch(
+                "SELECT id, participants, check_in_time, check_out_time FROM meetings WHERE guild_id = $1 AND check_out_time IS NOT NULL AND check_out_time < $2 ORDER BY id LIMIT $3 FOR UPDATE SKIP LOCKED",
+                guild_id, cutoff, batch_size
+            )
+            if not meetings:
+                return 0
+            meeting_ids = [meeting['id'] for meeting in meetings]
+            topics_by_meeting = {}
+            for meeting_id, author_id, created_at, text in await conn.fetch(
+                "SELECT meeting_id, author_id, created_at, text FROM meeting_topics WHERE meeting_id = ANY($1::bigint[]) ORDER BY id",
+                meeting_ids
+            ):
+                topics_by_meeting.setdefault(meeting_id, []).append([author_id, created_at, text])
+
+            rows = [list(meeting) + [topics_by_meeting.get(meeting['id'], [])] for meeting in meetings]
+            await _copy_archive(conn, 'meetings_archive', guild_id, rows)
+            await conn.execute("DELETE FROM meeting_topics WHERE meeting_id = ANY($1::bigint[])", meeting_ids)
+            await conn.execute("DELETE FROM meetings WHERE id = ANY($1::bigint[])", meeting_ids)
+            return len(meetings)
+
+@instrument(DB_LATENCY)
+async def compact_db(guild_id):
+    """
+    Roda VACUUM nas tabelas de onde o arquivamento apaga linhas, para que o espaço seja reaproveitado.
+    """
+    async with connect_db(guild_id) as conn:
+        await conn.execute("VACUUM (ANALYZE) clockpoint, meetings, meeting_topics")
+
+async def _get_archived_rows(conn, table, guild_id, since, until):
+    rows = []
+    for (payload,) in await conn.fetch(
+        f"SELECT payload FROM {table} WHERE guild_id = $1 AND month >= $2 AND month <= $3",
+        guild_id, since[:7], until[:7]
+    ):
+        rows.extend(row for row in _unpack_rows(payload) if since <= row[2] < until)
+    return rows
+
+@cached('clockpoint')
+@instrument(DB_LATENCY)
+async def get_clockpoint_entries_between(guild_id, since, until):
+    async with connect_db(guild_id) as conn:
+        rows = await conn.fetch(
+            "SELECT id, user_id, check_in, check_out FROM clockpoint WHERE guild_id = $1 AND check_in >= $2 AND check_in < $3",
+            guild_id, since, until
+        )
+        entries = _records_as(rows, ClockEntry)
+        for entry_id, user_id, check_in, check_out in await _get_archived_rows(conn, 'clockpoint_archive', guild_id, since, until):
+            entries.append(ClockEntry(id=entry_id, user_id=user_id, check_in=check_in, check_out=check_out))
+    entries.sort(key=lambda entry: entry.check_in)
+    return entries
+
+@cached('meetings')
+@instrument(DB_LATENCY)
+async def get_meetings_between(guild_id, since, until):
+    async with connect_db(guild_id) as conn:
+        rows = await conn.fetch(
+            f"SELECT m.id, m.participants, {PG_MEETING_TOPICS_SQL} AS topics, m.check_in_time, m.check_out_time FROM meetings m WHERE m.guild_id = $1 AND m.check_in_time >= $2 AND m.check_in_time < $3",
+            guild_id, since, until
+        )
+        meetings = _records_as(rows, Meeting)
+        for meeting_id, participants, check_in_time, check_out_time, topics in await _get_archived_rows(conn, 'meetings_archive', guild_id, since, until):
+            meetings.append(Meeting(
+                id=meeting_id, participants=participants, topics=", ".join(topic[2] for topic in topics),
+                check_in_time=check_in_time, check_out_time=check_out_time
+            ))
+    meetings.sort(key=lambda meeting: meeting.check_in_time, reverse=True)
+    return meetings
+
+async def _iter_tasks_where(guild_ids, where, params, chunk_size=500):
+    """
+    Gera (guild_id, tarefas) das tarefas que satisfazem `where` (com marcadores a partir de $2),
+    com uma instrução preparada executada uma vez por lote de servidores.
+    """
+    guild_ids = [str(guild_id) for guild_id in guild_ids]
+    if not guild_ids:
+        return
+    async with connect_db() as conn:
+        statement = await conn.prepare(
+            f"SELECT id, guild_id, title, assigned_to, reminder_interval, start_date, due_date, status FROM tasks WHERE guild_id = ANY($1::text[]) AND ({where}) ORDER BY guild_id"
+        )
+        for start in range(0, len(guild_ids), chunk_size):
+            tasks_by_guild = {}
+            for task in _records_as(await statement.fetch(guild_ids[start:start + chunk_size], *params), Task):
+                tasks_by_guild.setdefault(task.guild_id, []).append(task)
+            for guild_id, tasks in tasks_by_guild.items():
+                yield guild_id, tasks
+
+def iter_tasks_to_escalate(guild_ids, now):
+    return _iter_tasks_where(guild_ids, "status = ANY($2::text[]) AND due_date < $3", (list(OPEN_STATUSES), now))
+
+def iter_tasks_due_for_reminder(guild_ids, now, overdue_interval):
+    """
+    Mesma regra da versão SQLite, com as datas em texto convertidas para timestamptz.
+    Um reminder_interval que não seja numérico conta como zero, como no CAST do SQLite.
+    """
+    return _iter_tasks_where(
+        guild_ids,
+        "(status = 'Em Andamento' AND start_date::timestamptz"
+        " + COALESCE(CASE WHEN reminder_interval ~ '^[0-9]+(\\.[0-9]+)?$' THEN reminder_interval::double precision END, 0)"
+        " * interval '1 second' <= $2::text::timestamptz)"
+        " OR (status = $3 AND start_date::timestamptz + $4::integer * interval '1 second' <= $2::text::timestamptz)",
+        (now, OVERDUE_STATUS, int(overdue_interval))
+    )
+
+@instrument(DB_LATENCY)
+async def get_active_assignees(guild_ids):
+    guild_ids = [str(guild_id) for guild_id in guild_ids]
+    assignees = {}
+    async with connect_db() as conn:
+        for guild_id, assigned_to in await conn.fetch(
+            "SELECT DISTINCT guild_id, assigned_to FROM tasks WHERE status = ANY($2::text[]) AND guild_id = ANY($1::text[])",
+            guild_ids, [*OPEN_STATUSES, OVERDUE_STATUS]
+        ):
+            assignees.setdefault(guild_id, set()).add(assigned_to)
+    return assignees
+
+@instrument(DB_LATENCY)
+async def acquire_lease(name, holder, ttl):
+    """
+    Obtém ou renova a liderança numa única instrução: o RETURNING só traz a linha
+    se ela foi inserida ou atualizada para `holder`.
+    """
+    now = time.time()
+    async with connect_db() as conn:
+        return await conn.fetchval(
+            '''
+            INSERT INTO scheduler_leases (name, holder, expires_at) VALUES ($1, $2, $3)
+            ON CONFLICT (name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+            WHERE scheduler_leases.holder = excluded.holder OR scheduler_leases.expires_at < $4
+            RETURNING holder
+            ''',
+            name, holder, now + ttl, now
+        ) == holder
+
+@instrument(DB_LATENCY)
+async def release_lease(name, holder):
+    async with connect_db() as conn:
+        await conn.execute("DELETE FROM scheduler_leases WHERE name = $1 AND holder = $2", name, holder)
+
+@instrument(DB_LATENCY)
+async def publish_reminder_directory(entries):
+    now = datetime.datetime.now(BR_TZ).isoformat()
+    async with connect_db() as conn:
+        await conn.executemany(
+            '''
+            INSERT INTO reminder_directory (guild_id, channel_id, mentions, updated_at) VALUES ($1, $2, $3, $4)
+            ON CONFLICT (guild_id) DO UPDATE SET channel_id = excluded.channel_id, mentions = excluded.mentions, updated_at = excluded.updated_at
+            ''',
+            [
+                (str(guild_id), str(channel_id) if channel_id else None, json.dumps(mentions, ensure_ascii=False), now)
+                for guild_id, channel_id, mentions in entries
+            ]
+        )
+
+@instrument(DB_LATENCY)
+async def get_reminder_directory():
+    async with connect_db() as conn:
+        return {
+            guild_id: (channel_id, json.loads(mentions))
+            for guild_id, channel_id, mentions in await conn.fetch("SELECT guild_id, channel_id, mentions FROM reminder_directory")
+        }
+
+@invalidates('tasks')
+@instrument(DB_LATENCY)
+async def enqueue_reminders(guild_id, reminders, task_ids, now_iso, new_status=None):
+    async with connect_db(guild_id) as conn:
+        async with conn.transaction():
+            await conn.executemany(
+                "INSERT INTO reminder_outbox (guild_id, idempotency_key, channel_id, content, created_at, next_attempt_at) VALUES ($1, $2, $3, $4, $5, 0) ON CONFLICT (idempotency_key) DO NOTHING",
+                [(guild_id, key, str(channel_id), content, now_iso) for key, channel_id, content in reminders]
+            )
+            if task_ids:
+                await conn.execute(
+                    "UPDATE tasks SET status = COALESCE($1, status), start_date = $2 WHERE guild_id = $3 AND id = ANY($4::bigint[])",
+                    new_status, now_iso, guild_id, list(task_ids)
+                )
+
+@instrument(DB_LATENCY)
+async def claim_reminders(guild_ids, limit, claim_timeout):
+    """
+    Reserva os lembretes numa única instrução; SKIP LOCKED deixa vários processos
+    reservarem ao mesmo tempo sem pegar as mesmas linhas.
+    """
+    now = time.time()
+    async with connect_db() as conn:
+        rows = await conn.fetch(
+            '''
+            UPDATE reminder_outbox SET next_attempt_at = $1 WHERE id IN (
+                SELECT id FROM reminder_outbox
+                WHERE status = $2 AND next_attempt_at <= $3 AND guild_id = ANY($4::text[])
+                ORDER BY id LIMIT $5 FOR UPDATE SKIP LOCKED
+            ) RETURNING id, guild_id, idempotency_key, channel_id, content, attempts
+            ''',
+            now + claim_timeout, OUTBOX_PENDING, now, [str(guild_id) for guild_id in guild_ids], limit
+        )
+        return sorted(_records_as(rows, OutboxEntry), key=lambda entry: entry.id)
+
+@instrument(DB_LATENCY)
+async def ack_reminders(entries):
+    async with connect_db() as conn:
+        await conn.execute("DELETE FROM reminder_outbox WHERE id = ANY($1::bigint[])", [entry.id for entry in entries])
+
+@instrument(DB_LATENCY)
+async def retry_reminders(failures, max_attempts, backoff):
+    now = time.time()
+    async with connect_db() as conn:
+        await conn.executemany(
+            "UPDATE reminder_outbox SET attempts = $1, next_attempt_at = $2, status = $3, last_error = $4 WHERE id = $5",
+            [
+                (
+                    entry.attempts + 1, now + backoff * 2 ** entry.attempts,
+                    OUTBOX_FAILED if entry.attempts + 1 >= max_attempts else OUTBOX_PENDING, str(error)[:500], entry.id
+                )
+                for entry, error in failures
+            ]
+        )
+
+async def iter_export_rows(guild_id, table, since=None, until=None, user=None, batch_size=1000):
+    """
+    Mesmos lotes da versão SQLite, lidos por um cursor do servidor dentro de uma transação.
+    """
+    columns, query, date_column, user_filter = EXPORT_TABLES[table]
+    query = query.replace(MEETING_TOPICS_SQL, PG_MEETING_TOPICS_SQL)
+    params = [guild_id]
+    if since:
+        query += f" AND m.{date_column} >= ?"
+        params.append(since)
+    if until:
+        query += f" AND m.{date_column} < ?"
+        params.append(until)
+    if user:
+        query += f" AND {user_filter}"
+        params.append(str(user))
+
+    archive_table = {'ponto': 'clockpoint_archive', 'reunioes': 'meetings_archive'}.get(table)
+    user_index = columns.index('user_id') if table == 'ponto' else None
+    async with connect_db(guild_id) as conn:
+        async with conn.transaction():
+            cursor = await conn.cursor(_sql(query + " ORDER BY m.id"), *params)
+            while True:
+                rows = await cursor.fetch(batch_size)
+                if not rows:
+                    break
+                yield [tuple(row) for row in rows]
+
+            if not archive_table:
+                return
+            async for (payload,) in conn.cursor(
+                f"SELECT payload FROM {archive_table} WHERE guild_id = $1 AND month >= $2 AND month <= $3 ORDER BY month, id",
+                guild_id, (since or "0000-00")[:7], (until or "9999-99")[:7], prefetch=1
+            ):
+                rows = []
+                for row in _unpack_rows(payload):
+                    if (since and row[2] < since) or (until and row[2] >= until):
+                        continue
+                    if user and table == 'ponto' and str(row[user_index]) != str(user):
+                        continue
+                    if user and table == 'reunioes' and str(user) not in row[1].split(','):
+                        continue
+                    rows.append(_archived_export_row(table, row))
+                if rows:
+                    yield rows
+
+@cached('tasks')
+@instrument(DB_LATENCY)
+async def get_task_board(guild_id, per_column):
+    async with connect_db(guild_id) as conn:
+        counts = dict(
+            tuple(row) for row in await conn.fetch("SELECT status, COUNT(*) FROM tasks WHERE guild_id = $1 GROUP BY status", guild_id)
+        )
+        rows = await conn.fetch(
+            '''
+            SELECT id, title, assigned_to, due_date, status FROM (
+                SELECT id, title, assigned_to, due_date, status,
+                       ROW_NUMBER() OVER (PARTITION BY status ORDER BY due_date) AS position
+                FROM tasks WHERE guild_id = $1
+            ) ranked WHERE position <= $2 ORDER BY status, position
+            ''',
+            guild_id, per_column
+        )
+        columns = {}
+        for task in _records_as(rows, Task):
+            columns.setdefault(task.status, []).append(task)
+        return counts, columns
+
+@invalidates('kanban_boards')
+@instrument(DB_LATENCY)
+async def set_board_message(guild_id, channel_id, message_id):
+    async with connect_db(guild_id) as conn:
+        await conn.execute(
+            '''
+            INSERT INTO kanban_boards (guild_id, channel_id, message_id) VALUES ($1, $2, $3)
+            ON CONFLICT (guild_id) DO UPDATE SET channel_id = excluded.channel_id, message_id = excluded.message_id
+            ''',
+            guild_id, str(channel_id), str(message_id)
+        )
+
+@cached('kanban_boards')
+@instrument(DB_LATENCY)
+async def get_board_message(guild_id):
+    async with connect_db(guild_id) as conn:
+        row = await conn.fetchrow("SELECT channel_id, message_id FROM kanban_boards WHERE guild_id = $1", guild_id)
+        return tuple(row) if row else None
+
+@invalidates('kanban_boards')
+@instrument(DB_LATENCY)
+async def delete_board_message(guild_id):
+    async with connect_db(guild_id) as conn:
+        await conn.execute("DELETE FROM kanban_boards WHERE guild_id = $1", guild_id)
+
+# Tabelas copiadas na exportação/restauração de um servidor, com as colunas e o filtro do servidor.
+def _guild_tables():
+    tables = {table: (columns, "guild_id = $1") for table, columns in GUILD_TABLES.items()}
+    tables['meeting_topics'] = (MEETING_TOPICS_COLUMNS, "meeting_id IN (SELECT id FROM meetings WHERE guild_id = $1)")
+    tables.update({table: (columns, "guild_id = $1") for table, columns in ARCHIVE_TABLES.items()})
+    return tables
+
+@instrument(DB_LATENCY)
+async def read_guild_tables(guild_id):
+    """
+    Lê todos os dados de um servidor, numa única transação, para a exportação de backup.
+    Retorna {tabela: (colunas, linhas)}.
+    """
+    result = {}
+    async with connect_db(guild_id) as conn:
+        async with conn.transaction(isolation='repeatable_read', readonly=True):
+            for table, (columns, where) in _guild_tables().items():
+                rows = await conn.fetch(f"SELECT {columns} FROM {table} WHERE {where}", guild_id)
+                result[table] = (columns, [tuple(row) for row in rows])
+    return result
+
+@instrument(DB_LATENCY)
+async def replace_guild_tables(guild_id, tables):
+    """
+    Substitui os dados do servidor pelos de {tabela: linhas}, numa única transação, carregando
+    as linhas com COPY. Tabelas ausentes ficam vazias. Os IDs originais são mantidos e as
+    sequências de identidade avançam para depois deles. Retorna o número de linhas restauradas.
+    """
+    restored = 0
+    async with connect_db(guild_id) as conn:
+        async with conn.transaction():
+            guild_tables = _guild_tables()
+            # Os tópicos dependem de meetings para o filtro; são apagados antes delas.
+            for table in ['meeting_topics'] + [table for table in guild_tables if table != 'meeting_topics']:
+                await conn.execute(f"DELETE FROM {table} WHERE {guild_tables[table][1]}", guild_id)
+            for table, (columns, _) in guild_tables.items():
+                rows = tables.get(table)
+                if not rows:
+                    continue
+                await conn.copy_records_to_table(table, columns=[column.strip() for column in columns.split(",")], records=rows)
+                restored += len(rows)
+                if columns.startswith("id,"):
+                    await conn.execute(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), GREATEST((SELECT MAX(id) FROM {table}), 1))"
+                    )
+    return restored
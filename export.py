@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import database
+
+EXPORT_DIR = os.getenv("ADA_EXPORT_DIR", "exports")
+EXPORT_FORMATS = ("csv", "jsonl")
+
+def parse_period(data_inicio=None, data_fim=None):
+    """
+    Converte as datas DD/MM/AAAA em (início, fim exclusivo), no fuso de Brasília.
+    Sem datas, retorna (None, None). Levanta ValueError com a mensagem para o usuário.
+    """
+    if not (data_inicio or data_fim):
+        return None, None
+    try:
+        since = database.BR_TZ.localize(datetime.datetime.strptime(data_inicio, "%d/%m/%Y"))
+        until = database.BR_TZ.localize(datetime.datetime.strptime(data_fim or data_inicio, "%d/%m/%Y") + datetime.timedelta(days=1))
+    except (TypeError, ValueError):
+        raise ValueError("Período inválido. Use `DD/MM/AAAA DD/MM/AAAA`.")
+    if until <= since:
+        raise ValueError("A data de fim deve ser igual ou posterior à data de início.")
+    return since, until
+
+def _format_batch(fmt, columns, rows):
+    """
+    Converte um lote de linhas em texto CSV ou JSONL.
+    """
+    if fmt == "jsonl":
+        return "".join(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+async def export_table(guild_id, table, fmt="csv", since=None, until=None, user=None, path=None):
+    """
+    Exporta uma tabela do servidor para CSV ou JSONL compactado com gzip, lote a lote:
+    só um lote fica em memória por vez, e a compressão e a escrita rodam fora do event loop.
+    Retorna (caminho do arquivo, número de linhas).
+    """
+    guild_id = str(guild_id)
+    if table not in database.EXPORT_TABLES:
+        raise ValueError(f"Tabela inválida. Use: {', '.join(database.EXPORT_TABLES)}.")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato inválido. Use: {', '.join(EXPORT_FORMATS)}.")
+
+    if path is None:
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        path = os.path.join(EXPORT_DIR, f"{table}_{guild_id}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}.gz")
+    columns = database.EXPORT_TABLES[table][0]
+
+    count = 0
+    output = await asyncio.to_thread(gzip.open, path, "wt", encoding="utf-8", newline="")
+    try:
+        if fmt == "csv":
+            await asyncio.to_thread(output.write, _format_batch(fmt, [], [columns]))
+        async for rows in database.iter_export_rows(
+            guild_id, table,
+            since.isoformat() if since else None,
+            until.isoformat() if until else None,
+            user
+        ):
+            await asyncio.to_thread(output.write, _format_batch(fmt, columns, rows))
+            count += len(rows)
+    finally:
+        await asyncio.to_thread(output.close)
+    return path, count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta dados brutos de um servidor do Ada Bot em CSV ou JSONL (gzip).")
+    parser.add_argument("guild_id")
+    parser.add_argument("tabela", choices=sorted(database.EXPORT_TABLES))
+    parser.add_argument("--formato", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--inicio", help="data inicial, DD/MM/AAAA")
+    parser.add_argument("--fim", help="data final, DD/MM/AAAA (inclusiva)")
+    parser.add_argument("--usuario", help="ID do usuário (ponto e reuniões) ou nome do responsável (tarefas)")
+    parser.add_argument("--saida", help="arquivo de saída; o padrão fica em EXPORT_DIR")
+    args = parser.parse_args()
+
+    since, until = parse_period(args.inicio, args.fim)
+    path, count = asyncio.run(export_table(args.guild_id, args.tabela, args.formato, since, until, args.usuario, args.saida))
+    print(f"✅ {count} linha(s) exportada(s) para {path}")
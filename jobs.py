@@ -0,0 +1,159 @@
+import asyncio
+import os
+import time
+import discord
+from metrics import counter, gauge
+from admission import AdmissionRejected, admission
+
+# Fila de trabalhos demorados (relatórios, backups) iniciados pelos comandos de barra.
+# Com a fila cheia, novos pedidos são recusados em vez de acumular sem limite.
+JOB_QUEUE_SIZE = int(os.getenv("ADA_JOB_QUEUE_SIZE", "50"))
+JOB_WORKERS = int(os.getenv("ADA_JOB_WORKERS", "2"))
+
+JOB_QUEUE_DEPTH = gauge("ada_job_queue_depth", "Trabalhos aguardando na fila.")
+JOBS_TOTAL = counter("ada_jobs_total", "Pedidos de trabalho por tipo e resultado (queued, deduplicated, rejected, ok, error).")
+
+class JobQueueFull(Exception):
+    pass
+
+class Job:
+    """
+    Um trabalho na fila. Pedidos idênticos do mesmo servidor feitos enquanto ele
+    não termina são anexados como ouvintes e recebem o mesmo resultado.
+    """
+
+    def __init__(self, key, description, func, cleanup=None):
+        self.key = key
+        self.guild_id = key[0]
+        self.kind = key[1]
+        self.description = description
+        self.func = func
+        self.cleanup = cleanup
+        self.listeners = []
+        self.status = "na fila"
+        self.progress = ""
+        self.created_at = time.monotonic()
+        self.started_at = None
+
+    def elapsed(self):
+        return time.monotonic() - (self.started_at or self.created_at)
+
+class JobQueue:
+    def __init__(self, max_size=JOB_QUEUE_SIZE, workers=JOB_WORKERS):
+        self.max_size = max_size
+        self.workers = workers
+        self.in_flight = {}
+        self._queue = None
+        self._tasks = []
+
+    def start(self):
+        self._queue = asyncio.Queue(self.max_size)
+        self._tasks = [asyncio.create_task(self._worker(), name=f"job_worker_{index}") for index in range(self.workers)]
+
+    def submit(self, key, description, func, listener, cleanup=None):
+        """
+        Enfileira func(job) com a chave (guild_id, tipo, *argumentos). Se já houver um trabalho
+        igual em andamento, só registra o ouvinte. listener(resultado, erro) é chamado ao final,
+        e cleanup(resultado), se informado, depois de todos os ouvintes.
+        Retorna (job, novo). Levanta JobQueueFull se a fila estiver cheia.
+        """
+        job = self.in_flight.get(key)
+        if job:
+            job.listeners.append(listener)
+            JOBS_TOTAL.inc(kind=job.kind, result="deduplicated")
+            return job, False
+
+        job = Job(key, description, func, cleanup)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            JOBS_TOTAL.inc(kind=job.kind, result="rejected")
+            raise JobQueueFull()
+        job.listeners.append(listener)
+        self.in_flight[key] = job
+        JOBS_TOTAL.inc(kind=job.kind, result="queued")
+        JOB_QUEUE_DEPTH.set(self._queue.qsize())
+        return job, True
+
+    def depth(self):
+        return self._queue.qsize() if self._queue else 0
+
+    def jobs(self, guild_id=None):
+        return [job for job in self.in_flight.values() if guild_id is None or job.guild_id == guild_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            JOB_QUEUE_DEPTH.set(self._queue.qsize())
+            job.status = "em andamento"
+            job.started_at = time.monotonic()
+            result = error = None
+            try:
+                result = await job.func(job)
+                JOBS_TOTAL.inc(kind=job.kind, result="ok")
+            except Exception as e:
+                error = e
+                JOBS_TOTAL.inc(kind=job.kind, result="error")
+                print(f"❌ Erro no trabalho {job.description}: {e}")
+            finally:
+                del self.in_flight[job.key]
+
+            try:
+                for listener in job.listeners:
+                    try:
+                        await listener(result, error)
+                    except Exception as e:
+                        print(f"❌ Erro ao entregar o resultado de {job.description}: {e}")
+                if job.cleanup and result is not None:
+                    try:
+                        job.cleanup(result)
+                    except Exception as e:
+                        print(f"❌ Erro ao limpar o resultado de {job.description}: {e}")
+            finally:
+                self._queue.task_done()
+
+job_queue = JobQueue()
+
+async def submit_job(interaction, key, description, func, deliver, cleanup=None):
+    """
+    Coloca um trabalho na fila em nome de um comando de barra já adiado (defer)
+    e entrega o resultado como mensagem de acompanhamento (followup).
+    O comando passa pelo controle de admissão como os de prefixo; a vaga de execução
+    fica ocupada até o trabalho terminar.
+    """
+    try:
+        cost_class = await admission.admit(str(interaction.guild_id), interaction.user.id, interaction.command.qualified_name)
+    except AdmissionRejected as e:
+        await interaction.followup.send(f"⚠️ {e}")
+        return
+
+    async def run(job):
+        try:
+            return await func(job)
+        finally:
+            admission.release(cost_class)
+
+    async def listener(result, error):
+        if error:
+            await interaction.followup.send(f"❌ Erro em {description}: {error}")
+        else:
+            await deliver(interaction, result)
+
+    try:
+        job, created = job_queue.submit(key, description, run, listener, cleanup)
+    except JobQueueFull:
+        admission.release(cost_class)
+        await interaction.followup.send("❌ Muitos trabalhos na fila agora. Tente de novo em alguns minutos.")
+        return
+    if not created:
+        # Pedido repetido: não cria trabalho novo, então a vaga é devolvida na hora.
+        admission.release(cost_class)
+        await interaction.followup.send(f"⏳ Já existe um pedido igual em andamento ({job.status}); você vai receber o mesmo resultado.")
+
+async def send_file_followup(interaction, filename):
+    with open(filename, 'rb') as f:
+        await interaction.followup.send(file=discord.File(f, os.path.basename(filename)))
+
+def remove_file(filename):
+    if os.path.exists(filename):
+        os.remove(filename)
@@ -0,0 +1,87 @@
+import asyncio
+import datetime
+import discord
+from database import BR_TZ, delete_board_message, get_board_message, get_task_board
+
+BOARD_COLUMNS = (
+    ("A Fazer", "📋"),
+    ("Em Andamento", "🚧"),
+    ("Atrasada", "🚨"),
+    ("Concluída", "✅"),
+)
+BOARD_TASKS_PER_COLUMN = 10
+
+# Alterações feitas dentro desta janela (em segundos) viram uma única edição do quadro.
+BOARD_DEBOUNCE = 5.0
+
+def render_board(counts, columns):
+    """
+    Monta o embed do quadro a partir das contagens por status e das primeiras tarefas de cada coluna.
+    """
+    embed = discord.Embed(title="📌 Quadro Kanban", color=discord.Color.teal())
+    for status, emoji in BOARD_COLUMNS:
+        tasks = columns.get(status, [])
+        lines = [
+            f"`#{task.id}` {task.title} — {task.assigned_to} ({task.due_date.strftime('%d/%m')})"
+            for task in tasks
+        ]
+        hidden = counts.get(status, 0) - len(tasks)
+        if hidden > 0:
+            lines.append(f"… e mais {hidden}")
+        value = "\n".join(lines) or "Nenhuma tarefa."
+        embed.add_field(name=f"{emoji} {status} ({counts.get(status, 0)})", value=value[:1024], inline=False)
+    embed.set_footer(text=f"Atualizado em {datetime.datetime.now(BR_TZ).strftime('%d/%m/%Y %H:%M')} · use >list_tarefas para ver todas")
+    return embed
+
+async def build_board(guild_id):
+    counts, columns = await get_task_board(guild_id, BOARD_TASKS_PER_COLUMN)
+    return render_board(counts, columns)
+
+class BoardUpdater:
+    """
+    Edita a mensagem do quadro de cada servidor depois que as tarefas mudam.
+    Os pedidos de um servidor dentro de BOARD_DEBOUNCE segundos são agrupados numa
+    só edição; um pedido que chega durante a edição gera mais uma ao final.
+    """
+
+    def __init__(self, bot, debounce=BOARD_DEBOUNCE):
+        self.bot = bot
+        self.debounce = debounce
+        self._pending = {}
+        self._dirty = set()
+
+    def schedule(self, guild_id):
+        guild_id = str(guild_id)
+        if guild_id in self._pending:
+            self._dirty.add(guild_id)
+            return
+        self._pending[guild_id] = asyncio.create_task(self._run(guild_id), name=f"kanban_{guild_id}")
+
+    async def _run(self, guild_id):
+        try:
+            while True:
+                await asyncio.sleep(self.debounce)
+                self._dirty.discard(guild_id)
+                await self.refresh(guild_id)
+                if guild_id not in self._dirty:
+                    break
+        except Exception as e:
+            print(f"❌ Erro ao atualizar o quadro Kanban de {guild_id}: {e}")
+        finally:
+            del self._pending[guild_id]
+            self._dirty.discard(guild_id)
+
+    async def refresh(self, guild_id):
+        """
+        Edita a mensagem do quadro no lugar, sem buscá-la antes. Se ela foi apagada, esquece o quadro.
+        """
+        location = await get_board_message(guild_id)
+        if not location:
+            return
+        channel_id, message_id = location
+        embed = await build_board(guild_id)
+        message = self.bot.get_partial_messageable(int(channel_id)).get_partial_message(int(message_id))
+        try:
+            await message.edit(content=None, embed=embed)
+        except discord.NotFound:
+            await delete_board_message(guild_id)
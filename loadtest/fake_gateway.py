@@ -0,0 +1,104 @@
+import asyncio
+import discord
+from discord.http import Route
+from benchmarks import synthetic
+from cogs import EXTENSIONS
+from loadtest.fake_http import message_payload, user_payload
+
+# Permissões do cargo @everyone nos servidores simulados (ver, enviar mensagens e anexar arquivos).
+EVERYONE_PERMISSIONS = str(discord.Permissions(view_channel=True, send_messages=True, attach_files=True, embed_links=True).value)
+
+def guild_payload(guild_index, members, bot_user):
+    """
+    Payload de GUILD_CREATE com membros, cargos e um canal de texto,
+    usando os mesmos IDs e nomes do gerador sintético.
+    """
+    guild_id = synthetic.guild_id_for(guild_index)
+    joined_at = discord.utils.utcnow().isoformat()
+    member_payloads = [
+        {
+            'user': user_payload(synthetic.member_id_for(guild_index, member_index), synthetic.member_name_for(guild_index, member_index)),
+            'roles': [],
+            'joined_at': joined_at,
+            'deaf': False,
+            'mute': False,
+            'flags': 0,
+        }
+        for member_index in range(members)
+    ]
+    member_payloads.append({'user': bot_user, 'roles': [], 'joined_at': joined_at, 'deaf': False, 'mute': False, 'flags': 0})
+    roles = [{
+        'id': str(guild_id), 'name': '@everyone', 'permissions': EVERYONE_PERMISSIONS,
+        'position': 0, 'color': 0, 'hoist': False, 'managed': False, 'mentionable': False,
+    }]
+    roles.extend(
+        {
+            'id': str(guild_id + role_index + 1), 'name': synthetic.role_name_for(guild_index, role_index), 'permissions': '0',
+            'position': role_index + 1, 'color': 0, 'hoist': False, 'managed': False, 'mentionable': True,
+        }
+        for role_index in range(3)
+    )
+    return {
+        'id': str(guild_id),
+        'name': f"Servidor {guild_index}",
+        'owner_id': member_payloads[0]['user']['id'],
+        'roles': roles,
+        'channels': [{'id': str(guild_id + 100), 'type': 0, 'name': 'geral', 'position': 0, 'permission_overwrites': []}],
+        'members': member_payloads,
+        'member_count': len(member_payloads),
+        'large': False,
+        'features': [],
+        'emojis': [],
+        'stickers': [],
+    }
+
+class FakeGateway:
+    """
+    Liga um commands.Bot real a uma sessão HTTP falsa e a um estado de gateway
+    montado localmente, sem conexão com o Discord. As mensagens sintéticas entram
+    por bot.process_commands, como se tivessem chegado pelo gateway.
+    """
+
+    def __init__(self, bot, session, guilds, members):
+        self.bot = bot
+        self.session = session
+        self.guild_count = guilds
+        self.member_count = members
+        self.guilds = []
+
+    async def connect(self):
+        """
+        Faz o "login" contra a sessão falsa e popula o cache com os servidores simulados,
+        no lugar do GUILD_CREATE que chegaria pelo gateway.
+        """
+        bot = self.bot
+        await bot._async_setup_hook()
+        # Os comandos vêm das extensões que o setup_hook do bot carregaria no login.
+        for extension in EXTENSIONS:
+            await bot.load_extension(extension)
+        bot.http._HTTPClient__session = self.session
+        bot.http._global_over = asyncio.Event()
+        bot.http._global_over.set()
+        bot.http.token = "loadtest"
+
+        state = bot._connection
+        state.user = discord.ClientUser(state=state, data=await bot.http.request(Route('GET', '/users/@me')))
+
+        for guild_index in range(self.guild_count):
+            guild = discord.Guild(data=guild_payload(guild_index, self.member_count, self.session.bot_user), state=state)
+            state._add_guild(guild)
+            self.guilds.append(guild)
+            for member in guild.members:
+                self.session.users[str(member.id)] = user_payload(member.id, member.name, member.bot)
+
+    def make_message(self, guild, member, content):
+        channel = guild.text_channels[0]
+        data = message_payload(channel.id, user_payload(member.id, member.name), content, guild.id)
+        data['member'] = {'roles': [role.id for role in member.roles[1:]], 'joined_at': discord.utils.utcnow().isoformat(), 'deaf': False, 'mute': False, 'flags': 0}
+        return discord.Message(state=self.bot._connection, channel=channel, data=data)
+
+    async def dispatch(self, guild, member, content):
+        """
+        Entrega uma mensagem ao bot como se viesse do gateway e espera o comando terminar.
+        """
+        await self.bot.process_commands(self.make_message(guild, member, content))
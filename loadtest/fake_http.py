@@ -0,0 +1,163 @@
+import asyncio
+import itertools
+import json
+import re
+import time
+import discord
+
+DISCORD_EPOCH_MS = 1420070400000
+
+_snowflakes = itertools.count(1)
+
+def next_snowflake():
+    """
+    Gera IDs crescentes no formato snowflake do Discord.
+    """
+    return str(((int(time.time() * 1000) - DISCORD_EPOCH_MS) << 22) | (next(_snowflakes) & 0x3FFFFF))
+
+def user_payload(user_id, name, bot=False):
+    return {
+        'id': str(user_id),
+        'username': name,
+        'global_name': name,
+        'discriminator': '0',
+        'avatar': None,
+        'bot': bot,
+    }
+
+def message_payload(channel_id, author, content='', guild_id=None, message_id=None):
+    """
+    Payload mínimo de mensagem aceito por discord.Message.
+    """
+    return {
+        'id': message_id or next_snowflake(),
+        'channel_id': str(channel_id),
+        'guild_id': str(guild_id) if guild_id else None,
+        'author': author,
+        'content': content,
+        'timestamp': discord.utils.utcnow().isoformat(),
+        'edited_timestamp': None,
+        'tts': False,
+        'mention_everyone': False,
+        'mentions': [],
+        'mention_roles': [],
+        'attachments': [],
+        'embeds': [],
+        'pinned': False,
+        'type': 0,
+        'flags': 0,
+    }
+
+class FakeResponse:
+    """
+    Resposta com a interface de aiohttp.ClientResponse usada por discord.http.
+    """
+
+    def __init__(self, method, url, status, data, headers):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.reason = "OK" if status < 400 else "Error"
+        self._text = json.dumps(data)
+        self.headers = {'content-type': 'application/json', **headers}
+
+    async def text(self, encoding='utf-8'):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class _FakeRequest:
+    def __init__(self, coro):
+        self._coro = coro
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeHTTPSession:
+    """
+    Substitui a sessão aiohttp do discord.py e responde às rotas usadas pelo bot
+    (enviar mensagem, buscar usuário) com latência configurável e limites por rota
+    no estilo do Discord: ao estourar o limite da janela, responde 429 com retry_after.
+    """
+
+    ROUTE_RE = re.compile(r"/api/v\d+(/(channels|users|guilds)/(\d+|@me))?(.*)$")
+
+    def __init__(self, latency=0.0, rate_limit=5, rate_window=5.0, bot_user=None):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.bot_user = bot_user or user_payload(1, "Ada", bot=True)
+        self.users = {}
+        self.windows = {}
+        self.requests = 0
+        self.rate_limited = 0
+        self.sent = []
+        self.edits = 0
+        self.closed = False
+
+    def request(self, method, url, **kwargs):
+        return _FakeRequest(self._handle(method, str(url), kwargs))
+
+    async def close(self):
+        self.closed = True
+
+    def _bucket(self, key):
+        now = time.monotonic()
+        window_start, count = self.windows.get(key, (now, 0))
+        if now - window_start >= self.rate_window:
+            window_start, count = now, 0
+        return window_start, count, now
+
+    async def _handle(self, method, url, kwargs):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        match = self.ROUTE_RE.search(url)
+        resource, major, rest = (match.group(2), match.group(3), match.group(4)) if match else (None, None, "")
+        key = f"{method} {resource}/{major}{rest}"
+
+        if self.rate_limit:
+            window_start, count, now = self._bucket(key)
+            reset_after = max(self.rate_window - (now - window_start), 0.001)
+            headers = {
+                'X-Ratelimit-Bucket': key,
+                'X-Ratelimit-Limit': str(self.rate_limit),
+                'X-Ratelimit-Reset-After': f"{reset_after:.3f}",
+            }
+            if count >= self.rate_limit:
+                self.rate_limited += 1
+                headers['X-Ratelimit-Remaining'] = '0'
+                headers['Via'] = '1.1 google'
+                return FakeResponse(method, url, 429, {'message': 'You are being rate limited.', 'retry_after': reset_after, 'global': False}, headers)
+            self.windows[key] = (window_start, count + 1)
+            headers['X-Ratelimit-Remaining'] = str(self.rate_limit - count - 1)
+        else:
+            headers = {}
+
+        if resource == "channels" and rest == "/messages" and method == "POST":
+            payload = kwargs.get('data')
+            content = ''
+            if isinstance(payload, (str, bytes)):
+                content = json.loads(payload).get('content') or ''
+            self.sent.append(content)
+            return FakeResponse(method, url, 200, message_payload(major, self.bot_user, content), headers)
+        if resource == "channels" and rest.startswith("/messages/") and method == "PATCH":
+            self.edits += 1
+            return FakeResponse(method, url, 200, message_payload(major, self.bot_user, message_id=rest.split("/")[2]), headers)
+        if resource == "users" and method == "GET":
+            if major == "@me":
+                return FakeResponse(method, url, 200, self.bot_user, headers)
+            user = self.users.get(major)
+            if user is None:
+                return FakeResponse(method, url, 404, {'message': 'Unknown User', 'code': 10013}, headers)
+            return FakeResponse(method, url, 200, user, headers)
+        return FakeResponse(method, url, 200, {}, headers)
@@ -0,0 +1,228 @@
+"""
+Teste de carga do Ada Bot, totalmente offline.
+
+Mensagens sintéticas entram por bot.process_commands, num commands.Bot real ligado
+a um gateway e a uma camada HTTP falsos (latência e respostas 429 configuráveis).
+O tráfego segue um roteiro: uma mistura ponderada de comandos disparada numa taxa
+alvo, mais tarefas de fundo (varredura de lembretes, relatórios) rodando ao mesmo tempo.
+Ao final, mostra p50/p99 por comando, vazão, tempo de banco e 429 recebidos.
+
+Uso (na raiz do repositório):
+    python -m loadtest.run
+    python -m loadtest.run --scenario pico_check_in --latency 0.05 --rate-limit 5
+    python -m loadtest.run --script meu_roteiro.json
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from benchmarks import synthetic
+
+# Roteiros: duração (s), taxa alvo (mensagens/s), servidores e usuários que geram tráfego,
+# mistura de comandos com pesos e tarefas de fundo iniciadas junto com a carga.
+SCENARIOS = {
+    'pico_check_in': {
+        'duration': 60,
+        'rate': 500 / 60,
+        'guilds': 1,
+        'users': 500,
+        'mix': {
+            '>check_in': 6,
+            '>check_out': 2,
+            '>check_in_reuniao': 1,
+            '>add_topico Tópico do teste de carga': 4,
+            '>list_tarefas': 1,
+        },
+        'background': ['check_reminders', '>gerar_relatorio todos', '>gerar_relatorio ponto'],
+    },
+    'misto': {
+        'duration': 30,
+        'rate': 20,
+        'guilds': 10,
+        'users': 50,
+        'mix': {
+            '>check_in': 3,
+            '>check_out': 3,
+            '>list_tarefas': 2,
+            '>list_ponto': 1,
+            '>list_reuniao': 1,
+            '>add_topico Tópico': 2,
+        },
+        'background': ['check_reminders'],
+    },
+}
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def histogram_delta(histogram, before):
+    """
+    Soma, em todas as séries, o que o histograma registrou desde o snapshot `before`.
+    Retorna (contagens por bucket, soma, contagem).
+    """
+    counts = [0] * (len(histogram.buckets) + 1)
+    total = 0.0
+    count = 0
+    for key, (series_counts, series_total, series_count) in histogram.series.items():
+        old_counts, old_total, old_count = before.get(key, ([0] * len(counts), 0.0, 0))
+        for index, value in enumerate(series_counts):
+            counts[index] += value - old_counts[index]
+        total += series_total - old_total
+        count += series_count - old_count
+    return counts, total, count
+
+def snapshot(histogram):
+    return {key: (list(counts), total, count) for key, (counts, total, count) in histogram.series.items()}
+
+async def prepare(scale):
+    """
+    Cria e preenche o banco sintético. Roda num asyncio.run só seu, antes do da carga, como
+    o bot.py faz com o init_db antes do bot.run: o que ficar preso ao event loop da
+    inicialização (um pool de conexões, por exemplo) aparece como erro durante a carga.
+    """
+    import database
+    await synthetic.populate(database, **synthetic.SCALES[scale])
+
+async def run(scenario, scale, latency, rate_limit, rate_window, seed, background_timeout):
+    rng = random.Random(seed)
+    params = synthetic.SCALES[scale]
+
+    import database
+    import metrics
+    import bot as bot_module
+    from loadtest.fake_gateway import FakeGateway
+    from loadtest.fake_http import FakeHTTPSession
+
+    session = FakeHTTPSession(latency=latency, rate_limit=rate_limit, rate_window=rate_window)
+    guild_count = max(params['guilds'], scenario['guilds'])
+    member_count = max(params['members'], -(-scenario['users'] // scenario['guilds']))
+    gateway = FakeGateway(bot_module.bot, session, guild_count, member_count)
+    await gateway.connect()
+
+    traffic_guilds = gateway.guilds[:scenario['guilds']]
+    users = [
+        (guild, member)
+        for guild in traffic_guilds
+        for member in [m for m in guild.members if not m.bot][:-(-scenario['users'] // len(traffic_guilds))]
+    ][:scenario['users']]
+
+    commands_mix = list(scenario['mix'])
+    weights = [scenario['mix'][command] for command in commands_mix]
+    latencies = {}
+    errors = {}
+    db_before = snapshot(metrics.DB_LATENCY)
+
+    async def timed_dispatch(guild, member, content):
+        name = content.split()[0]
+        start = time.perf_counter()
+        try:
+            await gateway.dispatch(guild, member, content)
+        except Exception:
+            errors[name] = errors.get(name, 0) + 1
+        latencies.setdefault(name, []).append(time.perf_counter() - start)
+
+    async def background(item):
+        start = time.perf_counter()
+        if item == 'check_reminders':
+            await bot_module.bot.get_cog("Reminders").sweep_reminders()
+        else:
+            guild, member = users[0]
+            await gateway.dispatch(guild, member, item)
+        latencies.setdefault(f"[fundo] {item}", []).append(time.perf_counter() - start)
+
+    total = int(scenario['duration'] * scenario['rate'])
+    print(f"Disparando {total} mensagens em {scenario['duration']}s ({scenario['rate']:.1f}/s) para {len(users)} usuários...")
+
+    started = time.perf_counter()
+    background_tasks = [asyncio.create_task(background(item), name=item) for item in scenario.get('background', [])]
+    pending = []
+    for index in range(total):
+        delay = started + index / scenario['rate'] - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        guild, member = rng.choice(users)
+        pending.append(asyncio.create_task(timed_dispatch(guild, member, rng.choices(commands_mix, weights)[0])))
+    await asyncio.gather(*pending)
+    elapsed = time.perf_counter() - started
+    # Com o limite de requisições ligado, a varredura pode ficar esperando os 429 falsos
+    # por muito tempo; o que não terminar no prazo é cancelado e relatado.
+    unfinished = []
+    if background_tasks:
+        _, not_done = await asyncio.wait(background_tasks, timeout=background_timeout)
+        unfinished = sorted(task.get_name() for task in not_done)
+        for task in not_done:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+
+    db_counts, db_total, db_count = histogram_delta(metrics.DB_LATENCY, db_before)
+    db_histogram = metrics.Histogram("db", "")
+    db_histogram.series[()] = [db_counts, db_total, db_count]
+
+    print(f"\n{'comando':<40} {'n':>6} {'p50':>10} {'p99':>10} {'erros':>6}")
+    for name, values in sorted(latencies.items()):
+        print(f"{name:<40} {len(values):>6} {percentile(values, 0.5) * 1000:>8.1f}ms {percentile(values, 0.99) * 1000:>8.1f}ms {errors.get(name, 0):>6}")
+
+    completed = sum(len(values) for name, values in latencies.items() if not name.startswith("[fundo]"))
+    print(f"\nVazão: {completed / elapsed:.1f} comandos/s em {elapsed:.1f}s (sem contar as tarefas de fundo)")
+    if unfinished:
+        print(f"⚠️ Tarefas de fundo canceladas após {background_timeout:.0f}s do fim da carga: {', '.join(unfinished)}")
+    if db_count:
+        print(
+            f"Banco (inclui espera por lock): {db_count} chamadas, "
+            f"p50 {db_histogram.quantile(0.5) * 1000:.1f}ms, p99 {db_histogram.quantile(0.99) * 1000:.1f}ms, "
+            f"total {db_total:.1f}s"
+        )
+    print(f"HTTP: {session.requests} requisições, {session.rate_limited} respostas 429")
+    failures = [content for content in session.sent if content.startswith("❌")]
+    locked = sum("database is locked" in content for content in failures)
+    print(f"Respostas de erro: {len(failures)} (\"database is locked\": {locked})")
+    for content, count in collections.Counter(failures).most_common(5):
+        print(f"  {count:>5}x {content[:100]}")
+
+    await synthetic.drop_backend(database)
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga offline do Ada Bot.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="pico_check_in")
+    parser.add_argument("--script", help="roteiro em JSON, com as mesmas chaves dos cenários embutidos")
+    parser.add_argument("--scale", choices=sorted(synthetic.SCALES), default="small", help="tamanho do banco sintético inicial")
+    parser.add_argument("--backend", choices=synthetic.BACKENDS, default="sqlite", help="backend de armazenamento")
+    parser.add_argument("--duration", type=float, help="sobrescreve a duração do roteiro, em segundos")
+    parser.add_argument("--latency", type=float, default=0.05, help="latência simulada de cada requisição HTTP, em segundos")
+    parser.add_argument("--rate-limit", type=int, default=5, help="requisições por janela em cada rota antes do 429 (0 desativa)")
+    parser.add_argument("--rate-window", type=float, default=5.0, help="tamanho da janela do limite, em segundos")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--background-timeout", type=float, default=60.0, help="segundos que as tarefas de fundo têm, depois do fim da carga, para terminar")
+    args = parser.parse_args()
+
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            scenario = json.load(f)
+    else:
+        scenario = dict(SCENARIOS[args.scenario])
+    if args.duration:
+        scenario['duration'] = args.duration
+
+    os.environ.setdefault("ADA_METRICS_PORT", "0")
+    os.environ.setdefault("ADA_BACKUP_INTERVAL_HOURS", "0")
+    synthetic.use_backend(args.backend)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    workdir = tempfile.mkdtemp(prefix="ada-load-")
+    os.chdir(workdir)
+    try:
+        asyncio.run(prepare(args.scale))
+        asyncio.run(run(scenario, args.scale, args.latency, args.rate_limit, args.rate_window, args.seed, args.background_timeout))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import asyncio
+import contextlib
+import os
+import sys
+import threading
+import time
+import traceback
+import metrics
+
+# Intervalo entre as medições de atraso do event loop e limite (em segundos)
+# a partir do qual um bloqueio é registrado com a pilha do código que o causou.
+WATCHDOG_INTERVAL = 0.25
+WATCHDOG_THRESHOLD = float(os.getenv("ADA_LOOP_LAG_THRESHOLD", "1.0"))
+
+LOOP_LAG = metrics.gauge("ada_event_loop_lag_seconds", "Último atraso medido no agendamento do event loop.")
+LOOP_LAG_HISTOGRAM = metrics.histogram("ada_event_loop_lag_distribution_seconds", "Distribuição do atraso do event loop.")
+LOOP_STALLS = metrics.counter("ada_event_loop_stalls_total", "Bloqueios do event loop acima do limite, por atividade.")
+
+# Atividade (comando ou loop) em execução em cada task do event loop.
+_activities = {}
+
+def begin_activity(label):
+    """
+    Associa a task atual a uma atividade, para identificar quem bloqueou o event loop.
+    """
+    task = asyncio.current_task()
+    if task is not None:
+        _activities[task] = label
+
+def end_activity():
+    """
+    Remove a associação feita por begin_activity na task atual.
+    """
+    _activities.pop(asyncio.current_task(), None)
+
+@contextlib.contextmanager
+def activity(label):
+    """
+    Marca o bloco como a atividade indicada. Uso: with activity("check_reminders"): ...
+    """
+    begin_activity(label)
+    try:
+        yield
+    finally:
+        end_activity()
+
+class LoopWatchdog:
+    """
+    Mede continuamente o atraso do event loop. Uma thread separada acompanha os
+    batimentos do loop e, quando ele fica parado além do limite, registra a pilha
+    da thread do loop e a atividade da task que estava executando.
+    """
+
+    def __init__(self, interval=WATCHDOG_INTERVAL, threshold=WATCHDOG_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self._loop = None
+        self._loop_thread_id = None
+        self._heartbeat = time.monotonic()
+        self._reported_heartbeat = None
+        self._stopped = threading.Event()
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        thread = threading.Thread(target=self._monitor, name="ada-loop-watchdog", daemon=True)
+        thread.start()
+        try:
+            while True:
+                expected = self._loop.time() + self.interval
+                self._heartbeat = time.monotonic()
+                await asyncio.sleep(self.interval)
+                lag = max(0.0, self._loop.time() - expected)
+                LOOP_LAG.set(lag)
+                LOOP_LAG_HISTOGRAM.observe(lag)
+        finally:
+            self._stopped.set()
+
+    def _monitor(self):
+        while not self._stopped.wait(self.interval / 2):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled > self.threshold and heartbeat != self._reported_heartbeat:
+                self._reported_heartbeat = heartbeat
+                self._report(stalled)
+
+    def _report(self, stalled):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        task = asyncio.current_task(self._loop)
+        label = _activities.get(task) or (task.get_name() if task else "callback fora de task")
+        LOOP_STALLS.inc(activity=label)
+        stack = "".join(traceback.format_stack(frame)) if frame else "(pilha indisponível)\n"
+        print(f"⚠️ Event loop bloqueado há {stalled:.2f}s durante '{label}':\n{stack}", end="")
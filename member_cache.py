@@ -0,0 +1,159 @@
+import asyncio
+import collections
+import os
+import time
+import discord
+
+# Modo de memória enxuta: o discord.py não baixa a lista de membros ao conectar
+# nem guarda membros em cache; os membros que os comandos realmente usam ficam
+# num LRU limitado e os que faltam são buscados em lote quando necessário.
+LEAN_MEMBERS = os.getenv("ADA_LEAN_MEMBERS", "0") == "1"
+MEMBER_CACHE_SIZE = int(os.getenv("ADA_MEMBER_CACHE_SIZE", "10000"))
+MEMBER_CACHE_TTL = 600
+
+# O gateway aceita até 100 IDs por pedido de membros.
+QUERY_BATCH_SIZE = 100
+QUERY_TIMEOUT = 10.0
+
+def configure(options):
+    """
+    Ajusta as opções do bot (intents, chunking e cache de membros) conforme o modo.
+    """
+    if LEAN_MEMBERS:
+        options['chunk_guilds_at_startup'] = False
+        options['member_cache_flags'] = discord.MemberCacheFlags.none()
+    return options
+
+class MemberCache:
+    """
+    LRU de membros por (servidor, ID) e por (servidor, apelido), com validade de
+    MEMBER_CACHE_TTL segundos. Guarda também as buscas sem resultado, para não
+    repetir a consulta a cada comando.
+    """
+
+    def __init__(self, max_size=MEMBER_CACHE_SIZE, ttl=MEMBER_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+
+    def get(self, key):
+        value, stored_at = self._entries[key]
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            raise KeyError(key)
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def forget(self, guild_id, *keys):
+        """
+        Remove do cache as entradas do servidor com os IDs ou apelidos informados.
+        """
+        for key in keys:
+            self._entries.pop((guild_id, key), None)
+
+    def __len__(self):
+        return len(self._entries)
+
+members_lru = MemberCache()
+
+async def _query_by_ids(guild, user_ids):
+    """
+    Busca membros pelo gateway em lotes de 100 IDs; se o gateway não responder,
+    cai para a API REST, um membro por vez.
+    """
+    found = {}
+    for start in range(0, len(user_ids), QUERY_BATCH_SIZE):
+        chunk = user_ids[start:start + QUERY_BATCH_SIZE]
+        try:
+            members = await asyncio.wait_for(
+                guild.query_members(user_ids=chunk, limit=len(chunk), cache=False),
+                QUERY_TIMEOUT
+            )
+            found.update((member.id, member) for member in members)
+        except (asyncio.TimeoutError, discord.ClientException):
+            for user_id in chunk:
+                try:
+                    found[user_id] = await guild.fetch_member(user_id)
+                except discord.NotFound:
+                    pass
+    return found
+
+async def get_members(guild, user_ids):
+    """
+    Retorna {user_id: Member ou None} para os IDs informados, usando o cache do
+    discord.py, depois o LRU e, para os que faltarem, uma única busca em lote.
+    """
+    result = {}
+    missing = []
+    for user_id in dict.fromkeys(int(user_id) for user_id in user_ids):
+        member = guild.get_member(user_id)
+        if member is not None:
+            result[user_id] = member
+            continue
+        try:
+            result[user_id] = members_lru.get((guild.id, user_id))
+        except KeyError:
+            missing.append(user_id)
+
+    # Fora do modo enxuto o cache do discord.py tem todos os membros: quem não está nele saiu do servidor.
+    if missing and LEAN_MEMBERS:
+        found = await _query_by_ids(guild, missing)
+        for user_id in missing:
+            result[user_id] = found.get(user_id)
+            members_lru.put((guild.id, user_id), result[user_id])
+    else:
+        result.update(dict.fromkeys(missing))
+    return result
+
+async def get_member_by_name(guild, display_name):
+    """
+    Encontra um membro pelo apelido exibido, como discord.utils.get(guild.members, display_name=...),
+    sem exigir a lista completa de membros em memória.
+    """
+    member = discord.utils.get(guild.members, display_name=display_name)
+    if member is not None or not LEAN_MEMBERS:
+        return member
+    try:
+        return members_lru.get((guild.id, display_name))
+    except KeyError:
+        pass
+
+    try:
+        candidates = await asyncio.wait_for(guild.query_members(query=display_name, limit=100, cache=False), QUERY_TIMEOUT)
+    except (asyncio.TimeoutError, discord.ClientException):
+        return None
+    member = discord.utils.get(candidates, display_name=display_name)
+    members_lru.put((guild.id, display_name), member)
+    if member is not None:
+        members_lru.put((guild.id, member.id), member)
+    return member
+
+async def member_names(bot, guild, user_ids):
+    """
+    Retorna {user_id: nome exibido ou None}. Quem não está mais no servidor
+    é buscado como usuário pela API REST.
+    """
+    names = {}
+    members = await get_members(guild, user_ids) if guild is not None else dict.fromkeys(int(user_id) for user_id in user_ids)
+    for user_id, member in members.items():
+        if member is not None:
+            names[user_id] = member.display_name
+            continue
+        try:
+            names[user_id] = members_lru.get((None, user_id))
+            continue
+        except KeyError:
+            pass
+        try:
+            user = await bot.fetch_user(user_id)
+            names[user_id] = user.display_name if user else None
+        except (discord.NotFound, discord.HTTPException):
+            names[user_id] = None
+        members_lru.put((None, user_id), names[user_id])
+    return names
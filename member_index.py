@@ -0,0 +1,242 @@
+import bisect
+import re
+import discord
+from discord.ext import commands
+from member_cache import LEAN_MEMBERS, get_member_by_name, get_members
+
+MENTION_RE = re.compile(r"<@(!|&)?([0-9]{15,20})>$")
+ID_RE = re.compile(r"([0-9]{15,20})$")
+
+MEMBER = "member"
+ROLE = "role"
+
+def _member_names(member):
+    return tuple(dict.fromkeys(name for name in (member.name, member.global_name, member.nick) if name))
+
+class GuildIndex:
+    """
+    Índice de membros e cargos de um servidor para resolver argumentos de comandos sem
+    percorrer a lista do servidor: IDs e nomes exatos num dicionário (O(1)) e os nomes em
+    minúsculas numa lista ordenada, para buscar prefixos por bisseção (O(log n)).
+    Para membros, os nomes indexados são o nome de usuário, o nome global e o apelido.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.names = {}
+        self.exact = {}
+        self.sorted_names = []
+
+    def _register(self, kind, obj):
+        """
+        Indexa o objeto nos dicionários e retorna as suas entradas para sorted_names.
+        """
+        key = (kind, obj.id)
+        names = _member_names(obj) if kind == MEMBER else (obj.name,)
+        self.objects[key] = obj
+        self.names[key] = names
+        for name in names:
+            self.exact.setdefault((kind, name), {})[obj.id] = obj
+        return [(name.casefold(), kind, obj.id) for name in names]
+
+    def add(self, kind, obj):
+        self.remove(kind, obj.id)
+        for entry in self._register(kind, obj):
+            bisect.insort(self.sorted_names, entry)
+
+    def add_all(self, kind, objects):
+        """
+        Indexa vários objetos de uma vez, ordenando sorted_names uma única vez no final:
+        montar o índice de um servidor grande com uma inserção ordenada por nome seria O(n²).
+        """
+        objects = {obj.id: obj for obj in objects}
+        for object_id in objects:
+            self.remove(kind, object_id)
+        for obj in objects.values():
+            self.sorted_names.extend(self._register(kind, obj))
+        self.sorted_names.sort()
+
+    def remove(self, kind, object_id):
+        key = (kind, object_id)
+        if key not in self.objects:
+            return
+        del self.objects[key]
+        for name in self.names.pop(key):
+            same_name = self.exact[(kind, name)]
+            del same_name[object_id]
+            if not same_name:
+                del self.exact[(kind, name)]
+            entry = (name.casefold(), kind, object_id)
+            position = bisect.bisect_left(self.sorted_names, entry)
+            if position < len(self.sorted_names) and self.sorted_names[position] == entry:
+                del self.sorted_names[position]
+
+    def get(self, kind, object_id):
+        return self.objects.get((kind, object_id))
+
+    def by_name(self, kind, name):
+        """
+        Primeiro objeto com o nome exato (diferenciando maiúsculas), ou None.
+        """
+        same_name = self.exact.get((kind, name))
+        return next(iter(same_name.values())) if same_name else None
+
+    def by_prefix(self, kind, prefix):
+        """
+        Objeto cujo nome, sem diferenciar maiúsculas, é igual ao texto ou começa com ele.
+        Um nome igual ao texto tem prioridade; entre prefixos, só retorna se houver um único objeto.
+        """
+        prefix = prefix.casefold()
+        position = bisect.bisect_left(self.sorted_names, (prefix,))
+        found = None
+        while position < len(self.sorted_names):
+            name, entry_kind, object_id = self.sorted_names[position]
+            if not name.startswith(prefix):
+                break
+            position += 1
+            if entry_kind != kind:
+                continue
+            if name == prefix:
+                return self.objects[(kind, object_id)]
+            if found is not None and found != object_id:
+                return None
+            found = object_id
+        return self.objects[(kind, found)] if found is not None else None
+
+class ResolutionIndex:
+    """
+    Índices por servidor, montados na primeira consulta e mantidos pelos eventos do
+    gateway (entrada, saída e atualização de membros; criação, edição e remoção de cargos).
+    """
+
+    def __init__(self):
+        self._guilds = {}
+
+    def for_guild(self, guild):
+        index = self._guilds.get(guild.id)
+        if index is None:
+            index = self._guilds[guild.id] = GuildIndex()
+            index.add_all(ROLE, guild.roles)
+            index.add_all(MEMBER, guild.members)
+        return index
+
+    def _loaded(self, guild_id):
+        return self._guilds.get(guild_id)
+
+    def member_updated(self, member):
+        index = self._loaded(member.guild.id)
+        if index is not None:
+            index.add(MEMBER, member)
+
+    def member_removed(self, guild_id, user_id):
+        index = self._loaded(guild_id)
+        if index is not None:
+            index.remove(MEMBER, user_id)
+
+    def user_updated(self, user):
+        """
+        Nome de usuário ou nome global alterado: reindexa o membro em cada servidor carregado.
+        """
+        for index in self._guilds.values():
+            member = index.get(MEMBER, user.id)
+            if member is not None:
+                index.add(MEMBER, member)
+
+    def role_updated(self, role):
+        index = self._loaded(role.guild.id)
+        if index is not None:
+            index.add(ROLE, role)
+
+    def role_removed(self, role):
+        index = self._loaded(role.guild.id)
+        if index is not None:
+            index.remove(ROLE, role.id)
+
+    def forget_guild(self, guild_id):
+        self._guilds.pop(guild_id, None)
+
+resolution_index = ResolutionIndex()
+
+async def _fetch_member(guild, object_id=None, name=None):
+    """
+    No modo de memória enxuta o índice só tem os membros em cache: os demais são
+    buscados pelo gateway (com o LRU de member_cache).
+    """
+    if not LEAN_MEMBERS:
+        return None
+    if object_id is not None:
+        return (await get_members(guild, [object_id]))[object_id]
+    return await get_member_by_name(guild, name)
+
+async def resolve(guild, argument, kinds=(ROLE, MEMBER), prefix=True):
+    """
+    Resolve o argumento de um comando para um membro ou cargo do servidor, na ordem de
+    kinds: menção, ID, nome exato (com ou sem "@") e, se prefix, início do nome sem
+    diferenciar maiúsculas. Retorna o discord.Member/discord.Role ou None.
+    """
+    argument = argument.strip()
+    index = resolution_index.for_guild(guild)
+
+    mention = MENTION_RE.match(argument)
+    raw_id = ID_RE.match(argument)
+    if mention or raw_id:
+        if mention:
+            object_id = int(mention.group(2))
+            id_kinds = (ROLE,) if mention.group(1) == "&" else (MEMBER,)
+        else:
+            object_id = int(raw_id.group(1))
+            id_kinds = kinds
+        for kind in kinds:
+            if kind not in id_kinds:
+                continue
+            found = index.get(kind, object_id)
+            if found is None and kind == MEMBER:
+                found = await _fetch_member(guild, object_id=object_id)
+            if found is not None:
+                return found
+        return None
+
+    names = dict.fromkeys((argument, argument.lstrip("@")))
+    for kind in kinds:
+        for name in names:
+            found = index.by_name(kind, name)
+            if found is not None:
+                return found
+    if prefix:
+        for kind in kinds:
+            for name in names:
+                found = index.by_prefix(kind, name) if name else None
+                if found is not None:
+                    return found
+    if MEMBER in kinds:
+        return await _fetch_member(guild, name=argument.lstrip("@"))
+    return None
+
+async def resolve_assignee(guild, assigned_to):
+    """
+    Encontra o responsável gravado numa tarefa (veja assignee_name): o cargo, se o nome
+    começar com "@", ou o membro com esse nome exato.
+    """
+    if assigned_to.startswith("@"):
+        role = resolution_index.for_guild(guild).by_name(ROLE, assigned_to[1:])
+        if role is not None:
+            return role
+    return await resolve(guild, assigned_to, kinds=(MEMBER,), prefix=False)
+
+def assignee_name(destiny):
+    """
+    Nome gravado como responsável pela tarefa: o apelido exibido do membro ou "@cargo".
+    """
+    return f"@{destiny.name}" if isinstance(destiny, discord.Role) else destiny.display_name
+
+class IndexedMember(commands.Converter):
+    """
+    Conversor de argumentos de comando para discord.Member que usa o índice em vez
+    do MemberConverter. Levanta commands.MemberNotFound, como ele.
+    """
+
+    async def convert(self, ctx, argument):
+        member = await resolve(ctx.guild, argument, kinds=(MEMBER,))
+        if member is None:
+            raise commands.MemberNotFound(argument)
+        return member
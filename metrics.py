@@ -0,0 +1,190 @@
+import bisect
+import contextlib
+import functools
+import os
+import time
+from aiohttp import web
+
+# Porta local onde as métricas são expostas no formato texto do Prometheus (0 desativa).
+METRICS_PORT = int(os.getenv("ADA_METRICS_PORT", "9108"))
+METRICS_HOST = os.getenv("ADA_METRICS_HOST", "127.0.0.1")
+
+# Limites (em segundos) dos buckets dos histogramas de latência.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class Histogram:
+    """
+    Histograma cumulativo no estilo Prometheus, com uma série por combinação de labels.
+    """
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def quantile(self, q, **labels):
+        """
+        Estima o quantil q (0 a 1) interpolando dentro do bucket, como o histogram_quantile do Prometheus.
+        """
+        series = self.series.get(tuple(sorted(labels.items())))
+        if not series or not series[2]:
+            return None
+        rank = q * series[2]
+        seen = 0
+        for index, count in enumerate(series[0]):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def samples(self):
+        for key, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", key + (("le", "+Inf" if bound == float("inf") else repr(bound)),), cumulative
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, count
+
+class Counter:
+    """
+    Contador monotônico, com uma série por combinação de labels.
+    """
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.series = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        self.series[key] = self.series.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in self.series.items():
+            yield self.name, key, value
+
+class Gauge(Counter):
+    """
+    Valor instantâneo, que pode subir e descer.
+    """
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self.series[tuple(sorted(labels.items()))] = value
+
+REGISTRY = {}
+
+def histogram(name, help_text, buckets=LATENCY_BUCKETS):
+    return REGISTRY.setdefault(name, Histogram(name, help_text, buckets))
+
+def counter(name, help_text):
+    return REGISTRY.setdefault(name, Counter(name, help_text))
+
+def gauge(name, help_text):
+    return REGISTRY.setdefault(name, Gauge(name, help_text))
+
+COMMAND_LATENCY = histogram("ada_command_seconds", "Latência dos comandos do bot.")
+DB_LATENCY = histogram("ada_db_query_seconds", "Latência das funções de database.py.")
+REPORT_PHASE_LATENCY = histogram("ada_report_phase_seconds", "Latência de cada fase do relatório PDF.")
+REMINDER_SWEEP_LATENCY = histogram("ada_reminder_sweep_seconds", "Duração de cada varredura de lembretes.")
+STARTUP_TIME = gauge("ada_startup_seconds", "Tempo desde o início do processo até cada etapa (schema, ready, first_command).")
+
+@contextlib.contextmanager
+def timer(metric, **labels):
+    """
+    Mede o tempo do bloco e registra no histograma informado.
+    Uso: with timer(DB_LATENCY, function="get_tasks"): ...
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric.observe(time.perf_counter() - start, **labels)
+
+class PhaseTimer:
+    """
+    Acumula o tempo de fases que se repetem ao longo de uma operação
+    (por exemplo, várias consultas em um relatório) e registra cada fase uma única vez.
+    """
+
+    def __init__(self, metric, **labels):
+        self.metric = metric
+        self.labels = labels
+        self.totals = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - start
+
+    def observe(self):
+        for name, total in self.totals.items():
+            self.metric.observe(total, phase=name, **self.labels)
+
+def instrument(metric):
+    """
+    Decorador que registra a latência de uma função assíncrona no histograma,
+    com o nome da função no label "function".
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with timer(metric, function=func.__name__):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _format_labels(key):
+    if not key:
+        return ""
+    escaped = (
+        f'{name}="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in key
+    )
+    return "{" + ",".join(escaped) + "}"
+
+def render_prometheus():
+    """
+    Gera o texto de exposição do Prometheus com todas as métricas registradas.
+    """
+    lines = []
+    for metric in REGISTRY.values():
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for sample_name, key, value in metric.samples():
+            lines.append(f"{sample_name}{_format_labels(key)} {value}")
+    return "\n".join(lines) + "\n"
+
+async def _handle_metrics(request):
+    return web.Response(text=render_prometheus(), content_type="text/plain", charset="utf-8")
+
+async def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    """
+    Inicia o servidor HTTP local que responde em /metrics. Retorna o runner, ou None se desativado.
+    """
+    if not port:
+        return None
+    app = web.Application()
+    app.router.add_get("/metrics", _handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
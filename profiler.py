@@ -0,0 +1,154 @@
+import asyncio
+import collections
+import cProfile
+import datetime
+import os
+import sys
+import threading
+import discord
+
+# Perfil sob demanda (>perfil): um administrador arma a captura das próximas N execuções
+# de um comando, ou da próxima varredura de lembretes, no seu servidor. Sem nada armado,
+# o custo por comando é só a verificação de um dicionário vazio.
+PROFILE_DIR = os.getenv("ADA_PROFILE_DIR", "profiles")
+PROFILE_MAX_RUNS = 20
+SAMPLE_INTERVAL = 0.005
+SWEEP_TARGET = "check_reminders"
+
+# "amostras": amostragem de pilhas só da tarefa do comando, em formato de pilhas colapsadas
+# (flamegraph.pl, speedscope); "pstats": cProfile, que também mede o que rodar em paralelo no event loop.
+PROFILE_MODES = ("amostras", "pstats")
+
+class ProfileSession:
+    """
+    Uma captura armada: acumula as N execuções num único resultado.
+    """
+
+    def __init__(self, guild_id, target, runs, mode, channel_id):
+        self.guild_id = guild_id
+        self.target = target
+        self.runs = runs
+        self.remaining = runs
+        self.mode = mode
+        self.channel_id = channel_id
+        self.profile = cProfile.Profile() if mode == "pstats" else None
+        self.stacks = collections.Counter()
+
+class Capture:
+    """
+    Uma execução em andamento de uma sessão.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.session.profile is not None:
+            self.session.profile.enable()
+            return
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample, args=(loop, task, thread_id), daemon=True, name="ada-profiler")
+        self._thread.start()
+
+    def stop(self):
+        if self.session.profile is not None:
+            self.session.profile.disable()
+            return
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self, loop, task, thread_id):
+        """
+        Registra a pilha da thread do event loop só quando ela está executando a tarefa perfilada.
+        """
+        stacks = self.session.stacks
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            if asyncio.current_task(loop) is not task:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            stacks[";".join(reversed(names))] += 1
+
+class Profiler:
+    def __init__(self):
+        self.armed = {}
+        self._active = None
+
+    def arm(self, guild_id, target, runs, mode, channel_id):
+        self.armed[(guild_id, target)] = ProfileSession(guild_id, target, runs, mode, channel_id)
+
+    def armed_guilds(self, target):
+        return {guild_id for guild_id, armed_target in self.armed if armed_target == target}
+
+    def start(self, guild_id, target):
+        """
+        Inicia a captura se houver uma sessão armada para o alvo no servidor.
+        Só uma captura roda por vez; se outra estiver ativa, esta execução não é contada.
+        """
+        if not self.armed:
+            return None
+        session = self.armed.get((guild_id, target))
+        if session is None or self._active is not None:
+            return None
+        self._active = Capture(session)
+        self._active.start()
+        return self._active
+
+    def stop(self, capture):
+        """
+        Encerra a captura. Na última execução da sessão, grava o resultado e
+        retorna (sessão, caminho do arquivo); senão, retorna None.
+        """
+        if capture is None:
+            return None
+        capture.stop()
+        self._active = None
+        session = capture.session
+        session.remaining -= 1
+        if session.remaining > 0:
+            return None
+        self.armed.pop((session.guild_id, session.target), None)
+        return session, write_result(session)
+
+def write_result(session):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    base = os.path.join(PROFILE_DIR, f"perfil_{session.target}_{session.guild_id}_{stamp}")
+    if session.profile is not None:
+        path = f"{base}.pstats"
+        session.profile.dump_stats(path)
+    else:
+        path = f"{base}.folded"
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in session.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+    return path
+
+async def send_profile(bot, result):
+    """
+    Envia o arquivo de uma sessão de perfil concluída ao canal em que ela foi armada.
+    """
+    if result is None:
+        return
+    session, filename = result
+    try:
+        channel = bot.get_partial_messageable(session.channel_id)
+        with open(filename, 'rb') as f:
+            await channel.send(
+                f"🔬 Perfil de `{session.target}` concluído ({session.runs} execução(ões), modo {session.mode}).",
+                file=discord.File(f, os.path.basename(filename))
+            )
+    except Exception as e:
+        print(f"❌ Erro ao enviar o perfil de {session.target}: {e}")
+    finally:
+        os.remove(filename)
+
+profiler = Profiler()
@@ -0,0 +1,114 @@
+"""
+Processo dedicado aos lembretes de tarefas, separado do processo que atende os comandos.
+
+Não se conecta ao gateway: lê as tarefas do banco, usa o diretório de canais e menções
+publicado pelo bot (ADA_REMINDER_MODE=worker) e envia as mensagens só pela API REST.
+Vários workers podem ficar de prontidão; a eleição de líder pelo banco garante que
+apenas um faça a varredura, e outro assume se o líder parar.
+
+Uso:
+    ADA_REMINDER_MODE=worker python bot.py
+    python reminder_worker.py
+    python reminder_worker.py --shard 3    (modo hash: só os servidores do shard 3)
+    python reminder_worker.py --gateway-shards 0-3 --gateway-shard-count 8
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import discord
+from dotenv import load_dotenv
+import database
+from database import acquire_lease, get_reminder_directory, release_lease
+from metrics import REMINDER_SWEEP_LATENCY, start_metrics_server, timer
+from reminders import LEASE_TTL, SCHEDULER_ID, SWEEP_INTERVAL, deliver_outbox, lease_name, outbox_nonce, run_sweep
+from sharding import parse_shard_ids, shard_id_for
+
+load_dotenv()
+
+TOKEN = os.getenv("DISCORD_TOKEN")
+
+# Porta das métricas do worker, diferente da do bot para os dois rodarem na mesma máquina (0 desativa).
+WORKER_METRICS_PORT = int(os.getenv("ADA_WORKER_METRICS_PORT", "9109"))
+
+async def sweep_reminders(client, directory):
+    """
+    Enfileira os lembretes dos servidores do diretório e envia a caixa de saída deles.
+    Retorna quantos foram enviados. Tarefas cujo responsável ainda não aparece no
+    diretório ficam para a próxima varredura.
+    """
+    async def address(guild_id, task):
+        channel_id, mentions = directory[guild_id]
+        mention = mentions.get(task.assigned_to)
+        return (channel_id, mention) if mention else None
+
+    async def send(entry):
+        await client.get_partial_messageable(int(entry.channel_id)).send(entry.content, nonce=outbox_nonce(entry))
+
+    await run_sweep(directory, address, datetime.datetime.now(database.BR_TZ))
+    return await deliver_outbox(directory, send)
+
+def partition_directory(directory, gateway_shards=None, gateway_shard_count=None, storage_shard=None):
+    """
+    Divide o diretório em partições {nome da liderança: diretório}: uma por shard do gateway
+    atendido, ou uma só se o worker não for dividido por shard do gateway.
+    """
+    if storage_shard is not None:
+        shard_path = os.path.join(database.SHARD_DIR, f"shard_{storage_shard}.db")
+        directory = {guild_id: entry for guild_id, entry in directory.items() if database.db_path(guild_id) == shard_path}
+    if not gateway_shards:
+        return {lease_name(storage_shard=storage_shard): directory}
+
+    partitions = {lease_name(shard_id, storage_shard): {} for shard_id in gateway_shards}
+    for guild_id, entry in directory.items():
+        shard_id = shard_id_for(guild_id, gateway_shard_count)
+        if shard_id in gateway_shards:
+            partitions[lease_name(shard_id, storage_shard)][guild_id] = entry
+    return partitions
+
+async def run(gateway_shards=None, gateway_shard_count=None, storage_shard=None):
+    client = discord.Client(intents=discord.Intents.none())
+    await client.login(TOKEN)
+    await start_metrics_server(port=WORKER_METRICS_PORT)
+    print(f"Worker de lembretes {SCHEDULER_ID} iniciado.")
+
+    leading = set()
+    try:
+        while True:
+            try:
+                directory = await get_reminder_directory()
+                partitions = partition_directory(directory, gateway_shards, gateway_shard_count, storage_shard)
+                for name, partition in partitions.items():
+                    if not await acquire_lease(name, SCHEDULER_ID, LEASE_TTL):
+                        if name in leading:
+                            print(f"Liderança perdida: {name}.")
+                            leading.discard(name)
+                        continue
+                    if name not in leading:
+                        print(f"Liderança assumida: {name}.")
+                        leading.add(name)
+                    with timer(REMINDER_SWEEP_LATENCY, shard=name):
+                        sent = await sweep_reminders(client, partition)
+                    if sent:
+                        print(f"{sent} lembrete(s) enviado(s) ({name}).")
+            except Exception as e:
+                print(f"❌ Erro na tarefa de lembretes: {e}")
+            await asyncio.sleep(SWEEP_INTERVAL)
+    finally:
+        for name in leading:
+            await release_lease(name, SCHEDULER_ID)
+        await client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Processo de lembretes do Ada Bot.")
+    parser.add_argument("--shard", type=int, help="no modo de armazenamento hash, atende só este shard")
+    parser.add_argument("--gateway-shards", help="shards do gateway atendidos, ex: 0-3 (exige --gateway-shard-count)")
+    parser.add_argument("--gateway-shard-count", type=int, help="número total de shards do gateway")
+    args = parser.parse_args()
+    gateway_shards = parse_shard_ids(args.gateway_shards or "")
+    if gateway_shards and not args.gateway_shard_count:
+        parser.error("--gateway-shards exige --gateway-shard-count")
+    try:
+        asyncio.run(run(gateway_shards, args.gateway_shard_count, args.shard))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import socket
+import uuid
+from database import (
+    OVERDUE_STATUS, ack_reminders, claim_reminders, enqueue_reminders,
+    iter_tasks_due_for_reminder, iter_tasks_to_escalate, retry_reminders
+)
+from member_index import resolve_assignee
+from metrics import counter
+
+# Onde a varredura de lembretes roda:
+# - "inline": no próprio processo do bot (padrão)
+# - "worker": num processo separado (reminder_worker.py); o bot só publica o diretório de menções
+REMINDER_MODE = os.getenv("ADA_REMINDER_MODE", "inline")
+
+# Intervalo entre varreduras e validade da liderança. A liderança é renovada a cada
+# varredura e expira se o líder parar de renová-la, permitindo que outro processo assuma.
+SWEEP_INTERVAL = 60
+LEASE_NAME = "reminders"
+LEASE_TTL = 3 * SWEEP_INTERVAL
+
+# Intervalo entre lembretes de tarefas atrasadas.
+OVERDUE_INTERVAL = 24 * 60 * 60
+
+# Caixa de saída: lembretes reservados e confirmados por lote, validade da reserva (um
+# processo que cair no meio do lote libera os lembretes depois desse prazo), limite de
+# tentativas e espera antes da primeira nova tentativa, que dobra a cada falha.
+OUTBOX_BATCH_SIZE = 200
+OUTBOX_CLAIM_TIMEOUT = 5 * 60
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BACKOFF = 30
+
+OUTBOX_DELIVERIES = counter("ada_reminder_outbox_total", "Lembretes da caixa de saída por resultado do envio (sent, retry, failed).")
+
+def lease_name(gateway_shard=None, storage_shard=None):
+    """
+    Nome da liderança de uma partição da varredura: há um líder por shard do gateway
+    (e por shard de armazenamento, quando o worker é dividido assim).
+    """
+    name = LEASE_NAME
+    if gateway_shard is not None:
+        name += f":gateway_{gateway_shard}"
+    if storage_shard is not None:
+        name += f":shard_{storage_shard}"
+    return name
+
+# Identifica este processo na eleição de líder.
+SCHEDULER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+async def run_sweep(guild_ids, address, now, on_escalate=None):
+    """
+    Aplica a máquina de estados dos lembretes aos servidores informados:
+    1. tarefas abertas que venceram passam a "Atrasada" e são avisadas;
+    2. tarefas "Em Andamento" com o intervalo vencido e "Atrasada" sem lembrete há
+       OVERDUE_INTERVAL recebem lembrete, e a data do lembrete é avançada.
+    Os lembretes não são enviados aqui: vão para a caixa de saída na mesma transação que
+    muda o estado e a agenda das tarefas (uma por servidor em cada etapa), e deliver_outbox
+    os envia. Assim, se o processo cair, nenhum lembrete se perde nem é gerado duas vezes.
+    address(guild_id, tarefa) retorna (channel_id, menção), com channel_id None se o servidor
+    não tem canal para lembretes, ou None se o responsável não foi encontrado; nesse caso a
+    tarefa fica para a próxima varredura. on_escalate(guild_id), se informado, é chamado para
+    cada servidor com tarefas que passaram a "Atrasada". Retorna o número de lembretes enfileirados.
+    """
+    now_iso = now.isoformat()
+    queued = 0
+
+    async for guild_id, tasks in iter_tasks_to_escalate(guild_ids, now_iso):
+        reminders = []
+        escalated = []
+        for task in tasks:
+            target = await address(guild_id, task)
+            if target is None:
+                continue
+            escalated.append(task.id)
+            if target[0]:
+                reminders.append(outbox_entry(guild_id, task, target, now))
+        if not escalated:
+            continue
+        await enqueue_reminders(guild_id, reminders, escalated, now_iso, OVERDUE_STATUS)
+        queued += len(reminders)
+        if on_escalate:
+            on_escalate(guild_id)
+
+    async for guild_id, tasks in iter_tasks_due_for_reminder(guild_ids, now_iso, OVERDUE_INTERVAL):
+        reminders = []
+        reminded = []
+        for task in tasks:
+            target = await address(guild_id, task)
+            if target is None:
+                continue
+            reminded.append(task.id)
+            if target[0]:
+                reminders.append(outbox_entry(guild_id, task, target, now))
+        if reminded:
+            await enqueue_reminders(guild_id, reminders, reminded, now_iso)
+        queued += len(reminders)
+
+    return queued
+
+def outbox_entry(guild_id, task, target, now):
+    """
+    (chave de idempotência, channel_id, conteúdo) do lembrete. A chave identifica o intervalo
+    lembrado (status e data do último lembrete da tarefa), que muda quando a agenda avança.
+    """
+    channel_id, mention = target
+    key = f"{guild_id}:{task.id}:{task.status}:{task.start_date.isoformat() if task.start_date else ''}"
+    return key, channel_id, f"{mention}\n{reminder_message(task, now)}"
+
+def outbox_nonce(entry):
+    """
+    Nonce da mensagem derivado da chave de idempotência. Com um nonce, o Discord descarta
+    o reenvio da mesma mensagem feito pouco depois (por exemplo, após uma queda entre o
+    envio e a confirmação).
+    """
+    return int.from_bytes(hashlib.sha256(entry.idempotency_key.encode("utf-8")).digest()[:8], "big") >> 1
+
+async def deliver_outbox(guild_ids, send):
+    """
+    Envia os lembretes pendentes da caixa de saída dos servidores, em lotes de
+    OUTBOX_BATCH_SIZE: cada lote é reservado, enviado e confirmado de uma vez (os envios
+    bem-sucedidos num único commit e as falhas em outro). send(entrada) envia a mensagem
+    e levanta uma exceção se falhar; a falha é tentada de novo até OUTBOX_MAX_ATTEMPTS vezes.
+    Retorna o número de lembretes enviados.
+    """
+    sent = 0
+    while True:
+        entries = await claim_reminders(guild_ids, OUTBOX_BATCH_SIZE, OUTBOX_CLAIM_TIMEOUT)
+        delivered = []
+        failures = []
+        for entry in entries:
+            try:
+                await send(entry)
+                delivered.append(entry)
+            except Exception as e:
+                failures.append((entry, e))
+        if delivered:
+            await ack_reminders(delivered)
+            OUTBOX_DELIVERIES.inc(len(delivered), result="sent")
+        if failures:
+            await retry_reminders(failures, OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_BACKOFF)
+            exhausted = sum(entry.attempts + 1 >= OUTBOX_MAX_ATTEMPTS for entry, _ in failures)
+            OUTBOX_DELIVERIES.inc(len(failures) - exhausted, result="retry")
+            OUTBOX_DELIVERIES.inc(exhausted, result="failed")
+            print(f"⚠️ {len(failures)} lembrete(s) não enviado(s): {failures[0][1]}")
+        sent += len(delivered)
+        if len(entries) < OUTBOX_BATCH_SIZE:
+            return sent
+
+def reminder_message(task, now):
+    """
+    Monta o texto do lembrete, com o aviso de atraso se a tarefa já venceu.
+    """
+    due_dt = task.due_date
+    if now > due_dt:
+        return (
+            f"🚨 **TAREFA ATRASADA!** 🚨\n"
+            f"A tarefa **'{task.title}'** venceu em {due_dt.strftime('%d/%m/%Y %H:%M')}.\n"
+            f"**Responsável:** {task.assigned_to}\n"
+            f"Este é um lembrete periódico de atraso."
+        )
+    return (
+        f"🔔 **Lembrete de Tarefa** 🔔\n"
+        f"**Título:** {task.title}\n"
+        f"**Vencimento:** {due_dt.strftime('%d/%m/%Y %H:%M')}\n"
+        f"**Responsável:** {task.assigned_to}"
+    )
+
+async def resolve_destiny(guild, assigned_to):
+    """
+    Encontra o membro (pelo nome) ou o cargo (pelo nome, com "@") responsável pela tarefa.
+    """
+    return await resolve_assignee(guild, assigned_to)
+
+def reminder_channel(guild):
+    """
+    Primeiro canal de texto em que o bot pode enviar mensagens.
+    """
+    return next((c for c in guild.text_channels if c.permissions_for(guild.me).send_messages), None)
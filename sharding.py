@@ -0,0 +1,41 @@
+import os
+from discord.ext import commands
+
+# Sharding do gateway:
+# - ADA_GATEWAY_SHARDS vazio: uma única conexão (commands.Bot)
+# - ADA_GATEWAY_SHARDS=auto: AutoShardedBot com o número de shards recomendado pelo Discord
+# - ADA_GATEWAY_SHARDS=N: N shards no total; ADA_GATEWAY_SHARD_IDS (ex: "0-3" ou "0,2,4")
+#   escolhe quais deles este processo conecta, para dividir o bot em vários processos
+GATEWAY_SHARDS = os.getenv("ADA_GATEWAY_SHARDS", "")
+GATEWAY_SHARD_IDS = os.getenv("ADA_GATEWAY_SHARD_IDS", "")
+
+def parse_shard_ids(value):
+    """
+    Converte "0-3,6" em [0, 1, 2, 3, 6]. Retorna None para texto vazio.
+    """
+    if not value.strip():
+        return None
+    shard_ids = set()
+    for part in value.split(","):
+        start, _, end = part.strip().partition("-")
+        shard_ids.update(range(int(start), int(end or start) + 1))
+    return sorted(shard_ids)
+
+def shard_id_for(guild_id, shard_count):
+    """
+    Shard do gateway que recebe os eventos do servidor, pela fórmula do Discord.
+    """
+    return (int(guild_id) >> 22) % shard_count
+
+def create_bot(**options):
+    """
+    Cria o bot conforme ADA_GATEWAY_SHARDS e ADA_GATEWAY_SHARD_IDS.
+    """
+    if not GATEWAY_SHARDS:
+        return commands.Bot(**options)
+    if GATEWAY_SHARDS == "auto":
+        return commands.AutoShardedBot(**options)
+    shard_ids = parse_shard_ids(GATEWAY_SHARD_IDS)
+    if shard_ids and max(shard_ids) >= int(GATEWAY_SHARDS):
+        raise ValueError(f"ADA_GATEWAY_SHARD_IDS fora do intervalo de 0 a {int(GATEWAY_SHARDS) - 1}.")
+    return commands.AutoShardedBot(shard_count=int(GATEWAY_SHARDS), shard_ids=shard_ids, **options)
@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import os
+import aiosqlite
+import database
+
+async def get_source_guild_ids(source):
+    """
+    Retorna todos os guild_id presentes no banco de origem e no seu arquivo morto.
+    """
+    async with aiosqlite.connect(source) as conn:
+        cursor = await conn.execute(
+            "SELECT guild_id FROM tasks UNION SELECT guild_id FROM clockpoint "
+            "UNION SELECT guild_id FROM meetings UNION SELECT guild_id FROM retention_policies"
+        )
+        guild_ids = {row[0] for row in await cursor.fetchall()}
+    if os.path.exists(database.archive_path(source)):
+        async with aiosqlite.connect(database.archive_path(source)) as conn:
+            for table in database.ARCHIVE_TABLES:
+                cursor = await conn.execute(f"SELECT DISTINCT guild_id FROM {table}")
+                guild_ids.update(row[0] for row in await cursor.fetchall())
+    return sorted(guild_ids)
+
+async def copy_guilds(source, target, guild_ids):
+    """
+    Copia os dados dos servidores informados do banco de origem para um arquivo de destino,
+    mantendo os IDs, que aparecem para os usuários nos comandos.
+    """
+    await database.init_db_file(target)
+    placeholders = ",".join("?" * len(guild_ids))
+
+    async with aiosqlite.connect(target) as conn:
+        await conn.execute("ATTACH DATABASE ? AS source", (source,))
+        for table, columns in database.GUILD_TABLES.items():
+            await conn.execute(
+                f"INSERT OR REPLACE INTO {table} ({columns}) SELECT {columns} FROM source.{table} WHERE guild_id IN ({placeholders})",
+                guild_ids
+            )
+        await conn.execute(
+            f"INSERT OR REPLACE INTO meeting_topics ({database.MEETING_TOPICS_COLUMNS}) "
+            f"SELECT t.* FROM source.meeting_topics t "
+            f"JOIN source.meetings m ON m.id = t.meeting_id WHERE m.guild_id IN ({placeholders})",
+            guild_ids
+        )
+        await conn.commit()
+
+    async with aiosqlite.connect(database.archive_path(target)) as conn:
+        await conn.execute("ATTACH DATABASE ? AS source", (database.archive_path(source),))
+        # Os lotes arquivados não têm ID estável; apagar os do servidor antes de copiar
+        # deixa a divisão segura para rodar de novo, como nas tabelas principais.
+        for table, columns in database.ARCHIVE_TABLES.items():
+            await conn.execute(f"DELETE FROM {table} WHERE guild_id IN ({placeholders})", guild_ids)
+            await conn.execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM source.{table} WHERE guild_id IN ({placeholders})",
+                guild_ids
+            )
+        await conn.commit()
+
+async def split(source, chunk_size=500):
+    """
+    Divide o banco único em arquivos por servidor ou por hash, conforme ADA_STORAGE_MODE.
+    """
+    if database.STORAGE_MODE not in ("guild", "hash"):
+        raise SystemExit("Defina ADA_STORAGE_MODE como 'guild' ou 'hash' antes de dividir o banco.")
+
+    await database.init_db_file(source)
+    guild_ids = await get_source_guild_ids(source)
+
+    guilds_by_path = {}
+    for guild_id in guild_ids:
+        guilds_by_path.setdefault(database.db_path(guild_id), []).append(guild_id)
+
+    for path, path_guild_ids in guilds_by_path.items():
+        for start in range(0, len(path_guild_ids), chunk_size):
+            await copy_guilds(source, path, path_guild_ids[start:start + chunk_size])
+        print(f"{path}: {len(path_guild_ids)} servidor(es)")
+
+    print(f"✅ {len(guild_ids)} servidor(es) copiados para {len(guilds_by_path)} arquivo(s) em {database.SHARD_DIR}.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Divide o ada.db em arquivos por servidor (ADA_STORAGE_MODE=guild) ou por hash (ADA_STORAGE_MODE=hash).")
+    parser.add_argument("--source", default=database.DB_PATH, help="banco de origem (padrão: ada.db)")
+    args = parser.parse_args()
+    asyncio.run(split(args.source))